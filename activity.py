@@ -15,18 +15,22 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
+import os
+
 import gi
 
 gi.require_version("Gtk", "3.0")
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
-from sugar3.activity.activity import Activity
+from sugar3.activity.activity import Activity, get_activity_root
 from sugar3.graphics.toolbarbox import ToolbarBox
 from sugar3.activity.widgets import ActivityToolbarButton
 from sugar3.activity.widgets import StopButton
 
 from logic.game_manager import GameManager
+from logic.hint_engine import HintEngine
 from view.ui import CalculatorUI
+from view.view_model import DISPLAY, EQUATIONS, SCORE, GameViewModel
 from gettext import gettext as _
 
 
@@ -35,12 +39,23 @@ class BrokenCalculator(Activity):
         Activity.__init__(self, handle)
 
         self.game = GameManager()
+        # Hints are searched in a worker and delivered on the main loop
+        self.hint_engine = HintEngine(post=GLib.idle_add)
 
         self.ui = CalculatorUI()
+        # Widget updates are batched into one flush before the next redraw
+        self.view = GameViewModel(
+            self.ui,
+            self.game,
+            post=lambda flush: GLib.idle_add(
+                flush, priority=GLib.PRIORITY_HIGH_IDLE
+            ),
+        )
 
         self.build_toolbar()
 
         self.set_canvas(self.ui.main_grid)
+        self.show_all()
 
         self._connect_signals()
         self._on_new_game_clicked(None)
@@ -58,6 +73,13 @@ class BrokenCalculator(Activity):
         self.new_game_button = new_game_button
         toolbar_box.toolbar.insert(new_game_button, -1)
 
+        hint_button = Gtk.ToolButton(label=_("Hint"))
+        hint_button.set_is_important(True)
+        hint_button.set_tooltip_text("Show a hint")
+
+        self.hint_button = hint_button
+        toolbar_box.toolbar.insert(hint_button, -1)
+
         help_button = Gtk.ToolButton(icon_name="toolbar-help")
         help_button.set_tooltip_text("Help")
         help_button.connect("clicked", self._on_help_clicked)
@@ -80,75 +102,43 @@ class BrokenCalculator(Activity):
     def _connect_signals(self):
         """Connects widget signals to their handler methods."""
         self.new_game_button.connect("clicked", self._on_new_game_clicked)
+        self.hint_button.connect("clicked", self._on_hint_clicked)
+        self.connect("destroy", self._on_destroy)
 
         # Connect all the calculator pad buttons from the UI instance
         for value, button in self.ui.buttons.items():
             button.connect("clicked", self._on_button_clicked)
 
+    def _on_destroy(self, widget):
+        """Stop the background workers when the activity closes."""
+        self.hint_engine.cancel()
+        self.game.stop_prefetching()
+
     def _on_button_clicked(self, button):
         value = button.game_value
         if self.game.game_completed:
             return
 
-        if value == "C":
-            self.game.current_equation = ""
-        elif value == "backspace":
-            self.game.current_equation = self.game.current_equation[:-1]
-        elif value == "=":
-            error_message = self.game.submit_equation()
-            if error_message:
-                print(f"Error submitting equation: {error_message}")
-                self._show_error_dialog(error_message)
-        else:
-            self.game.current_equation += value
-
-        self._update_ui_from_gamestate()
-
-    def _update_ui_from_gamestate(self):
-        """Synchronizes the GTK view with the GameManager model."""
-        # Update display with formatted equation
-        display_text = (
-            self.game.current_equation.replace("*", "×")
-            .replace("/", "÷")
-        )
-        self.ui.equation_display.set_text(
-            display_text if display_text else "0"
-        )
-
-        # Update game info using widgets from the ui object
-        self.ui.target_label.set_text(str(self.game.target_number))
-        self.ui.score_label.set_text(str(self.game.total_score))
-
-        # Rebuild equations list
-        for child in self.ui.equations_vbox.get_children():
-            self.ui.equations_vbox.remove(child)
-
-        for eq_data in self.game.equations:
-            eq_text = (
-                f"{eq_data['equation'].replace('*', '×').replace('/', '÷')} = "
-                f"{self.game.target_number}"
-            )
-            score_markup = (
-                f"<span color='#4CAF50' weight='bold'>"
-                f"(+{eq_data['score']} pts)</span>"
-            )
-
-            hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
-            eq_label = Gtk.Label(label=eq_text)
-            eq_label.get_style_context().add_class("equation-entry")
-            score_label = Gtk.Label()
-            score_label.set_markup(score_markup)
+        error_message = self.game.press(value)
+        if value != "=":
+            self.view.mark(DISPLAY)
+            return
 
-            hbox.pack_start(eq_label, True, True, 0)
-            hbox.pack_end(score_label, False, False, 0)
-            self.ui.equations_vbox.pack_start(hbox, False, False, 0)
+        self.view.mark(DISPLAY | SCORE | EQUATIONS)
+        if error_message:
+            print(f"Error submitting equation: {error_message}")
+            self._show_error_dialog(error_message)
+        else:
+            # The hint may be the equation just entered
+            self._clear_hint()
+        self._check_completion()
 
-        # Check for game completion
+    def _check_completion(self):
         if self.game.game_completed:
+            # Show the final equation and score behind the dialog
+            self.view.flush()
             self._show_completion_dialog()
 
-        self.show_all()
-
     def _show_error_dialog(self, message):
         dialog = Gtk.MessageDialog(
             parent=self.get_toplevel(),
@@ -178,27 +168,68 @@ class BrokenCalculator(Activity):
         dialog.destroy()
         self._on_new_game_clicked(None)
 
+    def _on_hint_clicked(self, button):
+        """Search for a hint without blocking the calculator pad."""
+        if self.game.game_completed:
+            return
+        self.ui.hint_label.set_text(_("Looking for a hint..."))
+        self.hint_engine.start(
+            self.game.target_number,
+            self.game.broken_buttons,
+            self.game.equation_signatures,
+            self._on_hint_found,
+        )
+
+    def _on_hint_found(self, hint):
+        if hint is None:
+            self.ui.hint_label.set_text(_("No hint found, keep trying!"))
+        else:
+            display_hint = hint.replace("*", "×").replace("/", "÷")
+            self.ui.hint_label.set_text(_("Try: {hint}").format(hint=display_hint))
+
+    def _clear_hint(self):
+        self.hint_engine.cancel()
+        self.ui.hint_label.set_text("")
+
     def _on_new_game_clicked(self, widget):
         """Starts a new game and resets the UI."""
+        self._clear_hint()
         self.game.start_level()
+        self._show_game()
 
-        # Re-enable all buttons and then disable the broken for the new game
-        for value, button in self.ui.buttons.items():
-            button.set_sensitive(True)
-            button.get_style_context().remove_class("broken")
-        for broken_value in self.game.broken_buttons:
-            if broken_value in self.ui.buttons:
-                button = self.ui.buttons[broken_value]
-                button.set_sensitive(False)
-                button.get_style_context().add_class("broken")
-
-        self._update_ui_from_gamestate()
+    def _show_game(self):
+        """Show the current game, with its broken buttons disabled."""
+        self.view.mark()
 
     def read_file(self, file_path):
-        pass
+        """Resume the game saved in the Journal entry."""
+        try:
+            self.game.read_file(file_path)
+        except (OSError, ValueError) as e:
+            # Entries saved before games were journaled have no game state
+            print(f"Could not resume game: {e}")
+            self._on_new_game_clicked(None)
+            return
+        self._clear_hint()
+        self._show_game()
+        if self.game.game_completed:
+            # Show the finished game as it was left; New Game starts another
+            self.ui.hint_label.set_text(
+                _("Game complete. Final Score: {score}\n"
+                  "Click New Game to play again.").format(
+                    score=self.game.total_score
+                )
+            )
 
     def write_file(self, file_path):
-        pass
+        self.game.write_file(file_path)
+        # Kept out of the Journal entry, for replaying bug reports
+        try:
+            self.game.keystroke_log.save(
+                os.path.join(get_activity_root(), "data", "keystrokes.bckl")
+            )
+        except OSError as e:
+            print(f"Could not save keystroke log: {e}")
 
 class HelpDialog(Gtk.Dialog):
     def __init__(self, parent):
@@ -0,0 +1,135 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Exact rational evaluation against the float evaluation used by safe_eval,
+and against the recursive AST walk safe_eval used before expressions were
+compiled, on the kind of equations players submit.
+
+Run from the activity root:
+    python -m benchmarks.bench_exact
+"""
+
+import ast
+import operator as op
+import timeit
+
+from logic.equation_validator import safe_eval
+from logic.expression_compiler import EvaluationBudget, compile_expression
+
+TYPICAL = [
+    "9+1",
+    "2*5",
+    "100-37",
+    "(3+4)*6",
+    "12*12-6/3",
+    "81/9+7*(3-1)",
+    "((5+5)*4-2)/2",
+    "7/2*4",
+    "1/3*3",
+    "45-(6*3)+2",
+]
+
+NUMBER = 5000
+REPEAT = 5
+
+_AST_OPERATORS = {
+    ast.Add: op.add,
+    ast.Sub: op.sub,
+    ast.Mult: op.mul,
+    ast.Div: op.truediv,
+    ast.USub: op.neg,
+}
+
+
+def ast_eval(expr):
+    """The recursive AST walk safe_eval used before compilation."""
+
+    def _eval_node(node):
+        if isinstance(node, ast.Expression):
+            return _eval_node(node.body)
+        elif isinstance(node, ast.Constant):
+            return node.value
+        elif isinstance(node, ast.UnaryOp):
+            return _AST_OPERATORS[type(node.op)](_eval_node(node.operand))
+        return _AST_OPERATORS[type(node.op)](
+            _eval_node(node.left), _eval_node(node.right)
+        )
+
+    return _eval_node(ast.parse(expr, mode="eval"))
+
+
+def bench(label, func, count=len(TYPICAL)):
+    seconds = min(timeit.repeat(func, number=NUMBER, repeat=REPEAT))
+    per_call = seconds / (NUMBER * count) * 1e9
+    print(f"{label:<34}{per_call:>10.0f} ns/equation")
+    return per_call
+
+
+def main():
+    budget = EvaluationBudget()
+    compiled = [compile_expression(expr) for expr in TYPICAL]
+
+    def run(evaluate, expressions=compiled):
+        def _loop():
+            for expr in expressions:
+                evaluate(expr)
+
+        return _loop
+
+    def ast_loop():
+        for expr in TYPICAL:
+            ast_eval(expr)
+
+    ast_walk = bench("AST walk (uncompiled safe_eval)", ast_loop)
+    float_eval = bench("float evaluate", run(lambda c: c.evaluate()))
+    exact_eval = bench("exact evaluate", run(lambda c: c.evaluate_exact()))
+
+    # Without a division the exact path never leaves the integers
+    no_division = [
+        c for expr, c in zip(TYPICAL, compiled) if "/" not in expr
+    ]
+    float_int = bench(
+        "float evaluate, no division",
+        run(lambda c: c.evaluate(), no_division),
+        len(no_division),
+    )
+    exact_int = bench(
+        "exact evaluate, no division",
+        run(lambda c: c.evaluate_exact(), no_division),
+        len(no_division),
+    )
+    bench("float evaluate, budgeted", run(lambda c: c.evaluate(budget)))
+    bench("exact evaluate, budgeted", run(lambda c: c.evaluate_exact(budget)))
+
+    def safe_eval_loop(exact):
+        def _loop():
+            for expr in TYPICAL:
+                safe_eval(expr, budget, exact)
+
+        return _loop
+
+    bench("safe_eval (float)", safe_eval_loop(False))
+    exact_safe_eval = bench("safe_eval (exact)", safe_eval_loop(True))
+
+    print(f"\nexact / float evaluate:      {exact_eval / float_eval:.2f}")
+    print(f"  without a division:         {exact_int / float_int:.2f}")
+    print(f"exact safe_eval / AST walk:  {exact_safe_eval / ast_walk:.2f}")
+
+
+if __name__ == "__main__":
+    main()
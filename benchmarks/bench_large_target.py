@@ -0,0 +1,79 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Meet-in-the-middle LargeTargetSolver against the full-length DP of
+PuzzleSolver, on the same broken buttons and large targets. Table
+entries stand in for memory use. The small-target DP is listed first
+for reference.
+
+Run from the activity root:
+    python -m benchmarks.bench_large_target
+"""
+
+import random
+import time
+
+from logic.large_target_solver import LARGE_VALUE_BOUND, LargeTargetSolver
+from logic.puzzle_solver import PuzzleSolver
+
+BROKEN = ["3", "7", "+"]
+TARGETS = 50
+# Seconds the full DP gets before it is reported as timed out
+DP_TIME_LIMIT = 60.0
+
+
+def entries(solver):
+    return len(solver.factors) + len(solver.terms) + len(solver.exprs)
+
+
+def run(label, solver, targets, max_keystrokes, deadline=None):
+    start = time.perf_counter()
+    finished = solver.explore(max_keystrokes, deadline)
+    built = time.perf_counter()
+    found = sum(
+        solver.find_equation(target, max_keystrokes, deadline) is not None
+        for target in targets
+    )
+    done = time.perf_counter()
+    status = "" if finished else "  (timed out)"
+    print(
+        f"{label:<22}{max_keystrokes:>5}{built - start:>10.3f}"
+        f"{(done - built) / len(targets) * 1e3:>12.2f}"
+        f"{entries(solver):>10}{found:>7}/{len(targets)}{status}"
+    )
+
+
+def main():
+    rng = random.Random(0)
+    small = [rng.randint(10, 200) for _ in range(TARGETS)]
+    large = [rng.randint(1000, LARGE_VALUE_BOUND) for _ in range(TARGETS)]
+
+    print(f"broken buttons: {' '.join(BROKEN)}")
+    print("solver                 keys  build (s)  query (ms)   entries  found")
+    run("DP, targets <= 200", PuzzleSolver(BROKEN), small, 7)
+    for max_keystrokes in (7, 9, 11):
+        half = (max_keystrokes - 1) // 2
+        run("meet in the middle", LargeTargetSolver(BROKEN, half), large,
+            max_keystrokes)
+        deadline = time.monotonic() + DP_TIME_LIMIT
+        run("DP, bound 10^6", PuzzleSolver(BROKEN, LARGE_VALUE_BOUND), large,
+            max_keystrokes, deadline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Time per token of the iterative parser, evaluator and canonicalizer on
+very long equations.
+
+Run from the activity root:
+    python -m benchmarks.bench_parser
+"""
+
+import random
+import re
+import time
+
+from logic.canonical_form import canonicalize
+from logic.expression_compiler import compile_expression
+
+SIZES = [1000, 10000, 100000]
+
+_TOKEN = re.compile(r"\d+\.?\d*|\.\d+|[-+*/()]")
+
+
+def flat_sum(tokens):
+    """1+2+3+... with about ``tokens`` tokens."""
+    terms = tokens // 2 + 1
+    return "+".join(str(i % 9 + 1) for i in range(terms))
+
+
+def nested(tokens):
+    """((((1+1)-1)*1)/1)... nested to depth ``tokens`` / 4."""
+    depth = tokens // 4
+    ops = "+-*"
+    return "(" * depth + "1" + "".join(
+        f"{ops[i % 3]}1)" for i in range(depth)
+    )
+
+
+def mixed(tokens):
+    """A random mix of operators, unary minus and parentheses."""
+    rng = random.Random(0)
+    parts = []
+    count = 0
+    depth = 0
+    while count < tokens:
+        if rng.random() < 0.2:
+            parts.append("(")
+            depth += 1
+        elif rng.random() < 0.1:
+            parts.append("-")
+        parts.append(str(rng.randint(1, 99)))
+        if depth and rng.random() < 0.2:
+            parts.append(")")
+            depth -= 1
+        parts.append(rng.choice("+-*"))
+        count += 4
+    parts.append("1" + ")" * depth)
+    return "".join(parts)
+
+
+def bench(label, expr, tokens):
+    start = time.perf_counter()
+    compiled = compile_expression(expr)
+    parsed = time.perf_counter()
+    compiled.evaluate()
+    evaluated = time.perf_counter()
+    canonicalize(compiled)
+    canonical = time.perf_counter()
+
+    def per_token(seconds):
+        return seconds / tokens * 1e9
+
+    print(
+        f"{label:<8}{tokens:>8}"
+        f"{per_token(parsed - start):>12.0f}"
+        f"{per_token(evaluated - parsed):>12.0f}"
+        f"{per_token(canonical - evaluated):>12.0f}"
+    )
+
+
+def main():
+    print("ns/token  tokens       parse    evaluate   canonical")
+    for size in SIZES:
+        for label, builder in (("sum", flat_sum), ("nested", nested),
+                               ("mixed", mixed)):
+            expr = builder(size)
+            tokens = len(_TOKEN.findall(expr))
+            bench(label, expr, tokens)
+
+
+if __name__ == "__main__":
+    main()
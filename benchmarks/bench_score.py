@@ -0,0 +1,121 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+The single-pass ScoreCalculator against the multi-scan scorer it
+replaced: first a differential check that every score is identical on a
+random corpus, then time per equation, also under each profile in
+data/scoring_profiles.json.
+
+Run from the activity root:
+    python -m benchmarks.bench_score
+"""
+
+import random
+import timeit
+
+from logic.score_calculator import ScoreCalculator
+from logic.scoring_profile import load_profiles
+
+CORPUS_SIZE = 20000
+ALPHABET = "0123456789+-*/(). "
+
+
+def reference_score(equation):
+    """The scorer as it was before it became table driven."""
+    equation = equation.replace(" ", "")
+    operators = ["+", "-", "*", "/"]
+
+    numbers = []
+    current_num = ""
+    for char in equation:
+        if char.isdigit():
+            current_num += char
+        else:
+            if current_num:
+                numbers.append(current_num)
+                current_num = ""
+    if current_num:
+        numbers.append(current_num)
+
+    score = 10
+    score += sum(equation.count(op) for op in operators) * 5
+    score += (equation.count("*") + equation.count("/")) * 3
+    score += equation.count("(") * 10
+    score += min(len(equation) // 3, 20)
+    unique_operators = sum(1 for op in operators if op in equation)
+    if unique_operators >= 3:
+        score += 15
+    elif unique_operators >= 2:
+        score += 10
+    for num in numbers:
+        if len(num) > 1:
+            score += len(num) * 2
+    return score
+
+
+def corpus():
+    rng = random.Random(0)
+    equations = ["", " ", "9+1", "12*12-6/3", "81/9+7*(3-1)", "1²3"]
+    while len(equations) < CORPUS_SIZE:
+        length = rng.randint(1, 80)
+        equations.append("".join(rng.choice(ALPHABET) for _ in range(length)))
+    return equations
+
+
+def main():
+    calculator = ScoreCalculator()
+    equations = corpus()
+
+    expected = [reference_score(eq) for eq in equations]
+    assert [calculator.calculate_score(eq) for eq in equations] == expected
+    assert calculator.score_many(equations) == expected
+    for eq in equations[:1000]:
+        assert sum(calculator.score_breakdown(eq).values()) == reference_score(eq)
+    print(f"{len(equations)} equations scored identically")
+
+    typical = equations[:6]
+    for label, run in (
+        ("reference", lambda: [reference_score(eq) for eq in typical]),
+        ("calculate_score", lambda: [calculator.calculate_score(eq)
+                                     for eq in typical]),
+        ("score_many", lambda: calculator.score_many(typical)),
+    ):
+        seconds = min(timeit.repeat(run, number=2000, repeat=5))
+        print(f"{label:<16}{seconds / 2000 / len(typical) * 1e6:>8.2f} us/equation")
+
+    # Large enough for score_many to weigh the batch with NumPy
+    batch = equations[:1000]
+    for label, run in (
+        ("batch, loop", lambda: [calculator.calculate_score(eq)
+                                 for eq in batch]),
+        ("batch, many", lambda: calculator.score_many(batch)),
+    ):
+        seconds = min(timeit.repeat(run, number=20, repeat=5))
+        print(f"{label:<16}{seconds / 20 / len(batch) * 1e6:>8.2f} us/equation")
+
+    for name, profile in load_profiles().items():
+        scorer = ScoreCalculator(profile)
+        seconds = min(timeit.repeat(
+            lambda: [scorer.calculate_score(eq) for eq in typical],
+            number=2000, repeat=5,
+        ))
+        print(f"{name:<16}{seconds / 2000 / len(typical) * 1e6:>8.2f} us/equation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Generate a bank of puzzles offline, using every core.
+
+    python build_puzzle_bank.py --puzzles 50000 data/puzzles.bank
+
+The activity ships data/puzzles.bank built with the default options;
+rebuild it whenever puzzle generation or the solver changes. GameManager
+draws from it instead of generating puzzles while the game runs, and
+generates them live if the file is missing.
+"""
+
+import argparse
+import multiprocessing
+import random
+import sys
+
+from logic.broken_button_validator import (
+    REQUIRED_SOLUTIONS,
+    BrokenButtonValidator,
+    buttons_to_mask,
+)
+from logic.puzzle_bank import (
+    BANK_TARGETS,
+    DEFAULT_BANK_PATH,
+    PuzzleBankWriter,
+    puzzle_difficulty,
+)
+from logic.puzzle_solver import DEFAULT_MAX_KEYSTROKES
+
+# Distinct solutions counted per puzzle before counting stops
+SOLUTION_COUNT_LIMIT = 31
+
+# Broken button counts used by GameManager.start_level
+BROKEN_COUNT_RANGE = (3, 7)
+
+_validator = None
+
+
+def generate_puzzle(seed):
+    """
+    Generate one puzzle from a seed, in a worker process. The result only
+    depends on the seed, never on machine load. Returns
+    (target, mask, solutions, difficulty, min_keystrokes), or None if
+    generation had to fall back to a puzzle that is not good enough.
+    """
+    global _validator
+    if _validator is None:
+        # Offline there is no time limit, so the seed alone decides
+        _validator = BrokenButtonValidator(timed=False)
+
+    rng = random.Random(seed)
+    target = rng.choice(BANK_TARGETS)
+    broken_count = rng.randint(*BROKEN_COUNT_RANGE)
+    broken = _validator.generate_broken_buttons(target, broken_count, rng)
+
+    # Count and measure exactly
+    solver = _validator.get_solver(broken)
+    solver.explore(DEFAULT_MAX_KEYSTROKES)
+    solutions = solver.count_solutions(
+        target, DEFAULT_MAX_KEYSTROKES, SOLUTION_COUNT_LIMIT
+    )
+    if solutions < REQUIRED_SOLUTIONS:
+        return None
+    min_keystrokes = solver.min_keystrokes(target)
+    difficulty = puzzle_difficulty(len(broken), min_keystrokes, solutions)
+    return target, buttons_to_mask(broken), solutions, difficulty, min_keystrokes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a puzzle bank.")
+    parser.add_argument("output", nargs="?", default=DEFAULT_BANK_PATH)
+    parser.add_argument("--puzzles", type=int, default=50000)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    writer = PuzzleBankWriter()
+    seeds = range(args.seed, args.seed + args.puzzles)
+    skipped = 0
+    with multiprocessing.Pool(args.jobs) as pool:
+        # In seed order, so the same seeds always write the same file
+        results = pool.imap(generate_puzzle, seeds, chunksize=64)
+        for done, puzzle in enumerate(results, 1):
+            if puzzle is None:
+                skipped += 1
+            else:
+                writer.add(*puzzle)
+            if done % 1000 == 0 or done == args.puzzles:
+                print(f"\r{done}/{args.puzzles} puzzles", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    writer.save(args.output)
+    print(f"{writer.record_count} puzzles written to {args.output}"
+          f" ({skipped} skipped)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import time
+
+from logic.puzzle_solver import DEFAULT_MAX_KEYSTROKES, DEFAULT_VALUE_BOUND
+from logic.score_calculator import ScoreCalculator
+from logic.scoring_profile import DEFAULT_PROFILE
+
+# Bit of each operator in an operator set
+OPERATOR_BITS = {"+": 1, "-": 2, "*": 4, "/": 8}
+
+
+class BestScoreSolver:
+    """
+    Finds the highest-scoring equation for a target that can be typed with
+    the working buttons of a puzzle in at most ``max_keystrokes``.
+
+    Uses the same grammar levels as PuzzleSolver, but every way of writing
+    a value matters here, not just the shortest. For each grammar level
+    and exact length, a table maps (value, operator set) to the best
+    per-character gain and its witness; the operator set is kept because
+    the distinct-operator bonus does not add up over sub-expressions.
+
+    Tables are built for lengths below the keystroke limit. The final
+    length is only searched for the target, by branch and bound: splits
+    and left operands are visited best first, and abandoned as soon as an
+    admissible upper bound on their score cannot beat the best equation
+    found so far. Like PuzzleSolver, only integer sub-expressions within
+    ``value_bound`` are considered.
+
+    Scores follow ``profile``, a ScoringProfile, split the way
+    ScoreCalculator adds them up: a base, a gain per character, a length
+    bonus and a bonus for the number of distinct operators.
+    """
+
+    def __init__(self, broken_buttons, value_bound=DEFAULT_VALUE_BOUND,
+                 profile=DEFAULT_PROFILE):
+        self.broken = broken = frozenset(broken_buttons)
+        self.digits = [d for d in "0123456789" if d not in broken]
+        self.add_operators = [o for o in "+-" if o not in broken]
+        self.mul_operators = [o for o in "*/" if o not in broken]
+        self.has_minus = "-" not in broken
+        self.has_parentheses = "(" not in broken and ")" not in broken
+        self.value_bound = value_bound
+
+        self.calculator = ScoreCalculator(profile)
+        points = profile.points
+        self._base_score = points["base"]
+        self._operator_gain = {
+            "+": points["operators"],
+            "-": points["operators"],
+            "*": points["operators"] + points["mul_div"],
+            "/": points["operators"] + points["mul_div"],
+        }
+        self._paren_gain = points["parentheses"]
+        self._digit_gain = 2 * points["multi_digit"]
+        self._length_points = points["length"]
+        # Bonus by number of distinct operators
+        two, three = points["two_operator_kinds"], points["three_operator_kinds"]
+        self._unique_operator_bonus = (0, 0, two, two + three, two + three)
+
+        # Keystroke lengths whose tables are built
+        self.levels = 0
+
+        # (value, operators) -> (gain, witness), per grammar level and length
+        self._factors = [{}]
+        self._terms = [{}]
+        self._exprs = [{}]
+
+        # value -> [(gain, operators, witness)], per grammar level and length
+        self._factor_index = [{}]
+        self._term_index = [{}]
+        self._expr_index = [{}]
+
+        # Entries sorted by gain, best first, and the best gain
+        self._sorted_terms = [[]]
+        self._sorted_exprs = [[]]
+        self._best_factor_gain = [None]
+        self._best_term_gain = [None]
+
+    def _literal_gain(self, literal) -> int:
+        """Multi-digit bonus of a number literal."""
+        return self._digit_gain * len(literal) if len(literal) > 1 else 0
+
+    def _length_bonus(self, length) -> int:
+        calculator = self.calculator
+        return self._length_points * min(
+            length // calculator.length_divisor, calculator.length_cap
+        )
+
+    def _equation_score(self, gain, operators, length) -> int:
+        """Final score of an equation from its gain, operator set and length."""
+        return (
+            self._base_score
+            + gain
+            + self._length_bonus(length)
+            + self._unique_operator_bonus[bin(operators).count("1")]
+        )
+
+    def best_equation(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                      deadline=None):
+        """
+        Return ``(equation, score)`` for the highest-scoring equation for
+        ``target`` within ``max_keystrokes``, or None if there is none.
+        If the ``time.monotonic()`` deadline passes, the best equation
+        found so far is returned instead.
+        """
+        best = None
+        best_score = -1
+
+        # Shorter lengths come straight from the tables
+        # Tables may already be longer, from a call with a higher limit
+        self._build(max_keystrokes - 1, deadline)
+        shorter = min(self.levels, max_keystrokes - 1)
+        for length in range(1, shorter + 1):
+            for gain, operators, witness in self._expr_index[length].get(
+                target, ()
+            ):
+                score = self._equation_score(gain, operators, length)
+                if score > best_score:
+                    best, best_score = witness, score
+
+        if shorter == max_keystrokes - 1:
+            found = self._search_final(target, max_keystrokes, best_score,
+                                       deadline)
+            if found is not None:
+                best, best_score = found
+
+        if best is None:
+            return None
+        return best, self.calculator.calculate_score(best)
+
+    def _search_final(self, target, length, best_score, deadline):
+        """
+        Branch and bound over equations of exactly ``length`` keystrokes
+        for ``target``. Returns ``(equation, score)`` if one scores more
+        than ``best_score``.
+        """
+        best = None
+        # Bonuses any equation of this length gets at most
+        ceiling = (
+            self._base_score
+            + self._length_bonus(length)
+            + max(self._unique_operator_bonus)
+        )
+
+        def consider(gain, operators, witness):
+            nonlocal best, best_score
+            score = self._equation_score(gain, operators, length)
+            if score > best_score:
+                best, best_score = witness, score
+
+        # Factors: the target itself, -factor or (expr)
+        literal = str(target)
+        if len(literal) == length and all(d in self.digits for d in literal):
+            consider(self._literal_gain(literal), 0, literal)
+        if self.has_minus:
+            for gain, operators, witness in self._factor_index[length - 1].get(
+                -target, ()
+            ):
+                consider(
+                    gain + self._operator_gain["-"],
+                    operators | OPERATOR_BITS["-"],
+                    "-" + witness,
+                )
+        if self.has_parentheses and length >= 3:
+            for gain, operators, witness in self._expr_index[length - 2].get(
+                target, ()
+            ):
+                consider(gain + self._paren_gain, operators, "(" + witness + ")")
+
+        # Splits at the last operator, best upper bound first
+        splits = []
+        for left_length in range(1, length - 1):
+            right_length = length - 1 - left_length
+            for operator in self.mul_operators:
+                left_best = self._best_term_gain[left_length]
+                right_best = self._best_factor_gain[right_length]
+                if left_best is not None and right_best is not None:
+                    bound = left_best + right_best + self._operator_gain[operator]
+                    splits.append((bound, left_length, operator))
+            for operator in self.add_operators:
+                left_best = self._sorted_exprs[left_length]
+                right_best = self._best_term_gain[right_length]
+                if left_best and right_best is not None:
+                    bound = left_best[0][0] + right_best + self._operator_gain[operator]
+                    splits.append((bound, left_length, operator))
+        splits.sort(reverse=True)
+
+        for bound, left_length, operator in splits:
+            if ceiling + bound <= best_score:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            right_length = length - 1 - left_length
+            operator_gain = self._operator_gain[operator]
+            operator_bit = OPERATOR_BITS[operator]
+            if operator in "*/":
+                lefts = self._sorted_terms[left_length]
+                right_index = self._factor_index[right_length]
+                right_best = self._best_factor_gain[right_length]
+            else:
+                lefts = self._sorted_exprs[left_length]
+                right_index = self._term_index[right_length]
+                right_best = self._best_term_gain[right_length]
+
+            for left_gain, left_value, left_operators, left_witness in lefts:
+                if ceiling + left_gain + right_best + operator_gain <= best_score:
+                    break
+                if operator == "+":
+                    right_value = target - left_value
+                elif operator == "-":
+                    right_value = left_value - target
+                elif operator == "*":
+                    if left_value == 0 or target % left_value:
+                        continue
+                    right_value = target // left_value
+                else:
+                    if target == 0 or left_value % target:
+                        continue
+                    right_value = left_value // target
+                    if right_value == 0:
+                        continue
+                for right_gain, right_operators, right_witness in right_index.get(
+                    right_value, ()
+                ):
+                    consider(
+                        left_gain + right_gain + operator_gain,
+                        left_operators | right_operators | operator_bit,
+                        left_witness + operator + right_witness,
+                    )
+
+        if best is None:
+            return None
+        return best, best_score
+
+    def _build(self, max_length, deadline):
+        while self.levels < max_length:
+            if deadline is not None and time.monotonic() > deadline:
+                return
+            self._build_length(self.levels + 1)
+            self.levels += 1
+
+    def _literals(self, length):
+        if length > len(str(self.value_bound)):
+            return []
+        if length == 1:
+            return list(self.digits)
+        literals = [d for d in self.digits if d != "0"]
+        for _ in range(length - 1):
+            literals = [prefix + d for prefix in literals for d in self.digits]
+        return [lit for lit in literals if int(lit) <= self.value_bound]
+
+    def _build_length(self, length):
+        bound = self.value_bound
+        factors, terms, exprs = {}, {}, {}
+
+        def keep(table, value, operators, gain, witness):
+            key = (value, operators)
+            current = table.get(key)
+            if current is None or current[0] < gain:
+                table[key] = (gain, witness)
+
+        # Factors: literals, -factor, (expr)
+        for literal in self._literals(length):
+            keep(factors, int(literal), 0, self._literal_gain(literal), literal)
+        if self.has_minus and length >= 2:
+            minus_gain = self._operator_gain["-"]
+            minus_bit = OPERATOR_BITS["-"]
+            for (value, operators), (gain, witness) in self._factors[
+                length - 1
+            ].items():
+                keep(factors, -value, operators | minus_bit,
+                     gain + minus_gain, "-" + witness)
+        if self.has_parentheses and length >= 3:
+            for (value, operators), (gain, witness) in self._exprs[
+                length - 2
+            ].items():
+                keep(factors, value, operators, gain + self._paren_gain,
+                     "(" + witness + ")")
+
+        # Terms: factors, term (*|/) factor
+        terms.update(factors)
+        for left_length in range(1, length - 1):
+            rights = self._factors[length - 1 - left_length]
+            for (left, left_operators), (left_gain, left_witness) in self._terms[
+                left_length
+            ].items():
+                for operator in self.mul_operators:
+                    gain = left_gain + self._operator_gain[operator]
+                    operators = left_operators | OPERATOR_BITS[operator]
+                    for (right, right_operators), (
+                        right_gain, right_witness
+                    ) in rights.items():
+                        if operator == "*":
+                            value = left * right
+                            if abs(value) > bound:
+                                continue
+                        else:
+                            if right == 0 or left % right:
+                                continue
+                            value = left // right
+                        keep(terms, value, operators | right_operators,
+                             gain + right_gain,
+                             left_witness + operator + right_witness)
+
+        # Exprs: terms, expr (+|-) term
+        exprs.update(terms)
+        for left_length in range(1, length - 1):
+            rights = self._terms[length - 1 - left_length]
+            for (left, left_operators), (left_gain, left_witness) in self._exprs[
+                left_length
+            ].items():
+                for operator in self.add_operators:
+                    gain = left_gain + self._operator_gain[operator]
+                    operators = left_operators | OPERATOR_BITS[operator]
+                    sign = 1 if operator == "+" else -1
+                    for (right, right_operators), (
+                        right_gain, right_witness
+                    ) in rights.items():
+                        value = left + sign * right
+                        if -bound <= value <= bound:
+                            keep(exprs, value, operators | right_operators,
+                                 gain + right_gain,
+                                 left_witness + operator + right_witness)
+
+        for table, tables, indexes in (
+            (factors, self._factors, self._factor_index),
+            (terms, self._terms, self._term_index),
+            (exprs, self._exprs, self._expr_index),
+        ):
+            index = {}
+            for (value, operators), (gain, witness) in table.items():
+                index.setdefault(value, []).append((gain, operators, witness))
+            tables.append(table)
+            indexes.append(index)
+
+        self._sorted_terms.append(_sorted_entries(terms))
+        self._sorted_exprs.append(_sorted_entries(exprs))
+        self._best_factor_gain.append(_best_gain(factors))
+        self._best_term_gain.append(_best_gain(terms))
+
+
+def _sorted_entries(table):
+    entries = [
+        (gain, value, operators, witness)
+        for (value, operators), (gain, witness) in table.items()
+    ]
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+    return entries
+
+
+def _best_gain(table):
+    return max((gain for gain, _ in table.values()), default=None)
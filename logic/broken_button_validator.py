@@ -16,85 +16,192 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 import random
+import time
+from collections import OrderedDict
+
+from logic.large_target_solver import LARGE_MAX_KEYSTROKES, LargeTargetSolver
+from logic.puzzle_solver import (
+    DEFAULT_MAX_KEYSTROKES,
+    DEFAULT_VALUE_BOUND,
+    PuzzleSolver,
+)
+
+ALL_BUTTONS = [
+    "0",
+    "1",
+    "2",
+    "3",
+    "4",
+    "5",
+    "6",
+    "7",
+    "8",
+    "9",
+    "+",
+    "-",
+    "*",
+    "/",
+    "(",
+    ")",
+]
+
+# Bit of each breakable button in a broken-button mask
+BUTTON_BITS = {button: 1 << i for i, button in enumerate(ALL_BUTTONS)}
+
+# Distinct equations a player must find to finish a puzzle
+REQUIRED_SOLUTIONS = 5
+
+# Random choices of broken buttons tried per count without a table
+SAMPLE_ATTEMPTS = 20
+
+# Seconds a single solvability check may spend searching
+SOLVE_TIME_BUDGET = 0.05
+
+# Same, for targets too large for the PuzzleSolver tables
+LARGE_SOLVE_TIME_BUDGET = 0.5
+
+# Solvers kept per broken button set, so their tables are reused
+SOLVER_CACHE_SIZE = 32
+
+# Seconds spent looking for a large-target puzzle before giving up
+LARGE_GENERATE_TIME_BUDGET = 2.0
+
+# Seconds spent sampling broken buttons without a table before trying
+# each smaller count only once
+GENERATE_TIME_BUDGET = 0.5
+
+
+def buttons_to_mask(buttons) -> int:
+    """Pack broken buttons into a 16-bit mask, one bit per ALL_BUTTONS entry."""
+    mask = 0
+    for button in buttons:
+        mask |= BUTTON_BITS[button]
+    return mask
+
+
+def equation_mask(equation) -> int:
+    """
+    Mask of the breakable buttons an equation uses: one OR over its
+    distinct characters, so ``equation_mask(eq) & broken_mask`` tells
+    whether it needs a broken button.
+    """
+    mask = 0
+    for char in set(equation):
+        mask |= BUTTON_BITS.get(char, 0)
+    return mask
+
+
+def mask_to_buttons(mask) -> list:
+    """Unpack a broken-button mask into a list of buttons."""
+    return [button for button in ALL_BUTTONS if mask & BUTTON_BITS[button]]
 
 
 class BrokenButtonValidator:
-    """Validates that a puzzle is solvable with broken buttons."""
-
-    def generate_broken_buttons(self, target, count):
-        """Generate broken buttons ensuring puzzle remains solvable."""
-        all_buttons = [
-            "0",
-            "1",
-            "2",
-            "3",
-            "4",
-            "5",
-            "6",
-            "7",
-            "8",
-            "9",
-            "+",
-            "-",
-            "*",
-            "/",
-            "(",
-            ")",
-        ]
-
-        # Always ensure we have basic operators and some numbers
-        required_working = set()
-
-        # Need at least one way to make the target
-        # For simplicity, ensure we can at least add/subtract to target
-        if target <= 50:
-            # For small targets, ensure we have enough small numbers
-            required_working.update(["1", "+"])
+    """
+    Validates that a puzzle is solvable with broken buttons.
+
+    If a SolvabilityTable is given, puzzles it covers are checked with a
+    single lookup; anything else is searched with a PuzzleSolver. With
+    ``timed=False`` searches never give up, so results depend only on the
+    puzzle, as offline builds need.
+    """
+
+    def __init__(self, max_keystrokes=DEFAULT_MAX_KEYSTROKES, table=None,
+                 timed=True):
+        self.max_keystrokes = max_keystrokes
+        self.table = table
+        self.timed = timed
+        self._solvers = OrderedDict()
+
+    def get_solver(self, broken_buttons, large=False) -> PuzzleSolver:
+        """
+        Return the (cached) PuzzleSolver for a set of broken buttons, or
+        its LargeTargetSolver if ``large``.
+        """
+        buttons = frozenset(broken_buttons)
+        key = (buttons, large)
+        solver = self._solvers.get(key)
+        if solver is None:
+            solver = LargeTargetSolver(buttons) if large else PuzzleSolver(buttons)
+            self._solvers[key] = solver
+            if len(self._solvers) > SOLVER_CACHE_SIZE:
+                self._solvers.popitem(last=False)
         else:
-            # For larger targets, ensure we have multiplication
-            required_working.update(["2", "*", "+"])
-
-        # Ensure we don't break too many critical buttons
-        breakable = [b for b in all_buttons if b not in required_working]
-
-        # Limit how many we can break
-        max_breakable = min(count, len(breakable))
-
-        # Randomly select buttons to break
-        broken = random.sample(breakable, max_breakable)
-
-        # Validate that we can still make 5 different equations
-        if not self.validate_solvable(target, broken):
-            # If not solvable, try again with fewer broken buttons
-            return self.generate_broken_buttons(target, count - 1)
-
-        return broken
+            self._solvers.move_to_end(key)
+        return solver
+
+    def generate_broken_buttons(self, target, count, rng=random):
+        """
+        Generate ``count`` broken buttons, drawn uniformly from the choices
+        that keep the puzzle solvable (see ``validate_solvable``).
+
+        With a SolvabilityTable this is a lookup in its per-target index of
+        solvable masks. Otherwise random choices are drawn and checked until
+        one is solvable, which is uniform as well. Fewer buttons are broken
+        only if no solvable choice with ``count`` broken buttons is found.
+        Once GENERATE_TIME_BUDGET seconds have passed, each smaller count
+        gets a single try, unless the validator is untimed.
+        Choices are drawn from ``rng``, a random.Random or the module.
+        """
+        count = max(0, min(count, len(ALL_BUTTONS)))
+
+        if self.table is not None and self.table.covers(
+            target, self.max_keystrokes
+        ):
+            for broken_count in range(count, -1, -1):
+                masks = self.table.solvable_masks(
+                    target, broken_count, REQUIRED_SOLUTIONS
+                )
+                if len(masks):
+                    mask = int(masks[rng.randrange(len(masks))])
+                    return mask_to_buttons(mask)
+            return []
+
+        deadline = None
+        if self.timed:
+            deadline = time.monotonic() + GENERATE_TIME_BUDGET
+        for broken_count in range(count, -1, -1):
+            for _ in range(SAMPLE_ATTEMPTS):
+                broken = rng.sample(ALL_BUTTONS, broken_count)
+                if self.validate_solvable(target, broken):
+                    return broken
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+        return []
+
+    def generate_large_puzzle(self, target_range, count):
+        """
+        Generate ``(target, broken_buttons)`` for the large-target mode.
+        Large targets are solvable far less often, so several targets are
+        tried for each choice of broken buttons, which reuses the
+        LargeTargetSolver tables built for it.
+
+        Returns None if nothing is found within LARGE_GENERATE_TIME_BUDGET
+        seconds (plus at most one solver time budget).
+        """
+        deadline = time.monotonic() + LARGE_GENERATE_TIME_BUDGET
+        count = max(0, min(count, len(ALL_BUTTONS)))
+        for broken_count in range(count, -1, -1):
+            for _ in range(SAMPLE_ATTEMPTS):
+                broken = random.sample(ALL_BUTTONS, broken_count)
+                for _ in range(SAMPLE_ATTEMPTS):
+                    if time.monotonic() > deadline:
+                        return None
+                    target = random.randint(*target_range)
+                    if self.validate_solvable(target, broken):
+                        return target, broken
+        return None
 
     def validate_solvable(self, target, broken_buttons):
-        """Check if target is achievable with broken buttons."""
-        working_buttons = []
-        all_buttons = [
-            "0",
-            "1",
-            "2",
-            "3",
-            "4",
-            "5",
-            "6",
-            "7",
-            "8",
-            "9",
-            "+",
-            "-",
-            "*",
-            "/",
-            "(",
-            ")",
-        ]
-
-        for button in all_buttons:
-            if button not in broken_buttons:
-                working_buttons.append(button)
+        """
+        Check if the puzzle has at least REQUIRED_SOLUTIONS structurally
+        distinct equations for target, each at most ``max_keystrokes``
+        keystrokes long (LARGE_MAX_KEYSTROKES for targets beyond the
+        PuzzleSolver value bound). The search gives up after
+        SOLVE_TIME_BUDGET (or LARGE_SOLVE_TIME_BUDGET) seconds and then
+        reports the puzzle as unsolvable, unless the validator is untimed.
+        """
+        working_buttons = [b for b in ALL_BUTTONS if b not in broken_buttons]
 
         # Basic check: ensure we have at least some numbers and operators
         has_numbers = any(b.isdigit() for b in working_buttons)
@@ -103,19 +210,22 @@ class BrokenButtonValidator:
         if not has_numbers or not has_operators:
             return False
 
-        working_digits = [int(b) for b in working_buttons if b.isdigit()]
+        if self.table is not None and self.table.covers(
+            target, self.max_keystrokes
+        ):
+            mask = buttons_to_mask(broken_buttons)
+            return self.table.solution_count(mask, target) >= REQUIRED_SOLUTIONS
 
-        if not working_digits:
-            return False
-
-        # Can we reach target with available numbers?
-        # Simple check: can we add/multiply to get close?
-        max_reachable = max(working_digits) * 10  # Rough estimate
-
-        if "+" in working_buttons:
-            max_reachable = sum(working_digits) * 5
-
-        if "*" in working_buttons and len(working_digits) >= 2:
-            max_reachable = max(max_reachable, max(working_digits) ** 2)
-
-        return max_reachable >= target
+        if abs(target) > DEFAULT_VALUE_BOUND:
+            solver = self.get_solver(broken_buttons, large=True)
+            max_keystrokes = LARGE_MAX_KEYSTROKES
+            budget = LARGE_SOLVE_TIME_BUDGET
+        else:
+            solver = self.get_solver(broken_buttons)
+            max_keystrokes = self.max_keystrokes
+            budget = SOLVE_TIME_BUDGET
+        deadline = time.monotonic() + budget if self.timed else None
+        count = solver.count_solutions(
+            target, max_keystrokes, REQUIRED_SOLUTIONS, deadline
+        )
+        return count >= REQUIRED_SOLUTIONS
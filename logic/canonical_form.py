@@ -0,0 +1,251 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import operator as op
+import threading
+import weakref
+import zlib
+
+from logic.expression_compiler import PUSH, BINARY
+
+OPERATOR_SYMBOLS = {
+    op.add: "+",
+    op.sub: "-",
+    op.mul: "*",
+    op.truediv: "/",
+    op.neg: "neg",
+}
+
+COMMUTATIVE = ("+", "*")
+
+# Small integers mixed into the structural hash of each node kind
+_OP_CODES = {"+": 1, "-": 2, "*": 3, "/": 4, "neg": 5}
+
+
+class CanonicalNode:
+    """
+    A hash-consed node of an equation's canonical form.
+
+    Nodes are interned: two structurally equal canonical forms are always
+    the same object, so equality is identity and hashing returns the
+    precomputed structural (Merkle) hash. Operands of ``+`` and ``*`` are
+    flattened and stored in a canonical order.
+
+    Build nodes with ``literal`` and ``combine``, never directly.
+    """
+
+    __slots__ = ("op", "value", "children", "hash", "_text", "__weakref__")
+
+    def __init__(self, op_symbol, value, children, node_hash):
+        self.op = op_symbol
+        self.value = value
+        self.children = children
+        self.hash = node_hash
+        self._text = None
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return f"CanonicalNode({self})"
+
+    def __str__(self):
+        """
+        Render the canonical string, e.g. ``(1+9+9)`` or ``(3+(2*5))``.
+        Rendering is iterative and linear in the size of the tree.
+        """
+        if self._text is not None:
+            return self._text
+
+        parts = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                parts.append(item)
+            elif item.op is None:
+                parts.append(item.value)
+            elif item.op == "neg":
+                stack.extend((")", item.children[0], "(-"))
+            else:
+                stack.append(")")
+                for i, child in enumerate(reversed(item.children)):
+                    if i:
+                        stack.append(item.op)
+                    stack.append(child)
+                stack.append("(")
+
+        self._text = "".join(parts)
+        return self._text
+
+
+_interned = weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+
+def _intern(op_symbol, value, children, node_hash):
+    key = (op_symbol, value, children)
+    with _intern_lock:
+        node = _interned.get(key)
+        if node is None:
+            node = CanonicalNode(op_symbol, value, children, node_hash)
+            _interned[key] = node
+    return node
+
+
+def literal(value) -> CanonicalNode:
+    """Return the interned node for a numeric literal."""
+    text = str(value)
+    return _intern(None, text, (), zlib.crc32(text.encode("ascii")))
+
+
+def _sort_key(node):
+    # Literals first, in numeric order, then compound nodes by hash
+    if node.op is None:
+        return (0, float(node.value))
+    return (1, node.hash)
+
+
+def combine(op_symbol, operands) -> CanonicalNode:
+    """
+    Return the interned node applying ``op_symbol`` to ``operands``.
+
+    For ``+`` and ``*`` operands that are themselves the same operation
+    are flattened into one level and all operands are sorted.
+    """
+    if op_symbol in COMMUTATIVE:
+        children = []
+        for operand in operands:
+            if operand.op == op_symbol:
+                children.extend(operand.children)
+            else:
+                children.append(operand)
+        children.sort(key=_sort_key)
+        _break_ties(children)
+        children = tuple(children)
+    else:
+        children = tuple(operands)
+
+    node_hash = hash((_OP_CODES[op_symbol],) + tuple(c.hash for c in children))
+    return _intern(op_symbol, None, children, node_hash)
+
+
+def _break_ties(children):
+    """
+    Order runs of distinct nodes that share a sort key by their rendered
+    text, so the order never depends on how the operands were written.
+    This only happens on hash collisions or equal-valued literals such
+    as ``2`` and ``2.0``.
+    """
+    start = 0
+    for i in range(1, len(children) + 1):
+        if i == len(children) or _sort_key(children[i]) != _sort_key(
+            children[start]
+        ):
+            if i - start > 1:
+                children[start:i] = sorted(children[start:i], key=str)
+            start = i
+
+
+class _Chain:
+    """Operands of a ``+`` or ``*`` chain that has not been interned yet."""
+
+    __slots__ = ("op", "operands")
+
+    def __init__(self, op_symbol, operands):
+        self.op = op_symbol
+        self.operands = operands
+
+
+def _finish(item):
+    if isinstance(item, _Chain):
+        return combine(item.op, item.operands)
+    return item
+
+
+def canonicalize(compiled) -> CanonicalNode:
+    """
+    Build the canonical form of a compiled RPN expression.
+
+    Runs of ``+`` or ``*`` are gathered into one operand list and interned
+    once, so long sums and products stay linear instead of re-flattening
+    the chain at every step.
+    """
+    stack = []
+    for opcode, arg in compiled.program:
+        if opcode == PUSH:
+            stack.append(literal(arg))
+            continue
+
+        symbol = OPERATOR_SYMBOLS[arg]
+        if opcode != BINARY:
+            stack[-1] = combine(symbol, (_finish(stack[-1]),))
+            continue
+
+        right = stack.pop()
+        left = stack[-1]
+        if symbol not in COMMUTATIVE:
+            stack[-1] = combine(symbol, (_finish(left), _finish(right)))
+            continue
+
+        if isinstance(left, _Chain) and left.op == symbol:
+            chain = left
+        else:
+            chain = _Chain(symbol, [_finish(left)])
+        if isinstance(right, _Chain) and right.op == symbol:
+            chain.operands.extend(right.operands)
+        else:
+            chain.operands.append(_finish(right))
+        stack[-1] = chain
+    return _finish(stack[0])
+
+
+def to_postfix(node) -> list:
+    """
+    Flatten a canonical form into a JSON-friendly postfix list: a literal
+    is its string value, an operation is ``[symbol, operand_count]``.
+    """
+    tokens = []
+    stack = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            tokens.append(item)
+        elif item.op is None:
+            tokens.append(item.value)
+        else:
+            stack.append([item.op, len(item.children)])
+            stack.extend(reversed(item.children))
+    return tokens
+
+
+def from_postfix(tokens) -> CanonicalNode:
+    """Rebuild the interned canonical form written by ``to_postfix``."""
+    stack = []
+    for token in tokens:
+        if isinstance(token, str):
+            stack.append(literal(token))
+            continue
+        symbol, count = token
+        if symbol not in _OP_CODES or not 0 < count <= len(stack):
+            raise ValueError(f"Malformed canonical form token {token!r}")
+        operands = tuple(stack[-count:])
+        del stack[-count:]
+        stack.append(combine(symbol, operands))
+    if len(stack) != 1:
+        raise ValueError("Malformed canonical form")
+    return stack[0]
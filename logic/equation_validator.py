@@ -16,59 +16,99 @@
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
 import re
-import ast
-import operator as op
 import math
+import operator as op
 from collections import Counter
 
-
-def safe_eval(expr: str):
+from logic.canonical_form import canonicalize
+from logic.expression_compiler import (
+    PUSH,
+    BINARY,
+    BudgetExceeded,
+    EvaluationBudget,
+    expression_cache,
+)
+
+# Names used by the operator counters of a ParsedEquation
+OPERATOR_NAMES = {
+    op.add: "Add",
+    op.sub: "Sub",
+    op.mul: "Mult",
+    op.truediv: "Div",
+    op.neg: "USub",
+}
+
+
+def safe_eval(expr: str, budget=None, exact=False):
     """
     Safely and correctly evaluates a mathematical expression string.
     This prevents arbitrary code execution vulnerabilities present in eval().
+    Compiled programs are reused through the shared LRU expression cache.
+    An optional EvaluationBudget bounds the cost of hostile input, and
+    ``exact`` returns an int or Fraction instead of rounding through floats.
     """
-    allowed_operators = {
-        ast.Add: op.add,
-        ast.Sub: op.sub,
-        ast.Mult: op.mul,
-        ast.Div: op.truediv,
-        ast.USub: op.neg,
-    }
-    try:
-        tree = ast.parse(expr, mode="eval")
-    except (SyntaxError, ValueError, TypeError):
-        raise ValueError("Invalid syntax in expression")
-
-    def _eval_node(node):
-        if isinstance(node, ast.Expression):
-            return _eval_node(node.body)
-        elif isinstance(node, (ast.Num, ast.Constant)):
-            return node.n
-        elif isinstance(node, ast.UnaryOp):
-            op_func = allowed_operators.get(type(node.op))
-            if not op_func:
-                raise TypeError(
-                    f"Disallowed operator: {type(node.op).__name__}"
-                )
-            return op_func(_eval_node(node.operand))
-        elif isinstance(node, ast.BinOp):
-            op_func = allowed_operators.get(type(node.op))
-            if not op_func:
-                raise TypeError(
-                    f"Disallowed operator: {type(node.op).__name__}"
-                )
-            return op_func(_eval_node(node.left), _eval_node(node.right))
-        else:
-            raise TypeError(f"Disallowed operation: {type(node).__name__}")
+    compiled = expression_cache.get(expr, budget)
+    return compiled.evaluate(budget, exact)
 
-    return _eval_node(tree)
+
+class ParsedEquation:
+    """
+    An equation parsed once and shared by validation, uniqueness checks and
+    scoring, so a submission is never parsed more than once.
+
+    Instances are built by ``EquationValidator.parse``.
+    """
+
+    def __init__(self, equation: str):
+        self.equation = equation.strip()
+        self.text = self.equation.replace(" ", "")
+        self.compiled = None
+        self.canonical = None
+        self.value = None
+        self.error = None
+        self.operands = Counter()
+        self.operators = Counter()
+        # Feature vector, filled in lazily by ScoreCalculator
+        self.score_features = None
+
+    @property
+    def parsed(self) -> bool:
+        """True if the equation parsed and uses only allowed operators."""
+        return self.compiled is not None
+
+    @property
+    def canonical_form(self) -> str:
+        """The canonical form rendered as a string, or "" if unparsable."""
+        if self.canonical is None:
+            return ""
+        return str(self.canonical)
+
+    @property
+    def signature(self):
+        """
+        Hashable key shared by exactly the equations that
+        ``are_equations_equivalent`` treats as the same.
+        """
+        if self.canonical is None:
+            return self.text
+        return self.canonical
 
 
 class EquationValidator:
     """
     Validates mathematical equations with robust, mathematically-aware logic.
+
+    Every equation is parsed and evaluated under ``budget`` (an
+    EvaluationBudget), so no single submission can stall the game.
+    With ``exact`` (the default) values are ints or Fractions and must
+    equal the target exactly; otherwise floats are compared with
+    ``math.isclose``.
     """
 
+    def __init__(self, budget=None, exact=True):
+        self.budget = budget if budget is not None else EvaluationBudget()
+        self.exact = exact
+
     def _get_canonical_form(self, equation: str) -> str:
         """
         Generates a standardized "canonical" string for an equation.
@@ -79,57 +119,17 @@ class EquationValidator:
         Examples:
         - "9+1+9" -> "(1+9+9)"
         - "9+9+1" -> "(1+9+9)" (Same as above)
-        - "5*2+3" -> "((2*5)+3)"
-        - "3+2*5" -> "(3+(2*5))" (Different)
-        """
-        try:
-            tree = ast.parse(equation, mode="eval").body
-        except (SyntaxError, ValueError, TypeError):
-            return equation.replace(" ", "")
-
-        def _canonicalize(node):
-            if isinstance(node, (ast.Num, ast.Constant)):
-                return str(node.n)
-
-            if isinstance(node, ast.UnaryOp):
-                # e.g., -(5+2) -> "(-((2+5)))"
-                op_symbol = {ast.USub: "-"}.get(type(node.op), "")
-                return f"({op_symbol}{_canonicalize(node.operand)})"
-
-            if isinstance(node, ast.BinOp):
-                op_type = type(node.op)
-                op_symbol = {
-                    ast.Add: "+",
-                    ast.Sub: "-",
-                    ast.Mult: "*",
-                    ast.Div: "/",
-                }.get(op_type)
-
-                if op_type in (ast.Add, ast.Mult):
-                    operands = []
-
-                    def _collect_operands(sub_node):
-                        if (
-                            isinstance(sub_node, ast.BinOp)
-                            and isinstance(sub_node.op, op_type)
-                        ):
-                            _collect_operands(sub_node.left)
-                            _collect_operands(sub_node.right)
-                        else:
-                            operands.append(_canonicalize(sub_node))
-
-                    _collect_operands(node)
-                    operands.sort()
-                    return f"({op_symbol.join(operands)})"
-
-                else:
-                    left = _canonicalize(node.left)
-                    right = _canonicalize(node.right)
-                    return f"({left}{op_symbol}{right})"
-
-            return ""
+        - "5*2+3" -> "(3+(2*5))"
+        - "3+2*5" -> "(3+(2*5))" (Same as above)
+        - "3-2*5" -> "(3-(2*5))" (Different)
 
-        return _canonicalize(tree)
+        The string is rendered from the hash-consed CanonicalNode built by
+        ``parse``; comparisons should use ``ParsedEquation.canonical``.
+        """
+        parsed = self.parse(equation)
+        if parsed.canonical is None:
+            return parsed.text
+        return str(parsed.canonical)
 
     def _extract_operands_and_operators(self, equation: str) -> tuple:
         """
@@ -140,68 +140,90 @@ class EquationValidator:
         - (9+1) vs (1+9): Same operands [1,9], same operators [+] -> Equivalent
         - (2+8) vs (1+9): Different operands [2,8] vs [1,9], same operators [+] -> NOT Equivalent
         """
-        try:
-            tree = ast.parse(equation, mode="eval").body
-        except (SyntaxError, ValueError, TypeError):
-            return Counter(), Counter(), ""
+        parsed = self.parse(equation)
+        return parsed.operands, parsed.operators, parsed.canonical_form
 
+    def _count_program(self, compiled) -> tuple:
+        """Count operands and operators of a compiled expression."""
         operands = []
         operators = []
 
-        def _extract(node):
-            if isinstance(node, (ast.Num, ast.Constant)):
-                val = node.n
-                operands.append(int(val) if val == int(val) else val)
-
-            elif isinstance(node, ast.UnaryOp):
-                op_name = type(node.op).__name__
-                operators.append(f"unary_{op_name}")
-                _extract(node.operand)
-
-            elif isinstance(node, ast.BinOp):
-                op_name = type(node.op).__name__
-                operators.append(op_name)
-                _extract(node.left)
-                _extract(node.right)
+        for opcode, arg in compiled.program:
+            if opcode == PUSH:
+                operands.append(int(arg) if arg == int(arg) else arg)
+            elif opcode == BINARY:
+                operators.append(OPERATOR_NAMES[arg])
+            else:
+                operators.append(f"unary_{OPERATOR_NAMES[arg]}")
 
-        _extract(tree)
+        return Counter(operands), Counter(operators)
 
-        operands_counter = Counter(operands)
-        operators_counter = Counter(operators)
+    def parse(self, equation) -> ParsedEquation:
+        """
+        Parse and evaluate an equation once, caching its value, canonical
+        form and operand/operator counters on a ParsedEquation.
+        Passing an existing ParsedEquation returns it unchanged.
+        """
+        if isinstance(equation, ParsedEquation):
+            return equation
 
-        structure_sig = self._get_canonical_form(equation)
+        parsed = ParsedEquation(equation)
+        try:
+            parsed.compiled = expression_cache.get(parsed.equation, self.budget)
+        except (ValueError, TypeError) as e:
+            parsed.error = e
+            return parsed
 
-        return operands_counter, operators_counter, structure_sig
+        parsed.operands, parsed.operators = self._count_program(parsed.compiled)
+        parsed.canonical = canonicalize(parsed.compiled)
+        try:
+            parsed.value = parsed.compiled.evaluate(self.budget, self.exact)
+        except (ZeroDivisionError, OverflowError, ValueError, TypeError) as e:
+            parsed.error = e
+        return parsed
 
     def validate(self, equation, target):
         """
         Validate if an equation equals the target value. Secure and robust.
-        (This implementation is already solid and remains unchanged).
+        Accepts either a string or a ParsedEquation from ``parse``.
         """
         result = {"valid": False, "error": "", "value": None}
-        equation = equation.strip()
-        if not equation:
+        if isinstance(equation, ParsedEquation):
+            text = equation.equation
+        else:
+            text = equation.strip()
+        if not text:
             result["error"] = "Equation is empty"
             return result
-        if re.search(r"[^0-9+\-*/().\s]", equation):
+        if re.search(r"[^0-9+\-*/().\s]", text):
             result["error"] = "Invalid characters in equation"
             return result
-        try:
-            value = safe_eval(equation)
+
+        parsed = self.parse(equation)
+        error = parsed.error
+        if error is None:
+            value = parsed.value
             result["value"] = value
-            if math.isclose(value, float(target)):
+            if self.exact:
+                valid = value == target
+            else:
+                valid = math.isclose(value, float(target))
+            if valid:
                 result["valid"] = True
             else:
-                result["error"] = f"Result is {value:.2f}, not {target}"
-        except ZeroDivisionError:
+                result["error"] = f"Result is {float(value):.2f}, not {target}"
+        elif isinstance(error, ZeroDivisionError):
             result["error"] = "Division by zero"
-        except (ValueError, TypeError) as e:
-            result["error"] = f"Invalid equation: {e}"
+        elif isinstance(error, BudgetExceeded):
+            result["error"] = f"Equation too complex: {error}"
+        else:
+            result["error"] = f"Invalid equation: {error}"
         return result
 
     def are_equations_equivalent(self, eq1: str, eq2: str) -> bool:
         """
         Enhanced check for mathematical equivalence based on structural similarity.
+        Either argument may be a string or a ParsedEquation.
 
         Two equations are considered equivalent if they have:
         1. The same operands (numbers) with the same frequency
@@ -215,22 +237,18 @@ class EquationValidator:
         - (10-5) ≢ (5-10) -> False (subtraction is not commutative)
         - (3+2*4) ≢ (2*4+3) -> True (same operands {2,3,4}, same operators {+,*})
         """
-        if eq1.replace(" ", "") == eq2.replace(" ", ""):
-            return True
+        parsed1 = self.parse(eq1)
+        parsed2 = self.parse(eq2)
 
-        operands1, operators1, structure1 = self._extract_operands_and_operators(eq1)
-        operands2, operators2, structure2 = self._extract_operands_and_operators(eq2)
-
-        if not structure1 or not structure2:
-            return False
-
-        same_operands = operands1 == operands2
-        same_operators = operators1 == operators2
+        if parsed1.text == parsed2.text:
+            return True
 
-        if not (same_operands and same_operators):
+        if parsed1.canonical is None or parsed2.canonical is None:
             return False
 
-        return structure1 == structure2
+        # Canonical nodes are hash-consed: equal structure means same object,
+        # which also implies the same operands and operators.
+        return parsed1.canonical is parsed2.canonical
 
     def are_equations_unique(self, eq1: str, eq2: str) -> bool:
         """
@@ -243,18 +261,14 @@ class EquationValidator:
         """
         Get a detailed signature of an equation for debugging/analysis purposes.
         """
-        operands, operators, structure = self._extract_operands_and_operators(equation)
-        try:
-            value = safe_eval(equation)
-        except Exception:
-            value = None
+        parsed = self.parse(equation)
 
         return {
-            "equation": equation,
-            "operands": dict(operands),
-            "operators": dict(operators),
-            "canonical_form": structure,
-            "numerical_value": value,
+            "equation": parsed.equation,
+            "operands": dict(parsed.operands),
+            "operators": dict(parsed.operators),
+            "canonical_form": parsed.canonical_form,
+            "numerical_value": parsed.value,
         }
 
 
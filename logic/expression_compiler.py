@@ -0,0 +1,588 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import math
+import operator as op
+import re
+import threading
+from collections import OrderedDict
+from fractions import Fraction
+
+# Opcodes of a compiled RPN program
+PUSH = 0
+UNARY = 1
+BINARY = 2
+
+# Opcodes of the specialised program run by the exact evaluator
+_EXACT_PUSH = 0
+_EXACT_NEG = 1
+_EXACT_ADD = 2
+_EXACT_SUB = 3
+_EXACT_MUL = 4
+_EXACT_DIV = 5
+
+_EXACT_CODES = {
+    op.neg: _EXACT_NEG,
+    op.add: _EXACT_ADD,
+    op.sub: _EXACT_SUB,
+    op.mul: _EXACT_MUL,
+    op.truediv: _EXACT_DIV,
+}
+
+BINARY_OPERATORS = {
+    "+": op.add,
+    "-": op.sub,
+    "*": op.mul,
+    "/": op.truediv,
+}
+
+# Operators Python would parse but the game does not allow
+DISALLOWED_OPERATORS = {
+    "**": "Pow",
+    "//": "FloorDiv",
+}
+
+# Binding strength on the operator stack; unary minus binds tightest
+_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "**": 2, "//": 2, "neg": 3}
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*|\.\d+)|(\*\*|//|[-+*/()]))")
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER_CHARS = frozenset("0123456789.")
+
+
+def _join_whitespace(match):
+    """Drop a whitespace run unless it keeps two tokens apart."""
+    text = match.string
+    start, end = match.span()
+    if start == 0 or end == len(text):
+        return ""
+    before, after = text[start - 1], text[end]
+    if (before in _NUMBER_CHARS and after in _NUMBER_CHARS) or (
+        before == after and before in "*/"
+    ):
+        return " "
+    return ""
+
+
+def normalize_expression(expr: str) -> str:
+    """
+    Return the cache key of an expression: the string without whitespace,
+    except single spaces that separate tokens, so "1 2" never becomes "12".
+    """
+    if _WHITESPACE.search(expr) is None:
+        return expr
+    return _WHITESPACE.sub(_join_whitespace, expr)
+
+
+class BudgetExceeded(ValueError):
+    """Raised when an expression needs more work than its budget allows."""
+
+
+class EvaluationBudget:
+    """
+    Limits on the work one expression may cost, so hostile input such as
+    ``99999999999999999999*99999999999999999999*...`` is rejected early.
+
+    - max_literal_digits: digits allowed in a single number
+    - max_bit_length: size allowed for any intermediate integer
+    - max_nodes: numbers and operators allowed in the whole expression
+    """
+
+    def __init__(
+        self, max_literal_digits=15, max_bit_length=256, max_nodes=100000
+    ):
+        self.max_literal_digits = max_literal_digits
+        self.max_bit_length = max_bit_length
+        self.max_nodes = max_nodes
+
+    def check_digits(self, digits):
+        if digits > self.max_literal_digits:
+            raise BudgetExceeded(
+                f"numbers may have at most {self.max_literal_digits} digits"
+            )
+
+    def check_nodes(self, nodes):
+        if nodes > self.max_nodes:
+            raise BudgetExceeded(
+                f"equations may have at most {self.max_nodes} numbers and operators"
+            )
+
+    def check_bit_length(self, bits):
+        if bits > self.max_bit_length:
+            raise BudgetExceeded("intermediate result is too large")
+
+    def check(self, compiled):
+        """Check the size of an already compiled expression."""
+        self.check_digits(compiled.max_literal_digits)
+        self.check_nodes(len(compiled.program))
+
+
+def _syntax_error():
+    return ValueError("Invalid syntax in expression")
+
+
+def _number(text):
+    if "." in text:
+        return float(text)
+    if text[0] == "0" and text.strip("0"):
+        # Python rejects leading zeros such as "07"
+        raise _syntax_error()
+    try:
+        return int(text)
+    except ValueError:
+        raise _syntax_error()
+
+
+def compile_expression(expr: str, budget=None):
+    """
+    Tokenize and parse an expression string straight into RPN.
+
+    This is an operator-precedence (shunting-yard) parser with explicit
+    stacks, so it runs in linear time and never recurses, however deeply
+    the expression is nested. It accepts the same arithmetic as Python's
+    own parser: ints and decimals, binary ``+ - * /``, unary ``-`` and
+    parentheses. Malformed input raises ValueError; unary ``+``, ``**``
+    and ``//`` raise TypeError as disallowed operators.
+
+    With an EvaluationBudget, parsing stops with BudgetExceeded as soon as
+    a number has too many digits or the expression too many nodes.
+    """
+    max_digits = 0
+    decimals = {}
+    nodes = 0
+    node_limit = budget.max_nodes if budget else math.inf
+    program = []
+    emit = program.append
+    pending = []
+    disallowed = None
+    expect_operand = True
+    pos = 0
+    end = len(expr.rstrip())
+
+    while pos < end:
+        match = _TOKEN.match(expr, pos)
+        if match is None:
+            raise _syntax_error()
+        pos = match.end()
+        number, token = match.groups()
+
+        if number is not None:
+            if not expect_operand:
+                raise _syntax_error()
+            digits = len(number) - ("." in number)
+            if digits > max_digits:
+                max_digits = digits
+                if budget is not None:
+                    budget.check_digits(digits)
+            nodes += 1
+            if nodes > node_limit:
+                budget.check_nodes(nodes)
+            value = _number(number)
+            if type(value) is float:
+                decimals[len(program)] = number
+            emit((PUSH, value))
+            expect_operand = False
+
+        elif token == "(":
+            if not expect_operand:
+                raise _syntax_error()
+            pending.append(token)
+
+        elif token == ")":
+            if expect_operand:
+                raise _syntax_error()
+            while pending and pending[-1] != "(":
+                _emit_operator(emit, pending.pop())
+            if not pending:
+                raise _syntax_error()
+            pending.pop()
+
+        elif expect_operand:
+            # Prefix operator
+            nodes += 1
+            if nodes > node_limit:
+                budget.check_nodes(nodes)
+            if token == "-":
+                pending.append("neg")
+            elif token == "+":
+                disallowed = disallowed or "UAdd"
+                pending.append("neg")
+            else:
+                raise _syntax_error()
+
+        else:
+            if token in DISALLOWED_OPERATORS:
+                disallowed = disallowed or DISALLOWED_OPERATORS[token]
+            nodes += 1
+            if nodes > node_limit:
+                budget.check_nodes(nodes)
+            precedence = _PRECEDENCE[token]
+            while (
+                pending
+                and pending[-1] != "("
+                and _PRECEDENCE[pending[-1]] >= precedence
+            ):
+                _emit_operator(emit, pending.pop())
+            pending.append(token)
+            expect_operand = True
+
+    if expect_operand:
+        raise _syntax_error()
+    while pending:
+        token = pending.pop()
+        if token == "(":
+            raise _syntax_error()
+        _emit_operator(emit, token)
+
+    if disallowed:
+        raise TypeError(f"Disallowed operator: {disallowed}")
+    compiled = CompiledExpression(program, max_digits, decimals)
+    if budget is not None:
+        budget.check(compiled)
+    return compiled
+
+
+def _emit_operator(emit, token):
+    if token == "neg":
+        emit((UNARY, op.neg))
+    else:
+        # Disallowed operators only need a placeholder; compiling fails
+        emit((BINARY, BINARY_OPERATORS.get(token, op.mul)))
+
+
+class CompiledExpression:
+    """
+    An expression flattened into a postfix (RPN) program.
+
+    Each instruction is an ``(opcode, argument)`` pair: PUSH carries a
+    literal, UNARY and BINARY carry the operator function to apply to the
+    top of the stack. Evaluating is a single loop with no recursion and no
+    AST type dispatch.
+    """
+
+    def __init__(self, program, max_literal_digits=0, decimals=None):
+        self.program = program
+        self.max_literal_digits = max_literal_digits
+        # Source text of decimal literals, by program index
+        self.decimals = decimals or {}
+        self._exact_program = None
+        self._has_decimals = False
+        # The folded program run with plain ints when there is no division
+        # and no decimal literal, else ()
+        self._int_program = None
+
+    def evaluate(self, budget=None, exact=False):
+        """
+        Run the program and return the value of the expression.
+        With an EvaluationBudget, any multiplication whose integer result
+        would exceed ``max_bit_length`` raises BudgetExceeded before it runs.
+        With ``exact``, see ``evaluate_exact``.
+        """
+        if exact:
+            return self.evaluate_exact(budget)
+        if budget is not None:
+            return self._evaluate_bounded(budget)
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for opcode, arg in self.program:
+            if opcode == PUSH:
+                push(arg)
+            elif opcode == BINARY:
+                right = pop()
+                stack[-1] = arg(stack[-1], right)
+            else:
+                stack[-1] = arg(stack[-1])
+        return stack[0]
+
+    def evaluate_exact(self, budget=None):
+        """
+        Evaluate with exact rational arithmetic.
+
+        Values stay plain ints while they are integral. A division that
+        does not divide evenly, or a decimal literal, switches to a reduced
+        ``(numerator, denominator)`` pair, which turns back into an int as
+        soon as it becomes integral again. The result is an int, or a
+        ``fractions.Fraction`` if it is not integral.
+
+        Expressions with neither a division nor a decimal literal, most
+        player input, cannot leave the integers, so they run a folded
+        int-only program with no per-instruction type checks.
+        """
+        int_program = self._int_program
+        if int_program is None:
+            int_program = self._int_program = self._build_int_program()
+        if int_program:
+            return _run_int_program(int_program, budget)
+
+        program = self._exact_program
+        if program is None:
+            program = self._exact_program = self._build_exact_program()
+
+        checked = budget is not None
+        rational = self._has_decimals
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for code, arg in program:
+            if code == _EXACT_PUSH:
+                push(arg)
+            elif code == _EXACT_NEG:
+                value = stack[-1]
+                if type(value) is int:
+                    stack[-1] = -value
+                else:
+                    stack[-1] = (-value[0], value[1])
+            elif not rational:
+                # Small-integer fast path: both operands are ints
+                right = pop() if arg is None else arg
+                left = stack[-1]
+                if code == _EXACT_ADD:
+                    stack[-1] = left + right
+                elif code == _EXACT_SUB:
+                    stack[-1] = left - right
+                elif code == _EXACT_MUL:
+                    if checked:
+                        budget.check_bit_length(
+                            left.bit_length() + right.bit_length()
+                        )
+                    stack[-1] = left * right
+                elif left % right:
+                    stack[-1] = _rational(left, right)
+                    rational = True
+                else:
+                    stack[-1] = left // right
+            else:
+                right = pop() if arg is None else arg
+                stack[-1] = _rational_op(code, stack[-1], right, budget)
+
+        value = stack[0]
+        if type(value) is int:
+            return value
+        return Fraction(*value)
+
+    def _build_int_program(self):
+        # Same literal folding as _build_exact_program, keeping the
+        # operator functions of the float program
+        if self.decimals:
+            return ()
+        program = []
+        for opcode, arg in self.program:
+            if opcode == PUSH:
+                program.append((PUSH, None, arg))
+            elif arg is op.truediv:
+                return ()
+            elif (
+                opcode == BINARY
+                and len(program) > 1
+                and program[-1][0] == PUSH
+            ):
+                program[-1] = (BINARY, arg, program[-1][2])
+            else:
+                program.append((opcode, arg, None))
+        return program
+
+    def _build_exact_program(self):
+        # Decimal literals become exact ints or pairs, and a literal that is
+        # immediately consumed by a binary operator is folded into that
+        # instruction as its right operand, saving a dispatch per literal.
+        self._has_decimals = bool(self.decimals)
+        program = []
+        for index, (opcode, arg) in enumerate(self.program):
+            if opcode == PUSH:
+                if index in self.decimals:
+                    value = Fraction(self.decimals[index])
+                    if value.denominator == 1:
+                        arg = value.numerator
+                    else:
+                        arg = (value.numerator, value.denominator)
+                program.append((_EXACT_PUSH, arg))
+                continue
+
+            code = _EXACT_CODES[arg]
+            if (
+                opcode == BINARY
+                and len(program) > 1
+                and program[-1][0] == _EXACT_PUSH
+            ):
+                program[-1] = (code, program[-1][1])
+            else:
+                program.append((code, None))
+        return program
+
+    def _evaluate_bounded(self, budget):
+        # Only multiplication can grow an integer faster than one bit per
+        # node, and ints never exceed max_bit_length so floats cannot
+        # overflow either.
+        mul = op.mul
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        for opcode, arg in self.program:
+            if opcode == PUSH:
+                push(arg)
+            elif opcode == BINARY:
+                right = pop()
+                left = stack[-1]
+                if arg is mul and type(left) is int and type(right) is int:
+                    budget.check_bit_length(
+                        left.bit_length() + right.bit_length()
+                    )
+                stack[-1] = arg(left, right)
+            else:
+                stack[-1] = arg(stack[-1])
+        return stack[0]
+
+
+def _run_int_program(program, budget):
+    """Run a program from ``_build_int_program``; every value is an int."""
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    if budget is None:
+        for opcode, func, right in program:
+            if opcode == BINARY:
+                if right is None:
+                    right = pop()
+                stack[-1] = func(stack[-1], right)
+            elif opcode == PUSH:
+                push(right)
+            else:
+                stack[-1] = func(stack[-1])
+        return stack[0]
+
+    mul = op.mul
+    for opcode, func, right in program:
+        if opcode == BINARY:
+            if right is None:
+                right = pop()
+            left = stack[-1]
+            if func is mul:
+                budget.check_bit_length(left.bit_length() + right.bit_length())
+            stack[-1] = func(left, right)
+        elif opcode == PUSH:
+            push(right)
+        else:
+            stack[-1] = func(stack[-1])
+    return stack[0]
+
+
+def _rational(numerator, denominator):
+    """Reduce a fraction to an int or a ``(numerator, denominator)`` pair."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    divisor = math.gcd(numerator, denominator)
+    if divisor != 1:
+        numerator //= divisor
+        denominator //= divisor
+    if denominator == 1:
+        return numerator
+    return (numerator, denominator)
+
+
+def _rational_op(code, left, right, budget):
+    """Apply a binary operator when either operand may be a pair."""
+    if type(left) is int:
+        a, b = left, 1
+    else:
+        a, b = left
+    if type(right) is int:
+        c, d = right, 1
+    else:
+        c, d = right
+
+    if budget is not None:
+        budget.check_bit_length(
+            a.bit_length() + b.bit_length() + c.bit_length() + d.bit_length()
+        )
+
+    if code == _EXACT_ADD:
+        return _rational(a * d + c * b, b * d)
+    if code == _EXACT_SUB:
+        return _rational(a * d - c * b, b * d)
+    if code == _EXACT_MUL:
+        return _rational(a * c, b * d)
+    if c == 0:
+        raise ZeroDivisionError("division by zero")
+    return _rational(a * d, b * c)
+
+
+class ExpressionCache:
+    """
+    Bounded LRU cache of compiled expressions, keyed by the
+    whitespace-normalized expression string.
+
+    Only expressions that compile successfully are cached; syntax errors
+    and disallowed operators are raised again on every lookup.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, expr: str, budget=None) -> CompiledExpression:
+        """
+        Return the compiled form of ``expr``, compiling it on a miss.
+        A budget is enforced on hits as well as while compiling.
+        """
+        key = normalize_expression(expr)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if compiled is not None:
+            if budget is not None:
+                budget.check(compiled)
+            return compiled
+
+        compiled = compile_expression(key, budget)
+        with self._lock:
+            self._entries[key] = compiled
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        """Drop every cached program and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the hit/miss counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Shared by safe_eval and EquationValidator
+expression_cache = ExpressionCache()
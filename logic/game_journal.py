@@ -0,0 +1,118 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import json
+import os
+
+JOURNAL_FORMAT = "broken-calculator-journal"
+JOURNAL_VERSION = 1
+
+
+class GameJournal:
+    """
+    Append-only record of the current game, one JSON object per line.
+
+    Every change to the game appends a record that is encoded once, when
+    it happens. Saving writes the encoded lines as they are; saving again
+    to the same file appends only the lines added since, unless the file
+    was changed in between. The activity is handed a new path for every
+    save, so there each save writes the whole journal. Starting a new game
+    resets the journal to a header and that game's record, so its size,
+    and the time to save or replay it, never grows with the number of
+    games played.
+    """
+
+    def __init__(self):
+        self.lines = []
+        # (path, line count, size) of the last save, for appending deltas
+        self._synced = None
+        self.reset()
+
+    def reset(self, record=None):
+        """Start a new journal, optionally with a first record."""
+        # The next save rewrites the file instead of appending to it
+        self._synced = None
+        self.lines = [self._encode(
+            {"kind": "journal", "format": JOURNAL_FORMAT,
+             "version": JOURNAL_VERSION}
+        )]
+        if record is not None:
+            self.append(record)
+
+    def append(self, record):
+        """Add a record, a JSON-serializable dict with a ``kind`` key."""
+        self.lines.append(self._encode(record))
+
+    def save(self, path):
+        """
+        Write the journal to ``path``. If ``path`` holds exactly what the
+        last save wrote and the journal has only grown since, just the new
+        lines are appended; otherwise the file is replaced atomically.
+        """
+        synced = self._synced
+        if (
+            synced is not None
+            and synced[0] == path
+            and synced[1] <= len(self.lines)
+            and os.path.exists(path)
+            and os.path.getsize(path) == synced[2]
+        ):
+            delta = b"".join(self.lines[synced[1]:])
+            if delta:
+                with open(path, "ab") as f:
+                    f.write(delta)
+            size = synced[2] + len(delta)
+        else:
+            data = b"".join(self.lines)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            size = len(data)
+        self._synced = (path, len(self.lines), size)
+
+    def load(self, path) -> list:
+        """
+        Read the journal saved at ``path`` and return its records, after
+        the header. A torn last line, left by an interrupted append, is
+        dropped. Raises ValueError if the file is not a game journal.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        lines = data.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(b"\n"):
+            lines.pop()
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                raise ValueError(f"Corrupt game journal: {path}") from None
+        if not records or records[0].get("format") != JOURNAL_FORMAT:
+            raise ValueError(f"Not a game journal: {path}")
+        if records[0].get("version") != JOURNAL_VERSION:
+            raise ValueError(
+                f"Unsupported game journal version: {records[0].get('version')}"
+            )
+
+        self.lines = lines
+        self._synced = (path, len(lines), sum(map(len, lines)))
+        return records[1:]
+
+    @staticmethod
+    def _encode(record) -> bytes:
+        return (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
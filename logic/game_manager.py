@@ -15,18 +15,62 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
+import queue
 import random
+import threading
+import time
+
+from logic.best_score_solver import BestScoreSolver
+from logic.canonical_form import from_postfix, to_postfix
 from logic.equation_validator import EquationValidator
 from logic.score_calculator import ScoreCalculator
-from logic.broken_button_validator import BrokenButtonValidator
+from logic.scoring_profile import DEFAULT_PROFILE, load_profiles
+from logic.broken_button_validator import (
+    BUTTON_BITS,
+    REQUIRED_SOLUTIONS,
+    BrokenButtonValidator,
+    buttons_to_mask,
+    equation_mask,
+    mask_to_buttons,
+)
+from logic.game_journal import GameJournal
+from logic.keystroke_log import KeystrokeLog
+from logic.puzzle_bank import PuzzleBank
+from logic.large_target_solver import LARGE_VALUE_BOUND
+from logic.puzzle_solver import DEFAULT_MAX_KEYSTROKES
+from logic.solvability_table import SolvabilityTable
+
+# Puzzles generated ahead of time by the prefetch thread
+PREFETCH_DEPTH = 2
+
+# Targets of the large-target mode
+LARGE_TARGET_RANGE = (1000, LARGE_VALUE_BOUND)
 
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, prefetch=True, large_targets=False,
+                 scoring_profile=DEFAULT_PROFILE.name):
         # Game logic components
         self.equation_validator = EquationValidator()
-        self.score_calculator = ScoreCalculator()
-        self.broken_validator = BrokenButtonValidator()
+        # Scoring rules by name, from data/scoring_profiles.json
+        try:
+            self.scoring_profiles = load_profiles()
+        except (OSError, ValueError) as e:
+            print(f"Could not load scoring profiles: {e}")
+            self.scoring_profiles = {DEFAULT_PROFILE.name: DEFAULT_PROFILE}
+        if scoring_profile not in self.scoring_profiles:
+            scoring_profile = DEFAULT_PROFILE.name
+        self.set_scoring_profile(scoring_profile)
+        # The table in data/ is built before packaging and needs NumPy;
+        # without it puzzles the bank lacks are solved live
+        self.broken_validator = BrokenButtonValidator(table=SolvabilityTable.load())
+        # Puzzles built offline by build_puzzle_bank.py and shipped in data/
+        self.puzzle_bank = PuzzleBank.load()
+        # Built on demand for the current broken buttons
+        self._best_score_solver = None
+
+        # Play with targets up to LARGE_VALUE_BOUND instead of 10 to 200
+        self.large_targets = large_targets
 
         # Game state variables
         self.target_number = 0
@@ -36,27 +80,186 @@ class GameManager:
         self.game_completed = False
         self.broken_buttons = []
 
-    def start_level(self):
-        """Start a new game. This now only sets up data."""
+        # Signatures of self.equations, for constant time uniqueness checks
+        self.equation_signatures = set()
 
-        self.target_number = random.randint(10, 200)
-        broken_count = random.randint(3, 7)
+        # Changes to the current game, saved and replayed by write_file and
+        # read_file
+        self.journal = GameJournal()
+        # Recent button presses and puzzles, for replaying the session
+        self.keystroke_log = KeystrokeLog()
 
-        # Generate broken buttons
-        # Assuming generate_broken_buttons does not use Pygame
-        self.broken_buttons = self.broken_validator.generate_broken_buttons(
-            self.target_number, broken_count
-        )
+        # Next puzzles, filled by a worker thread while the current one is
+        # played so starting a level never waits for generation. The thread
+        # is started by the first start_level and runs until
+        # stop_prefetching is called.
+        self.prefetch = prefetch
+        self._prefetched = queue.Queue(maxsize=PREFETCH_DEPTH)
+        # The validator and its solvers are shared, so generate one at a time
+        self._generate_lock = threading.Lock()
+        self._stop_prefetch = threading.Event()
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.last_fill_latency = None
+        self._fill_count = 0
+        self._fill_time = 0.0
+        self._prefetch_thread = None
+
+    def start_level(self, puzzle=None):
+        """
+        Start a new game. This now only sets up data.
+        ``puzzle`` is a ``(target, broken_buttons)`` pair to play instead
+        of a generated one.
+        """
+
+        if puzzle is None:
+            try:
+                puzzle = self._prefetched.get_nowait()
+                self.prefetch_hits += 1
+            except queue.Empty:
+                puzzle = self._generate_locked()
+                self.prefetch_misses += 1
+        if self.prefetch:
+            self.start_prefetching()
+        self._begin_game(*puzzle)
+        self.keystroke_log.record_new_game(self.target_number, self.broken_mask)
+        self.journal.reset({
+            "kind": "game",
+            "target": self.target_number,
+            "broken_mask": self.broken_mask,
+            "profile": self.score_calculator.profile.name,
+        })
+
+    def _begin_game(self, target, broken_buttons):
+        self.target_number, self.broken_buttons = target, broken_buttons
 
         # Reset game state data
         self.equations = []
+        self.equation_signatures = set()
         self.current_equation = ""
         self.total_score = 0
         self.game_completed = False
 
+    def generate_puzzle(self):
+        """
+        Pick a target and broken buttons for a new game. Puzzles come from
+        the puzzle bank when it has one of the chosen kind, and are
+        generated live otherwise. If no large-target puzzle is found in
+        time, a regular one is played instead.
+        """
+        broken_count = random.randint(3, 7)
+        if self.large_targets:
+            puzzle = self.broken_validator.generate_large_puzzle(
+                LARGE_TARGET_RANGE, broken_count
+            )
+            if puzzle is not None:
+                return puzzle
+
+        target = random.randint(10, 200)
+
+        if self.puzzle_bank is not None:
+            puzzle = self.puzzle_bank.draw(target, broken_count)
+            if puzzle is not None:
+                return target, puzzle.broken_buttons
+
+        # Generate broken buttons
+        broken_buttons = self.broken_validator.generate_broken_buttons(
+            target, broken_count
+        )
+        return target, broken_buttons
+
+    def _generate_locked(self):
+        with self._generate_lock:
+            return self.generate_puzzle()
+
+    def _prefetch_loop(self):
+        """Keep the prefetch queue full until stop_prefetching is called."""
+        while not self._stop_prefetch.is_set():
+            start = time.perf_counter()
+            puzzle = self._generate_locked()
+            self.last_fill_latency = time.perf_counter() - start
+            self._fill_count += 1
+            self._fill_time += self.last_fill_latency
+
+            while not self._stop_prefetch.is_set():
+                try:
+                    self._prefetched.put(puzzle, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def start_prefetching(self):
+        """Start the prefetch thread if it is not already running."""
+        if self._prefetch_thread is not None:
+            return
+        self.prefetch = True
+        self._stop_prefetch.clear()
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch_loop, name="puzzle-prefetch", daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def stop_prefetching(self):
+        """
+        Stop the prefetch thread and wait for it to exit. Later levels are
+        generated when they start until start_prefetching is called again.
+        """
+        self.prefetch = False
+        self._stop_prefetch.set()
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join()
+            self._prefetch_thread = None
+
+    def prefetch_stats(self) -> dict:
+        """
+        Return the prefetch queue depth, how often a level started from it,
+        and how long generating a queued puzzle took (in seconds).
+        """
+        return {
+            "depth": self._prefetched.qsize(),
+            "capacity": PREFETCH_DEPTH,
+            "hits": self.prefetch_hits,
+            "misses": self.prefetch_misses,
+            "last_fill_latency": self.last_fill_latency,
+            "mean_fill_latency": (
+                self._fill_time / self._fill_count if self._fill_count else None
+            ),
+        }
+
+    @property
+    def broken_buttons(self):
+        """Broken buttons of the current puzzle, for the UI."""
+        return self._broken_buttons
+
+    @broken_buttons.setter
+    def broken_buttons(self, buttons):
+        # The mask is what every check uses
+        self._broken_buttons = list(buttons)
+        self.broken_mask = buttons_to_mask(self._broken_buttons)
+
     def is_button_broken(self, value):
         """Check if a button is broken. This is pure logic, so it stays."""
-        return value in self.broken_buttons
+        return bool(BUTTON_BITS.get(value, 0) & self.broken_mask)
+
+    def press(self, value):
+        """
+        Apply a press of the calculator pad button ``value``, as the
+        activity does for a click, and log it. Returns the error message
+        if "=" submitted an invalid equation, else None.
+        """
+        self.keystroke_log.record(value)
+        if self.game_completed:
+            return None
+
+        if value == "C":
+            self.current_equation = ""
+        elif value == "backspace":
+            self.current_equation = self.current_equation[:-1]
+        elif value == "=":
+            return self.submit_equation()
+        else:
+            self.current_equation += value
+        return None
 
     def submit_equation(self):
         """
@@ -69,25 +272,42 @@ class GameManager:
         # Convert display symbols back to Python operators for evaluation
         equation_for_eval = self.current_equation.replace("×", "*").replace("÷", "/")
 
+        # The pad disables broken buttons, but typed or graded input may not
+        if equation_mask(equation_for_eval) & self.broken_mask:
+            return "Equation uses a broken button!"
+
+        # Parse once; validation, uniqueness and scoring all share it
+        parsed = self.equation_validator.parse(equation_for_eval)
+
         # Validate equation
-        result = self.equation_validator.validate(equation_for_eval, self.target_number)
+        result = self.equation_validator.validate(parsed, self.target_number)
 
         if result["valid"]:
             # Check if equation is unique
-            if not self.is_equation_unique(equation_for_eval):
+            if not self.is_equation_unique(parsed):
                 return "Equation already used!"  # Return error message
 
             # Calculate score
-            score = self.score_calculator.calculate_score(equation_for_eval)
+            score = self.score_calculator.calculate_score(parsed)
 
             # Add equation to list
-            self.equations.append({"equation": self.current_equation, "score": score})
+            self.equations.append(
+                {"equation": self.current_equation, "score": score, "parsed": parsed}
+            )
+            self.equation_signatures.add(parsed.signature)
 
             self.total_score += score
+            self.journal.append({
+                "kind": "equation",
+                "equation": self.current_equation,
+                "signature": to_postfix(parsed.signature),
+                "score": score,
+                "total_score": self.total_score,
+            })
             self.current_equation = ""
 
             # Check if game is complete
-            if len(self.equations) >= 5:
+            if len(self.equations) >= REQUIRED_SOLUTIONS:
                 self.complete_game()
 
             return None  # IMPORTANT: Return None for success
@@ -95,25 +315,80 @@ class GameManager:
             return result["error"]  # Return the error message from the validator
 
     def is_equation_unique(self, equation):
-        """Check if equation is unique. This is pure logic, so it stays."""
-        equation_normalized = equation.replace(" ", "")
-        for eq in self.equations:
-            # Assuming are_equations_equivalent does not use Pygame
-            if self.equation_validator.are_equations_equivalent(
-                equation_normalized,
-                eq["equation"].replace("×", "*").replace("÷", "/").replace(" ", ""),
-            ):
-                return False
-        return True
+        """
+        Check if equation is unique. Accepts a string or a ParsedEquation
+        and costs a single lookup in the signature index.
+        """
+        parsed = self.equation_validator.parse(equation)
+        return parsed.signature not in self.equation_signatures
+
+    def set_scoring_profile(self, name):
+        """
+        Score equations from now on with the named profile in
+        ``scoring_profiles``. Raises KeyError for an unknown name.
+        """
+        profile = self.scoring_profiles[name]
+        self.score_calculator = ScoreCalculator(profile)
+        self._best_score_solver = None
+
+    def best_possible_equation(self, max_keystrokes=DEFAULT_MAX_KEYSTROKES):
+        """
+        Return ``(equation, score)`` for the highest-scoring equation of the
+        current puzzle within ``max_keystrokes``, or None if there is none.
+        """
+        solver = self._best_score_solver
+        if solver is None or solver.broken != frozenset(self.broken_buttons):
+            solver = self._best_score_solver = BestScoreSolver(
+                self.broken_buttons, profile=self.score_calculator.profile
+            )
+        return solver.best_equation(self.target_number, max_keystrokes)
 
     def complete_game(self):
         """Handle game completion. This now only sets the state flag."""
         self.game_completed = True
+        self.journal.append({"kind": "complete"})
+
+    def write_file(self, filename):
+        """
+        Write game state to a file, as the journal of the current game.
+        Saving to the file of the previous save only appends what changed.
+        """
+        self.journal.save(filename)
 
-    def write_file(filename):
-        """Write game state to a file."""
-        pass
+    def read_file(self, filename):
+        """
+        Read game state from a file written by ``write_file``. The journal
+        is replayed as recorded: equations are not validated or scored
+        again. Raises OSError or ValueError if the file cannot be used.
+        """
+        records = self.journal.load(filename)
+        try:
+            self._replay(records)
+        except (AttributeError, KeyError, TypeError) as e:
+            raise ValueError(f"Corrupt game journal: {filename}") from e
+        # Log the restored game so replaying the log rebuilds it
+        self.keystroke_log.record_resumed_game(
+            self.target_number,
+            self.broken_mask,
+            [eq["equation"] for eq in self.equations],
+        )
 
-    def read_file(filename):
-        """Read game state from a file."""
-        pass
+    def _replay(self, records):
+        for record in records:
+            kind = record.get("kind")
+            if kind == "game":
+                self._begin_game(
+                    record["target"], mask_to_buttons(record["broken_mask"])
+                )
+                if record.get("profile") in self.scoring_profiles:
+                    self.set_scoring_profile(record["profile"])
+            elif kind == "equation":
+                self.equations.append({
+                    "equation": record["equation"],
+                    "score": record["score"],
+                    "parsed": None,
+                })
+                self.equation_signatures.add(from_postfix(record["signature"]))
+                self.total_score = record["total_score"]
+            elif kind == "complete":
+                self.game_completed = True
@@ -0,0 +1,161 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import threading
+import time
+
+from logic.canonical_form import canonicalize
+from logic.expression_compiler import compile_expression
+from logic.large_target_solver import LARGE_MAX_KEYSTROKES, LargeTargetSolver
+from logic.puzzle_solver import DEFAULT_VALUE_BOUND, PuzzleSolver
+
+# Seconds a hint search may take
+HINT_TIME_BUDGET = 0.1
+
+# Same, for targets too large for the PuzzleSolver tables
+LARGE_HINT_TIME_BUDGET = 0.5
+
+# Longest equation a hint may suggest
+HINT_MAX_KEYSTROKES = 9
+
+
+class HintEngine:
+    """
+    Finds an equation for the current puzzle that the player has not
+    entered yet (by ``ParsedEquation.signature``), off the UI thread.
+
+    The search deepens one keystroke at a time, so the first hint found is
+    one of the shortest, and it can be cancelled or run out of time at any
+    point. ``post`` hands results back to the UI thread; the activity
+    passes ``GLib.idle_add``. By default results are delivered from the
+    worker thread.
+    """
+
+    def __init__(self, post=None, time_budget=HINT_TIME_BUDGET,
+                 max_keystrokes=HINT_MAX_KEYSTROKES):
+        self.post = post if post is not None else _call
+        self.time_budget = time_budget
+        self.max_keystrokes = max_keystrokes
+
+        self._request = 0
+        self._cancel = threading.Event()
+        # Solver of the last puzzle, reused by later hints for it
+        self._solver = None
+        self._solver_lock = threading.Lock()
+
+    def find_hint(self, target, broken_buttons, used_signatures,
+                  deadline=None, cancel=None, budget=None):
+        """
+        Search for a hint and return it, or None if none was found before
+        the ``time.monotonic()`` deadline or ``cancel`` (an Event) was set.
+        ``budget`` instead gives the seconds the search may take, counted
+        from when the solver is free.
+        """
+        large = abs(target) > DEFAULT_VALUE_BOUND
+        solver_class = LargeTargetSolver if large else PuzzleSolver
+        with self._solver_lock:
+            if cancel is not None and cancel.is_set():
+                return None
+            if budget is not None:
+                deadline = time.monotonic() + budget
+            solver = self._solver
+            if (
+                type(solver) is not solver_class
+                or solver.broken != frozenset(broken_buttons)
+            ):
+                solver = self._solver = solver_class(broken_buttons)
+            if large:
+                return self._find_large_hint(
+                    solver, target, used_signatures, deadline, cancel
+                )
+
+            for length in range(1, self.max_keystrokes + 1):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if not solver.explore(length, deadline, cancel):
+                    return None
+                for equation in solver.iter_equations(target, length):
+                    signature = canonicalize(compile_expression(equation))
+                    if signature not in used_signatures:
+                        return equation
+                    if deadline is not None and time.monotonic() > deadline:
+                        return None
+        return None
+
+    def _find_large_hint(self, solver, target, used_signatures, deadline,
+                         cancel):
+        """
+        A LargeTargetSolver joins its tables in one pass, so keep the
+        shortest new equation seen until the pass ends or time runs out.
+        """
+        # Out of time, the finished lengths are still joined below
+        solver.explore(LARGE_MAX_KEYSTROKES, deadline, cancel)
+        if cancel is not None and cancel.is_set():
+            return None
+        best = None
+        for equation in solver.iter_equations(
+            target, LARGE_MAX_KEYSTROKES, deadline
+        ):
+            if best is None or len(equation) < len(best):
+                signature = canonicalize(compile_expression(equation))
+                if signature not in used_signatures:
+                    best = equation
+            if cancel is not None and cancel.is_set():
+                return None
+            if deadline is not None and time.monotonic() > deadline:
+                break
+        return best
+
+    def start(self, target, broken_buttons, used_signatures, on_result):
+        """
+        Search in a worker thread, cancelling any search still running.
+        ``on_result(hint)`` is posted with the hint, or None, unless the
+        search was cancelled.
+        """
+        self.cancel()
+        self._request += 1
+        request = self._request
+        cancel = self._cancel = threading.Event()
+        used = frozenset(used_signatures)
+
+        def work():
+            if abs(target) > DEFAULT_VALUE_BOUND:
+                budget = LARGE_HINT_TIME_BUDGET
+            else:
+                budget = self.time_budget
+            # A search this one replaced may still hold the solver briefly
+            hint = self.find_hint(
+                target, broken_buttons, used, cancel=cancel, budget=budget
+            )
+            if not cancel.is_set():
+                self.post(deliver, hint)
+
+        def deliver(hint):
+            # A newer request or a cancel may have come in meanwhile
+            if request == self._request and not cancel.is_set():
+                on_result(hint)
+            return False
+
+        threading.Thread(target=work, name="hint-search", daemon=True).start()
+
+    def cancel(self):
+        """Cancel the running search; its result is never delivered."""
+        self._cancel.set()
+
+
+def _call(function, *args):
+    function(*args)
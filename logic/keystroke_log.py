@@ -0,0 +1,317 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Keystroke log of a play session, and headless replay of it.
+
+File layout:
+
+- header (little endian): magic ``BCKL``, format version and number of
+  events
+- events: one code byte, then an unsigned LEB128 value. For a button or
+  the start of a game the value is the milliseconds since the previous
+  event; a new game is followed by two events giving its target and
+  broken-button mask. A game resumed from the Journal is recorded the same
+  way, then the equations it already had are recorded as button presses
+  0 ms apart, so replaying the log rebuilds the resumed game. Input with
+  no button, such as a typed space, is recorded one character per event,
+  with its code point as the value and no time of its own.
+
+Replay a saved session from the activity root:
+    python -m logic.keystroke_log keystrokes.bckl
+"""
+
+import argparse
+import os
+import struct
+import time
+from array import array
+
+from logic.broken_button_validator import mask_to_buttons
+
+MAGIC = b"BCKL"
+VERSION = 2
+HEADER = struct.Struct("<4sHI")
+
+# Calculator pad values, coded by their index
+BUTTON_VALUES = (
+    "0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+    "+", "-", "*", "/", "(", ")", ".", "C", "backspace", "=",
+)
+BUTTON_CODES = {value: code for code, value in enumerate(BUTTON_VALUES)}
+
+# Start of a game, then its puzzle as two events
+NEW_GAME = 0x80
+PUZZLE_TARGET = 0x81
+PUZZLE_MASK = 0x82
+# Like NEW_GAME, for a game resumed from the Journal (version 2 on)
+RESUMED_GAME = 0x83
+# A character entered without a button (version 2 on)
+CHARACTER = 0x84
+
+# Events kept before the oldest are overwritten
+DEFAULT_CAPACITY = 4096
+
+MAX_VALUE = 0xFFFFFFFF
+
+
+class KeystrokeLog:
+    """
+    Ring buffer of the buttons pressed in a session and when.
+
+    Events are kept as a code byte and a 32-bit value in two preallocated
+    arrays, so recording never allocates and a full log overwrites its
+    oldest events. ``dropped`` counts the events overwritten so far.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, clock=time.monotonic):
+        self.capacity = capacity
+        self.clock = clock
+        self._codes = bytearray(capacity)
+        self._values = array("I", bytes(capacity * 4))
+        self._start = 0
+        self._count = 0
+        self._last_time = None
+        self.dropped = 0
+
+    def __len__(self):
+        return self._count
+
+    def record(self, value):
+        """
+        Record a press of the calculator pad button ``value``. Any other
+        input is recorded as its characters, timed with the next press.
+        """
+        code = BUTTON_CODES.get(value)
+        if code is None:
+            self._push_text(value)
+        else:
+            self._push(code, self._elapsed())
+
+    def record_new_game(self, target, broken_mask):
+        """Record the start of a game and its puzzle."""
+        self._push(NEW_GAME, self._elapsed())
+        self._push(PUZZLE_TARGET, target)
+        self._push(PUZZLE_MASK, broken_mask)
+
+    def record_resumed_game(self, target, broken_mask, equations):
+        """
+        Record a game restored with the equation strings ``equations``
+        already found, as its puzzle followed by the presses that enter
+        them.
+        """
+        self._push(RESUMED_GAME, self._elapsed())
+        self._push(PUZZLE_TARGET, target)
+        self._push(PUZZLE_MASK, broken_mask)
+        submit = BUTTON_CODES["="]
+        for equation in equations:
+            self._push_text(equation)
+            self._push(submit, 0)
+
+    def events(self):
+        """Yield the kept ``(code, value)`` events, oldest first."""
+        codes, values, capacity = self._codes, self._values, self.capacity
+        for i in range(self._start, self._start + self._count):
+            i %= capacity
+            yield codes[i], values[i]
+
+    def clear(self):
+        self._start = 0
+        self._count = 0
+        self._last_time = None
+
+    def save(self, path):
+        """Write the kept events atomically."""
+        data = bytearray(HEADER.pack(MAGIC, VERSION, self._count))
+        for code, value in self.events():
+            data.append(code)
+            while value > 0x7F:
+                data.append(value & 0x7F | 0x80)
+                value >>= 7
+            data.append(value)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, capacity=None):
+        """
+        Read a log written by ``save``. Raises ValueError if the file is
+        not a keystroke log.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"Not a keystroke log: {path}")
+        magic, version, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError(f"Not a keystroke log: {path}")
+        if not 1 <= version <= VERSION:
+            raise ValueError(f"Unsupported keystroke log version: {version}")
+
+        log = cls(max(count, capacity or DEFAULT_CAPACITY))
+        position = HEADER.size
+        try:
+            for _ in range(count):
+                code = data[position]
+                value = 0
+                shift = 0
+                while True:
+                    byte = data[position + 1]
+                    position += 1
+                    value |= (byte & 0x7F) << shift
+                    if byte < 0x80:
+                        break
+                    shift += 7
+                position += 1
+                log._push(code, value)
+        except IndexError:
+            raise ValueError(f"Truncated keystroke log: {path}") from None
+        return log
+
+    def _elapsed(self):
+        """Milliseconds since the previous event."""
+        now = self.clock()
+        last, self._last_time = self._last_time, now
+        if last is None:
+            return 0
+        return min(int((now - last) * 1000), MAX_VALUE)
+
+    def _push_text(self, text):
+        """Record ``text`` as presses 0 ms apart, escaping non-buttons."""
+        for char in text:
+            code = BUTTON_CODES.get(char)
+            if code is None:
+                self._push(CHARACTER, ord(char))
+            else:
+                self._push(code, 0)
+
+    def _push(self, code, value):
+        capacity = self.capacity
+        if self._count == capacity:
+            index = self._start
+            self._start = (self._start + 1) % capacity
+            self.dropped += 1
+        else:
+            index = (self._start + self._count) % capacity
+            self._count += 1
+        self._codes[index] = code
+        self._values[index] = value
+
+
+def replay(log, game=None):
+    """
+    Drive a GameManager with the events of ``log`` as fast as possible,
+    without a display, and return a summary of each game played:
+    its target, broken-button mask, accepted equations with their scores,
+    total score, rejected submissions, whether it was completed and
+    whether it was resumed from the Journal.
+
+    Buttons pressed before the first complete puzzle in the log (which
+    may have been overwritten) are skipped.
+    """
+    if game is None:
+        # GameManager records into a KeystrokeLog, so import it late
+        from logic.game_manager import GameManager
+
+        game = GameManager(prefetch=False)
+
+    submit = BUTTON_CODES["="]
+    games = []
+    summary = None
+    target = None
+    expected = None
+    resumed = False
+    for code, value in log.events():
+        if code == NEW_GAME or code == RESUMED_GAME:
+            expected = PUZZLE_TARGET
+            resumed = code == RESUMED_GAME
+        elif code == PUZZLE_TARGET and expected == PUZZLE_TARGET:
+            target, expected = value, PUZZLE_MASK
+        elif code == PUZZLE_MASK and expected == PUZZLE_MASK:
+            expected = None
+            game.start_level((target, mask_to_buttons(value)))
+            summary = {
+                "target": target,
+                "broken_mask": value,
+                "equations": [],
+                "total_score": 0,
+                "errors": [],
+                "completed": False,
+                "resumed": resumed,
+            }
+            games.append(summary)
+        elif summary is not None and code == CHARACTER and value <= 0x10FFFF:
+            game.press(chr(value))
+        elif summary is not None and code < len(BUTTON_VALUES):
+            error = game.press(BUTTON_VALUES[code])
+            if code != submit:
+                continue
+            if error:
+                summary["errors"].append(error)
+            else:
+                summary["equations"] = [
+                    (eq["equation"], eq["score"]) for eq in game.equations
+                ]
+                summary["total_score"] = game.total_score
+                summary["completed"] = game.game_completed
+    return games
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay a keystroke log without a display."
+    )
+    parser.add_argument("log")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="print every game played")
+    args = parser.parse_args(argv)
+
+    log = KeystrokeLog.load(args.log)
+    start = time.perf_counter()
+    games = replay(log)
+    elapsed = time.perf_counter() - start
+
+    if args.verbose:
+        for summary in games:
+            print(
+                f"target {summary['target']} "
+                f"broken {mask_to_buttons(summary['broken_mask'])} "
+                f"score {summary['total_score']} "
+                f"{'completed' if summary['completed'] else 'unfinished'}"
+                f"{' (resumed)' if summary['resumed'] else ''}"
+            )
+            for equation, score in summary["equations"]:
+                print(f"    {equation} = {summary['target']}  +{score}")
+            for error in summary["errors"]:
+                print(f"    rejected: {error}")
+    recorded = sum(
+        value for code, value in log.events()
+        if code < len(BUTTON_VALUES) or code in (NEW_GAME, RESUMED_GAME)
+    ) / 1000
+    print(
+        f"{len(log)} events, {len(games)} games, recorded over "
+        f"{recorded:.1f} s, replayed in {elapsed * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
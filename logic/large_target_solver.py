@@ -0,0 +1,115 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+from logic.canonical_form import canonicalize
+from logic.expression_compiler import compile_expression
+from logic.puzzle_solver import PuzzleSolver
+
+# Largest target of the large-target mode, and of any sub-expression
+LARGE_VALUE_BOUND = 10**6
+
+# Keystrokes explored for each side of the last operator
+DEFAULT_HALF_KEYSTROKES = 5
+
+# Longest equation a large-target solver looks for
+LARGE_MAX_KEYSTROKES = 2 * DEFAULT_HALF_KEYSTROKES + 1
+
+
+class LargeTargetSolver(PuzzleSolver):
+    """
+    Meet-in-the-middle PuzzleSolver for targets up to LARGE_VALUE_BOUND.
+
+    Building the tables up to the full keystroke limit explodes once
+    sub-expressions may be that large, so tables are only built for
+    ``half_keystrokes``. An equation is then found by joining a left
+    table and a right table on its last operator, the join that
+    PuzzleSolver.iter_equations already does, which reaches equations of
+    up to ``2 * half_keystrokes + 1`` keystrokes while memory stays that
+    of the half-length tables.
+
+    Equations whose last operator splits them into a side longer than
+    ``half_keystrokes`` are not found, apart from the target typed as a
+    single number.
+    """
+
+    def __init__(self, broken_buttons, half_keystrokes=DEFAULT_HALF_KEYSTROKES,
+                 value_bound=LARGE_VALUE_BOUND):
+        super().__init__(broken_buttons, value_bound)
+        self.half_keystrokes = half_keystrokes
+
+    def explore(self, max_keystrokes, deadline=None, cancel=None) -> bool:
+        """Build the tables, never beyond ``half_keystrokes``."""
+        return super().explore(
+            min(max_keystrokes, self.half_keystrokes), deadline, cancel
+        )
+
+    def find_equation(self, target, max_keystrokes=LARGE_MAX_KEYSTROKES,
+                      deadline=None):
+        """Return a shortest equation found for ``target``, or None."""
+        shortest = None
+        for equation in self.iter_equations(target, max_keystrokes, deadline):
+            if shortest is None or len(equation) < len(shortest):
+                shortest = equation
+        return shortest
+
+    def is_reachable(self, target, max_keystrokes=LARGE_MAX_KEYSTROKES,
+                     deadline=None) -> bool:
+        """Check if an equation for ``target`` is found."""
+        for _ in self.iter_equations(target, max_keystrokes, deadline):
+            return True
+        return False
+
+    def iter_equations(self, target, max_keystrokes=LARGE_MAX_KEYSTROKES,
+                       deadline=None):
+        """
+        Yield distinct equation strings for ``target`` within
+        ``max_keystrokes``: the target as a number, then every join of
+        the half-length tables. If the deadline passes while the tables
+        are built, only the finished lengths are joined.
+        """
+        self.explore(max_keystrokes, deadline)
+
+        literal = str(target)
+        typed = (
+            self.half_keystrokes < len(literal) <= max_keystrokes
+            and all(d in self.digits for d in literal)
+        )
+        if typed:
+            yield literal
+        yield from self._iter_splits(target, max_keystrokes)
+
+    def count_solutions(self, target, max_keystrokes=LARGE_MAX_KEYSTROKES,
+                        limit=None, deadline=None) -> int:
+        """
+        Count structurally distinct equations among those yielded by
+        ``iter_equations``, stopping early at ``limit``. Counts are only
+        memoized once the half-length tables are complete.
+        """
+        key = (target, max_keystrokes, limit)
+        count = self._solution_counts.get(key)
+        if count is not None:
+            return count
+
+        seen = set()
+        for equation in self.iter_equations(target, max_keystrokes, deadline):
+            seen.add(canonicalize(compile_expression(equation)))
+            if limit is not None and len(seen) >= limit:
+                break
+        count = len(seen)
+        if self.levels >= min(max_keystrokes, self.half_keystrokes):
+            self._solution_counts[key] = count
+        return count
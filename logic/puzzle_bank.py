@@ -0,0 +1,182 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Binary bank of pre-generated puzzles, built offline by build_puzzle_bank.py.
+
+File layout (little endian):
+
+- header: magic ``BCPB``, format version, first target, number of
+  targets and number of records
+- index: for every target and every broken button count (0 to 16), the
+  first record and the number of records of that kind
+- records: target, broken-button mask, distinct solution count,
+  difficulty and minimum keystrokes, grouped in index order
+"""
+
+import os
+import random
+import struct
+from collections import namedtuple
+
+from logic.broken_button_validator import ALL_BUTTONS, mask_to_buttons
+
+MAGIC = b"BCPB"
+VERSION = 1
+
+BANK_TARGETS = range(10, 201)
+BROKEN_COUNTS = len(ALL_BUTTONS) + 1
+
+HEADER = struct.Struct("<4sHHHI")
+INDEX_ENTRY = struct.Struct("<II")
+RECORD = struct.Struct("<HHBBB")
+
+# Solution counts above this are stored as this
+SOLUTION_COUNT_CAP = 255
+
+DEFAULT_BANK_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "puzzles.bank",
+)
+
+Puzzle = namedtuple(
+    "Puzzle", "target broken_buttons solutions difficulty min_keystrokes"
+)
+
+
+def puzzle_difficulty(broken_count, min_keystrokes, solutions) -> int:
+    """
+    Rough difficulty of a puzzle: more broken buttons, longer shortest
+    answers and fewer distinct solutions all make it harder.
+    """
+    scarcity = max(0, 31 - solutions) // 4
+    return broken_count + 2 * (min_keystrokes - 1) + scarcity
+
+
+class PuzzleBank:
+    """
+    Read-only puzzle bank. Drawing a puzzle for a target and broken
+    button count is a single index lookup.
+    """
+
+    def __init__(self, data):
+        magic, version, first_target, target_count, record_count = (
+            HEADER.unpack_from(data)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a puzzle bank")
+
+        self.data = data
+        self.targets = range(first_target, first_target + target_count)
+        self.record_count = record_count
+        self._records_start = (
+            HEADER.size + target_count * BROKEN_COUNTS * INDEX_ENTRY.size
+        )
+        if len(data) != self._records_start + record_count * RECORD.size:
+            raise ValueError("truncated puzzle bank")
+
+    @classmethod
+    def load(cls, path=DEFAULT_BANK_PATH):
+        """Load a bank, or return None if it is missing or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                return cls(f.read())
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def __len__(self):
+        return self.record_count
+
+    def count(self, target, broken_count) -> int:
+        """Number of banked puzzles for a target and broken button count."""
+        return self._slot(target, broken_count)[1]
+
+    def draw(self, target, broken_count):
+        """
+        Return a random banked Puzzle for ``target`` with exactly
+        ``broken_count`` broken buttons, or None if the bank has none.
+        """
+        if target not in self.targets or not 0 <= broken_count < BROKEN_COUNTS:
+            return None
+        first, count = self._slot(target, broken_count)
+        if not count:
+            return None
+        return self.record(first + random.randrange(count))
+
+    def record(self, i) -> Puzzle:
+        """Decode the i-th record."""
+        target, mask, solutions, difficulty, min_keystrokes = (
+            RECORD.unpack_from(self.data, self._records_start + i * RECORD.size)
+        )
+        return Puzzle(
+            target, mask_to_buttons(mask), solutions, difficulty, min_keystrokes
+        )
+
+    def _slot(self, target, broken_count):
+        slot = (target - self.targets.start) * BROKEN_COUNTS + broken_count
+        return INDEX_ENTRY.unpack_from(
+            self.data, HEADER.size + slot * INDEX_ENTRY.size
+        )
+
+
+class PuzzleBankWriter:
+    """
+    Collects records as they arrive, in any order, and writes them out
+    grouped by target and broken button count behind the index.
+    """
+
+    def __init__(self, targets=BANK_TARGETS):
+        self.targets = targets
+        self._slots = [bytearray() for _ in range(len(targets) * BROKEN_COUNTS)]
+        self.record_count = 0
+
+    def add(self, target, mask, solutions, difficulty, min_keystrokes):
+        broken_count = bin(mask).count("1")
+        slot = (target - self.targets.start) * BROKEN_COUNTS + broken_count
+        self._slots[slot] += RECORD.pack(
+            target,
+            mask,
+            min(solutions, SOLUTION_COUNT_CAP),
+            difficulty,
+            min_keystrokes,
+        )
+        self.record_count += 1
+
+    def save(self, path):
+        """Write the bank atomically."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(
+                HEADER.pack(
+                    MAGIC,
+                    VERSION,
+                    self.targets.start,
+                    len(self.targets),
+                    self.record_count,
+                )
+            )
+            first = 0
+            for records in self._slots:
+                count = len(records) // RECORD.size
+                f.write(INDEX_ENTRY.pack(first, count))
+                first += count
+            for records in self._slots:
+                f.write(records)
+        os.replace(tmp_path, path)
@@ -0,0 +1,331 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import time
+
+from logic.canonical_form import canonicalize
+from logic.expression_compiler import compile_expression
+
+# Keystrokes explored by default when checking a new puzzle
+DEFAULT_MAX_KEYSTROKES = 7
+
+# Largest absolute value kept for any sub-expression
+DEFAULT_VALUE_BOUND = 1000
+
+
+class PuzzleSolver:
+    """
+    Finds equations that can be typed with the working buttons of a puzzle.
+
+    Values are explored by dynamic programming over keystroke count, one
+    table per grammar level so every witness is a valid string without
+    redundant parentheses:
+
+    - factors: numbers, ``(expr)`` and ``-factor``
+    - terms: factors and ``term * factor``, ``term / factor``
+    - exprs: terms and ``expr + term``, ``expr - term``
+
+    Each table maps a value to its shortest witness equation. A value is
+    only combined further at the length where it first appears, since any
+    longer way of writing it can only lead to longer equations. Only
+    integer sub-expressions with an absolute value up to ``value_bound``
+    are kept, so a "reachable" answer is always correct while a rare
+    solution that needs fractions or huge intermediates may be missed.
+
+    Tables are built lazily and kept, so one solver answers any number of
+    targets for the same broken buttons.
+    """
+
+    def __init__(self, broken_buttons, value_bound=DEFAULT_VALUE_BOUND):
+        self.broken = broken = frozenset(broken_buttons)
+        self.digits = [d for d in "0123456789" if d not in broken]
+        self.add_operators = [o for o in "+-" if o not in broken]
+        self.mul_operators = [o for o in "*/" if o not in broken]
+        self.has_minus = "-" not in broken
+        self.has_parentheses = "(" not in broken and ")" not in broken
+        self.value_bound = value_bound
+
+        # Keystroke lengths that have been fully explored
+        self.levels = 0
+
+        # value -> shortest witness, for each grammar level
+        self.factors = {}
+        self.terms = {}
+        self.exprs = {}
+
+        # Values first found at each length, for each grammar level
+        self._factors_by_length = [[]]
+        self._terms_by_length = [[]]
+        self._exprs_by_length = [[]]
+
+        # (target, max_keystrokes, limit) -> memoized count_solutions result
+        self._solution_counts = {}
+
+    def explore(self, max_keystrokes, deadline=None, cancel=None) -> bool:
+        """
+        Build the tables up to ``max_keystrokes``. Returns False if the
+        ``time.monotonic()`` deadline passed or ``cancel`` (an Event) was
+        set first; the work done so far is kept and the next call resumes
+        from the first unfinished length.
+        """
+        while self.levels < max_keystrokes:
+            length = self.levels + 1
+            if not self._explore_length(length, deadline, cancel):
+                return False
+            self.levels = length
+        return True
+
+    def find_equation(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                      deadline=None):
+        """
+        Return a shortest equation for ``target`` within ``max_keystrokes``,
+        or None if there is none (or the deadline passed before one was
+        found).
+        """
+        if target not in self.exprs:
+            self._explore_until(target, max_keystrokes, deadline)
+        witness = self.exprs.get(target)
+        if witness is None or len(witness) > max_keystrokes:
+            return None
+        return witness
+
+    def is_reachable(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                     deadline=None) -> bool:
+        """Check if ``target`` can be typed within ``max_keystrokes``."""
+        return self.find_equation(target, max_keystrokes, deadline) is not None
+
+    def min_keystrokes(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                       deadline=None):
+        """Fewest keystrokes needed for ``target``, or None if unreachable."""
+        witness = self.find_equation(target, max_keystrokes, deadline)
+        return None if witness is None else len(witness)
+
+    def iter_equations(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                       deadline=None):
+        """
+        Yield distinct equation strings for ``target`` within
+        ``max_keystrokes``: the shortest witness, then every way of
+        splitting ``target`` at its last ``+ - * /`` into two table
+        entries. Different strings may still be equivalent equations.
+        """
+        self.explore(max_keystrokes, deadline)
+        yield from self._iter_splits(target, max_keystrokes)
+
+    def _iter_splits(self, target, max_keystrokes):
+        """
+        Join the tables built so far on the last operator, without
+        exploring further: a hash lookup of the right operand for each
+        left operand.
+        """
+        witness = self.exprs.get(target)
+        if witness is not None and len(witness) <= max_keystrokes:
+            yield witness
+
+        # expr (+|-) term
+        for left, left_witness in list(self.exprs.items()):
+            room = max_keystrokes - len(left_witness) - 1
+            if room < 1:
+                continue
+            for operator in self.add_operators:
+                if operator == "+":
+                    right = target - left
+                else:
+                    right = left - target
+                right_witness = self.terms.get(right)
+                if right_witness is not None and len(right_witness) <= room:
+                    equation = left_witness + operator + right_witness
+                    if equation != witness:
+                        yield equation
+
+        # term (*|/) factor
+        for left, left_witness in list(self.terms.items()):
+            room = max_keystrokes - len(left_witness) - 1
+            if room < 1 or left == 0:
+                continue
+            for operator in self.mul_operators:
+                if operator == "*":
+                    if target % left:
+                        continue
+                    right = target // left
+                else:
+                    if target == 0 or left % target:
+                        continue
+                    right = left // target
+                right_witness = self.factors.get(right)
+                if right_witness is not None and len(right_witness) <= room:
+                    equation = left_witness + operator + right_witness
+                    if equation != witness:
+                        yield equation
+
+    def count_solutions(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                        limit=None, deadline=None) -> int:
+        """
+        Count structurally distinct equations for ``target`` among those
+        yielded by ``iter_equations``, deduplicated by canonical form as in
+        ``EquationValidator.are_equations_equivalent``. This is a lower
+        bound on all solutions.
+
+        Lengths are tried in increasing order so counting stops at the
+        shortest length that reaches ``limit``, often well before the
+        tables are fully built. Finished counts are memoized, and the
+        tables are shared by every target of this solver.
+        """
+        key = (target, max_keystrokes, limit)
+        count = self._solution_counts.get(key)
+        if count is not None:
+            return count
+
+        count = 0
+        for length in range(1, max_keystrokes + 1):
+            if not self.explore(length, deadline):
+                # Out of time: report what is known without memoizing it
+                return count
+            count = self._count_distinct(target, length, limit)
+            if limit is not None and count >= limit:
+                break
+        self._solution_counts[key] = count
+        return count
+
+    def _count_distinct(self, target, max_keystrokes, limit):
+        seen = set()
+        for equation in self.iter_equations(target, max_keystrokes):
+            seen.add(canonicalize(compile_expression(equation)))
+            if limit is not None and len(seen) >= limit:
+                break
+        return len(seen)
+
+    def _explore_until(self, target, max_keystrokes, deadline):
+        while self.levels < max_keystrokes and target not in self.exprs:
+            if not self.explore(self.levels + 1, deadline):
+                return
+
+    def _literals(self, length):
+        """Number literals of exactly ``length`` digits within the bound."""
+        if length > len(str(self.value_bound)):
+            return []
+        if length == 1:
+            return list(self.digits)
+        literals = [d for d in self.digits if d != "0"]
+        for _ in range(length - 1):
+            literals = [prefix + d for prefix in literals for d in self.digits]
+        return [lit for lit in literals if int(lit) <= self.value_bound]
+
+    def _explore_length(self, length, deadline, cancel=None):
+        bound = self.value_bound
+        # Once every value in range is known nothing new can be found
+        saturated = 2 * bound + 1
+        factors, terms, exprs = self.factors, self.terms, self.exprs
+        new_factors, new_terms, new_exprs = [], [], []
+
+        # Factors: literals, (expr), -factor
+        for literal in self._literals(length):
+            value = int(literal)
+            if value not in factors:
+                factors[value] = literal
+                new_factors.append(value)
+        if self.has_minus and length >= 2:
+            for value in self._factors_by_length[length - 1]:
+                if -value not in factors:
+                    factors[-value] = "-" + factors[value]
+                    new_factors.append(-value)
+        if self.has_parentheses and length >= 3:
+            for value in self._exprs_by_length[length - 2]:
+                if value not in factors:
+                    factors[value] = "(" + exprs[value] + ")"
+                    new_factors.append(value)
+
+        # Terms: factors, term (*|/) factor
+        for value in new_factors:
+            if value not in terms:
+                terms[value] = factors[value]
+                new_terms.append(value)
+        for left_length in range(1, length - 1):
+            right_factors = self._factors_by_length[length - 1 - left_length]
+            if not right_factors or len(terms) == saturated:
+                continue
+            if _expired(deadline, cancel):
+                self._discard(new_factors, new_terms, new_exprs)
+                return False
+            for left in self._terms_by_length[left_length]:
+                left_witness = terms[left]
+                magnitude = abs(left)
+                limit = bound // magnitude if magnitude else bound
+                for operator in self.mul_operators:
+                    # right_factors is sorted by absolute value
+                    for right in right_factors:
+                        if operator == "*":
+                            if abs(right) > limit:
+                                break
+                            value = left * right
+                        else:
+                            if magnitude and abs(right) > magnitude:
+                                break
+                            if right == 0 or left % right:
+                                continue
+                            value = left // right
+                        if value not in terms:
+                            terms[value] = (
+                                left_witness + operator + factors[right]
+                            )
+                            new_terms.append(value)
+
+        # Exprs: terms, expr (+|-) term
+        for value in new_terms:
+            if value not in exprs:
+                exprs[value] = terms[value]
+                new_exprs.append(value)
+        for left_length in range(1, length - 1):
+            right_terms = self._terms_by_length[length - 1 - left_length]
+            if not right_terms or len(exprs) == saturated:
+                continue
+            if _expired(deadline, cancel):
+                self._discard(new_factors, new_terms, new_exprs)
+                return False
+            for left in self._exprs_by_length[left_length]:
+                left_witness = exprs[left]
+                for operator in self.add_operators:
+                    for right in right_terms:
+                        if operator == "+":
+                            value = left + right
+                        else:
+                            value = left - right
+                        if -bound <= value <= bound and value not in exprs:
+                            exprs[value] = left_witness + operator + terms[right]
+                            new_exprs.append(value)
+
+        for values in (new_factors, new_terms, new_exprs):
+            values.sort(key=abs)
+        self._factors_by_length.append(new_factors)
+        self._terms_by_length.append(new_terms)
+        self._exprs_by_length.append(new_exprs)
+        return True
+
+    def _discard(self, new_factors, new_terms, new_exprs):
+        """Undo a partly explored length so it can be redone from scratch."""
+        for value in new_factors:
+            del self.factors[value]
+        for value in new_terms:
+            del self.terms[value]
+        for value in new_exprs:
+            del self.exprs[value]
+
+
+def _expired(deadline, cancel):
+    """True once the deadline has passed or the search was cancelled."""
+    if cancel is not None and cancel.is_set():
+        return True
+    return deadline is not None and time.monotonic() > deadline
@@ -0,0 +1,416 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.canonical_form import combine, literal
+from logic.puzzle_solver import DEFAULT_MAX_KEYSTROKES, DEFAULT_VALUE_BOUND
+
+# How the witness of a value was built, as recorded in the recipe arrays
+LITERAL = 1  # a number typed as is
+NEGATE = 2  # "-" and a factor
+PAREN = 3  # "(" expr ")"
+LOWER = 4  # the witness of the level below: factor as term, term as expr
+BINARY_CODES = {"+": 5, "-": 6, "*": 7, "/": 8}
+BINARY_OPERATORS = {code: op for op, code in BINARY_CODES.items()}
+
+
+class ReachableSets:
+    """
+    NumPy version of the PuzzleSolver tables, for analysing many puzzles.
+
+    For each grammar level, the values first reachable with exactly k
+    keystrokes are kept as an int array, and every value's first length
+    in an array indexed by ``value + value_bound``. Combining two lengths
+    is one broadcast operation and ``np.unique`` instead of a Python loop
+    over pairs. Only integer sub-expressions within ``value_bound`` are
+    considered.
+
+    Candidates are laid out in the order PuzzleSolver tries them, so the
+    first occurrence of a value is the derivation of its PuzzleSolver
+    witness. That derivation is kept in recipe arrays (kind, left and
+    right operand values), from which witnesses are rendered and their
+    canonical forms built without any string parsing. Values, lengths,
+    witnesses and solution counts are therefore exactly those of
+    PuzzleSolver, with no PuzzleSolver involved.
+
+    Requires NumPy.
+    """
+
+    def __init__(self, broken_buttons, value_bound=DEFAULT_VALUE_BOUND):
+        if np is None:
+            raise ImportError("ReachableSets requires NumPy")
+        self.broken = broken = frozenset(broken_buttons)
+        self.digits = [d for d in "0123456789" if d not in broken]
+        self.add_operators = [o for o in "+-" if o not in broken]
+        self.mul_operators = [o for o in "*/" if o not in broken]
+        self.has_minus = "-" not in broken
+        self.has_parentheses = "(" not in broken and ")" not in broken
+        self.value_bound = value_bound
+
+        self.levels = 0
+        size = 2 * value_bound + 1
+        # First length of each value (0 = not reachable yet), per level
+        self.factor_lengths = np.zeros(size, dtype=np.uint8)
+        self.term_lengths = np.zeros(size, dtype=np.uint8)
+        self.expr_lengths = np.zeros(size, dtype=np.uint8)
+        # Values first reachable at each length, per level, sorted by
+        # absolute value like PuzzleSolver's
+        self.factors_by_length = [_empty()]
+        self.terms_by_length = [_empty()]
+        self.exprs_by_length = [_empty()]
+        # Recipe of each value's witness, per level
+        self._factor_recipe = _recipe(size)
+        self._term_recipe = _recipe(size)
+        self._expr_recipe = _recipe(size)
+
+    def explore(self, max_keystrokes):
+        """Build the sets up to ``max_keystrokes``."""
+        while self.levels < max_keystrokes:
+            self._explore_length(self.levels + 1)
+            self.levels += 1
+
+    def min_keystrokes(self, targets, max_keystrokes=DEFAULT_MAX_KEYSTROKES):
+        """
+        Fewest keystrokes for each of ``targets`` as an array, with 0 for
+        targets that are unreachable within ``max_keystrokes``.
+        """
+        self.explore(max_keystrokes)
+        targets = np.asarray(targets)
+        lengths = np.zeros(len(targets), dtype=np.uint8)
+        inside = np.abs(targets) <= self.value_bound
+        lengths[inside] = self.expr_lengths[targets[inside] + self.value_bound]
+        lengths[lengths > max_keystrokes] = 0
+        return lengths
+
+    def find_equation(self, target, max_keystrokes=DEFAULT_MAX_KEYSTROKES):
+        """``PuzzleSolver.find_equation``, rendered from the recipes."""
+        self.explore(max_keystrokes)
+        if abs(target) > self.value_bound:
+            return None
+        length = self.expr_lengths[target + self.value_bound]
+        if not length or length > max_keystrokes:
+            return None
+        return self._render(self._expr_recipe, target)
+
+    def solution_counts(self, targets, max_keystrokes=DEFAULT_MAX_KEYSTROKES,
+                        limit=None):
+        """
+        ``PuzzleSolver.count_solutions`` for every target at once.
+
+        The joins of ``iter_equations`` are done as broadcasts over the
+        sets. Telling solutions apart needs the canonical form of each
+        operand, which is built from the recipes once per value; only the
+        candidates of each target are then visited in Python, until
+        ``limit`` distinct ones are found.
+        """
+        self.explore(max_keystrokes)
+
+        targets = np.asarray(targets)
+        candidates = {target: [] for target in targets.tolist()}
+        for operator, values, lefts, rights in self._splits(
+            targets, max_keystrokes
+        ):
+            for target, a, b in zip(
+                values.tolist(), lefts.tolist(), rights.tolist()
+            ):
+                candidates[target].append((operator, a, b))
+
+        canonical = {}
+        canonical_of = self._canonical_builder(canonical)
+        factor, term, expr = (
+            self._factor_recipe, self._term_recipe, self._expr_recipe
+        )
+        bound = self.value_bound
+
+        counts = []
+        for target in targets.tolist():
+            # Nodes are interned, so (op, children) identifies a node; "-"
+            # and "/" keep their operands as they are, so they skip combine
+            seen = set()
+            length = self.expr_lengths[target + bound] if abs(target) <= bound else 0
+            if length and length <= max_keystrokes:
+                node = canonical_of(expr, target)
+                seen.add((node.op, node.children) if node.op else node)
+            for operator, a, b in candidates[target]:
+                if limit is not None and len(seen) >= limit:
+                    break
+                if operator in "+-":
+                    operands = (canonical_of(expr, a), canonical_of(term, b))
+                else:
+                    operands = (canonical_of(term, a), canonical_of(factor, b))
+                if operator in "-/":
+                    seen.add((operator, operands))
+                else:
+                    node = combine(operator, operands)
+                    seen.add((node.op, node.children))
+            counts.append(len(seen))
+        return counts
+
+    def _canonical_builder(self, cache):
+        """
+        Return ``canonical_of(recipe, value)``, the interned canonical form
+        of a witness, built bottom-up from the recipes and memoized in
+        ``cache``. Recursion is bounded by the keystroke count.
+        """
+        bound = self.value_bound
+        lower = {
+            id(self._term_recipe): self._factor_recipe,
+            id(self._expr_recipe): self._term_recipe,
+        }
+        factor, term, expr = (
+            self._factor_recipe, self._term_recipe, self._expr_recipe
+        )
+
+        def canonical_of(recipe, value):
+            key = (id(recipe), value)
+            node = cache.get(key)
+            if node is not None:
+                return node
+            kinds, lefts, rights = recipe
+            index = value + bound
+            kind = int(kinds[index])
+            if kind == LITERAL:
+                node = literal(value)
+            elif kind == NEGATE:
+                node = combine("neg", (canonical_of(factor, int(lefts[index])),))
+            elif kind == PAREN:
+                node = canonical_of(expr, int(lefts[index]))
+            elif kind == LOWER:
+                node = canonical_of(lower[id(recipe)], value)
+            else:
+                operator = BINARY_OPERATORS[kind]
+                if operator in "+-":
+                    left, right = expr, term
+                else:
+                    left, right = term, factor
+                node = combine(operator, (
+                    canonical_of(left, int(lefts[index])),
+                    canonical_of(right, int(rights[index])),
+                ))
+            cache[key] = node
+            return node
+
+        return canonical_of
+
+    def _render(self, recipe, value):
+        """The witness string of ``value`` in ``recipe``'s level."""
+        factor, term, expr = (
+            self._factor_recipe, self._term_recipe, self._expr_recipe
+        )
+        kinds, lefts, rights = recipe
+        index = value + self.value_bound
+        kind = int(kinds[index])
+        if kind == LITERAL:
+            return str(value)
+        if kind == NEGATE:
+            return "-" + self._render(factor, int(lefts[index]))
+        if kind == PAREN:
+            return "(" + self._render(expr, int(lefts[index])) + ")"
+        if kind == LOWER:
+            return self._render(factor if recipe is term else term, value)
+        operator = BINARY_OPERATORS[kind]
+        left, right = (expr, term) if operator in "+-" else (term, factor)
+        return (
+            self._render(left, int(lefts[index]))
+            + operator
+            + self._render(right, int(rights[index]))
+        )
+
+    def _splits(self, targets, max_keystrokes):
+        """
+        Yield ``(operator, values, lefts, rights)`` arrays for every join
+        of ``iter_equations`` whose value is one of ``targets``.
+        """
+        wanted = np.zeros(2 * self.value_bound + 1, dtype=bool)
+        wanted[targets + self.value_bound] = True
+
+        for left_length in range(1, max_keystrokes - 1):
+            for right_length in range(1, max_keystrokes - left_length):
+                exprs = self.exprs_by_length[left_length]
+                terms = self.terms_by_length[left_length]
+                right_terms = self.terms_by_length[right_length]
+                right_factors = self.factors_by_length[right_length]
+
+                for operator in self.add_operators:
+                    lefts, rights = np.meshgrid(exprs, right_terms,
+                                                indexing="ij")
+                    values = _apply(operator, lefts, rights)
+                    yield self._select(operator, values, lefts, rights, wanted)
+
+                for operator in self.mul_operators:
+                    lefts, rights = np.meshgrid(terms[terms != 0],
+                                                right_factors, indexing="ij")
+                    if operator == "/":
+                        keep = rights != 0
+                        lefts, rights = lefts[keep], rights[keep]
+                        keep = lefts % rights == 0
+                        lefts, rights = lefts[keep], rights[keep]
+                    values = _apply(operator, lefts, rights)
+                    yield self._select(operator, values, lefts, rights, wanted)
+
+    def _select(self, operator, values, lefts, rights, wanted):
+        bound = self.value_bound
+        inside = np.abs(values) <= bound
+        values, lefts, rights = values[inside], lefts[inside], rights[inside]
+        keep = wanted[values + bound]
+        return operator, values[keep], lefts[keep], rights[keep]
+
+    def _literals(self, length):
+        if length > len(str(self.value_bound)):
+            return _empty()
+        if length == 1:
+            literals = [int(d) for d in self.digits]
+        else:
+            leading = [d for d in self.digits if d != "0"]
+            literals = np.array([int(d) for d in leading], dtype=np.int64)
+            digits = np.array([int(d) for d in self.digits], dtype=np.int64)
+            for _ in range(length - 1):
+                literals = (literals[:, None] * 10 + digits[None, :]).ravel()
+            literals = literals[literals <= self.value_bound]
+        return np.asarray(literals, dtype=np.int64)
+
+    def _explore_length(self, length):
+        bound = self.value_bound
+
+        # Factors: literals, -factor, (expr)
+        parts = [_part(self._literals(length), LITERAL)]
+        if self.has_minus and length >= 2:
+            children = self.factors_by_length[length - 1]
+            parts.append(_part(-children, NEGATE, children))
+        if self.has_parentheses and length >= 3:
+            children = self.exprs_by_length[length - 2]
+            parts.append(_part(children, PAREN, children))
+        new_factors, found = _first_seen(
+            self.factor_lengths, self._factor_recipe, parts, length, bound
+        )
+
+        # Terms: factors, term (*|/) factor, tried left by left
+        parts = [_part(found, LOWER)]
+        for left_length in range(1, length - 1):
+            lefts = self.terms_by_length[left_length]
+            rights = self.factors_by_length[length - 1 - left_length]
+            parts.append(self._joins(self.mul_operators, lefts, rights))
+        new_terms, found = _first_seen(
+            self.term_lengths, self._term_recipe, parts, length, bound
+        )
+
+        # Exprs: terms, expr (+|-) term
+        parts = [_part(found, LOWER)]
+        for left_length in range(1, length - 1):
+            lefts = self.exprs_by_length[left_length]
+            rights = self.terms_by_length[length - 1 - left_length]
+            parts.append(self._joins(self.add_operators, lefts, rights))
+        new_exprs, _ = _first_seen(
+            self.expr_lengths, self._expr_recipe, parts, length, bound
+        )
+
+        self.factors_by_length.append(new_factors)
+        self.terms_by_length.append(new_terms)
+        self.exprs_by_length.append(new_exprs)
+
+    def _joins(self, operators, lefts, rights):
+        """
+        Every ``left operator right`` as a recipe part, ordered by left,
+        then operator, then right, as PuzzleSolver tries them. Inexact
+        divisions are left out.
+        """
+        shape = (len(lefts), len(operators), len(rights))
+        left = np.broadcast_to(lefts[:, None, None], shape)
+        right = np.broadcast_to(rights[None, None, :], shape)
+        values = np.zeros(shape, dtype=np.int64)
+        kinds = np.zeros(shape, dtype=np.uint8)
+        valid = np.ones(shape, dtype=bool)
+        for i, operator in enumerate(operators):
+            l, r = left[:, i], right[:, i]
+            kinds[:, i] = BINARY_CODES[operator]
+            if operator == "/":
+                exact = r != 0
+                exact[exact] = l[exact] % r[exact] == 0
+                valid[:, i] = exact
+                values[:, i][exact] = l[exact] // r[exact]
+            else:
+                values[:, i] = _apply(operator, l, r)
+        return (
+            values[valid], kinds[valid], left[valid], right[valid]
+        )
+
+
+def _empty():
+    return np.zeros(0, dtype=np.int64)
+
+
+def _recipe(size):
+    """Kind, left and right operand of each value's witness."""
+    return (
+        np.zeros(size, dtype=np.uint8),
+        np.zeros(size, dtype=np.int64),
+        np.zeros(size, dtype=np.int64),
+    )
+
+
+def _part(values, kind, lefts=None):
+    """Candidate values with a single kind of recipe."""
+    if lefts is None:
+        lefts = values
+    return (
+        values,
+        np.full(len(values), kind, dtype=np.uint8),
+        lefts,
+        np.zeros(len(values), dtype=np.int64),
+    )
+
+
+def _apply(operator, left, right):
+    if operator == "+":
+        return left + right
+    if operator == "-":
+        return left - right
+    if operator == "*":
+        return left * right
+    return left // right
+
+
+def _first_seen(lengths, recipe, parts, length, bound):
+    """
+    Values among the candidate ``parts`` within the bound and not seen
+    before; they are recorded in ``lengths`` as first reachable at
+    ``length``, with the recipe of their first candidate. Returns them
+    sorted by absolute value, ties in order found, and in order found.
+    """
+    values, kinds, lefts, rights = (
+        np.concatenate(column) for column in zip(*parts)
+    )
+    keep = np.abs(values) <= bound
+    keep[keep] = lengths[values[keep] + bound] == 0
+    values, kinds, lefts, rights = (
+        values[keep], kinds[keep], lefts[keep], rights[keep]
+    )
+
+    values, first = np.unique(values, return_index=True)
+    found = np.argsort(first, kind="stable")
+    ordered = np.lexsort((first, np.abs(values)))
+
+    index = values + bound
+    lengths[index] = length
+    recipe[0][index] = kinds[first]
+    recipe[1][index] = lefts[first]
+    recipe[2][index] = rights[first]
+    return values[ordered], values[found]
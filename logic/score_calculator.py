@@ -15,61 +15,134 @@
 # along with this program; if not, write to the Free Software
 # Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
 
+from operator import mul
+
+from logic.scoring_profile import DEFAULT_PROFILE, SCORE_FEATURES
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fewest equations score_many weighs with NumPy; converting a smaller batch
+# to arrays costs more than the plain loop saves
+NUMPY_MIN_BATCH = 64
+
+# Slot of each counted character in the tokenizer's counts
+_COUNTED = {"+": 0, "-": 1, "*": 2, "/": 3, "(": 4}
+
 
 class ScoreCalculator:
-    """Calculates scores for equations based on complexity."""
+    """
+    Calculates scores for equations based on complexity.
 
-    def calculate_score(self, equation):
-        """Calculate score for an equation."""
-        score = 10  # Base score
+    One tokenizing pass turns an equation into a feature vector (see
+    SCORE_FEATURES); the score is its dot product with the weights
+    compiled from ``profile``, a ScoringProfile.
+    """
 
-        # Remove spaces
-        equation = equation.replace(" ", "")
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.profile = profile
+        self.weights = profile.weights
+        self.length_divisor = profile.length_divisor
+        self.length_cap = profile.length_cap
+        # Feature vectors only depend on the length rule, not the weights
+        self._length_rule = (self.length_divisor, self.length_cap)
 
-        # Bonus for each operator
-        operators = ["+", "-", "*", "/"]
-        operator_count = sum(equation.count(op) for op in operators)
-        score += operator_count * 5
+    def calculate_score(self, equation):
+        """
+        Calculate score for an equation.
+        Accepts either a string or a ParsedEquation; for the latter the
+        feature vector is cached on the object.
+        """
+        vector = self._cached_vector(equation)
+        return sum(map(mul, self.weights, vector))
 
-        # Extra bonus for multiplication and division
-        score += equation.count("*") * 3
-        score += equation.count("/") * 3
+    def score_breakdown(self, equation) -> dict:
+        """Points awarded for each scored feature; they sum to the score."""
+        vector = self._cached_vector(equation)
+        return {
+            name: w * v
+            for name, w, v in zip(SCORE_FEATURES, self.weights, vector)
+        }
 
-        # Bonus for parentheses
-        score += equation.count("(") * 10
+    def score_many(self, equations) -> list:
+        """
+        Score a batch of equations (strings or ParsedEquations). With NumPy,
+        a batch of at least NUMPY_MIN_BATCH feature vectors is weighted as
+        a single matrix product.
+        """
+        vectors = [self._cached_vector(eq) for eq in equations]
+        if np is None or len(vectors) < NUMPY_MIN_BATCH:
+            return [sum(map(mul, self.weights, vector)) for vector in vectors]
+        matrix = np.array(vectors, dtype=np.int64)
+        return (matrix @ np.array(self.weights, dtype=np.int64)).tolist()
 
-        # Bonus for equation length
-        score += min(len(equation) // 3, 20)
+    def _cached_vector(self, equation):
+        if isinstance(equation, str):
+            return self.feature_vector(equation)
+        cached = equation.score_features
+        if cached is not None and cached[0] == self._length_rule:
+            return cached[1]
+        vector = self.feature_vector(equation.text)
+        equation.score_features = (self._length_rule, vector)
+        return vector
 
-        # Bonus for using different operators
-        unique_operators = sum(1 for op in operators if op in equation)
-        if unique_operators >= 3:
-            score += 15
-        elif unique_operators >= 2:
-            score += 10
+    def feature_vector(self, equation) -> tuple:
+        """
+        The features that calculate_score rewards, in SCORE_FEATURES order,
+        from a single pass over the equation. Spaces are ignored.
+        """
+        counts = [0, 0, 0, 0, 0]
+        counted = _COUNTED.get
+        length = 0
+        digits = 0
+        multi_digit = 0
 
-        # Bonus for numbers with multiple digits
-        numbers = self.extract_numbers(equation)
-        for num in numbers:
-            if len(num) > 1:
-                score += len(num) * 2
+        for char in equation:
+            if char == " ":
+                continue
+            length += 1
+            if char.isdigit():
+                digits += 1
+                continue
+            # Numbers with multiple digits
+            if digits > 1:
+                multi_digit += digits * 2
+            digits = 0
+            slot = counted(char)
+            if slot is not None:
+                counts[slot] += 1
+        if digits > 1:
+            multi_digit += digits * 2
 
-        return score
+        plus, minus, times, divide, parens = counts
+        unique_operators = (plus > 0) + (minus > 0) + (times > 0) + (divide > 0)
+        return (
+            1,
+            plus + minus + times + divide,
+            times + divide,
+            parens,
+            min(length // self.length_divisor, self.length_cap),
+            int(unique_operators >= 2),
+            int(unique_operators >= 3),
+            multi_digit,
+        )
 
     def extract_numbers(self, equation):
         """Extract all numbers from equation."""
         numbers = []
-        current_num = ""
+        start = None
 
-        for char in equation:
+        for i, char in enumerate(equation):
             if char.isdigit():
-                current_num += char
-            else:
-                if current_num:
-                    numbers.append(current_num)
-                    current_num = ""
-
-        if current_num:
-            numbers.append(current_num)
+                if start is None:
+                    start = i
+            elif start is not None:
+                numbers.append(equation[start:i])
+                start = None
+
+        if start is not None:
+            numbers.append(equation[start:])
 
         return numbers
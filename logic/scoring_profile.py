@@ -0,0 +1,146 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import json
+import os
+
+# Scored features, in feature vector order
+SCORE_FEATURES = (
+    "base",
+    "operators",
+    "mul_div",
+    "parentheses",
+    "length",
+    "two_operator_kinds",
+    "three_operator_kinds",
+    "multi_digit",
+)
+
+# Points per unit of each feature under the standard rules
+DEFAULT_POINTS = {
+    "base": 10,
+    "operators": 5,
+    "mul_div": 3,
+    "parentheses": 10,
+    "length": 1,
+    "two_operator_kinds": 10,
+    "three_operator_kinds": 5,
+    "multi_digit": 1,
+}
+
+# One length unit per this many characters, up to the cap
+DEFAULT_LENGTH_DIVISOR = 3
+DEFAULT_LENGTH_CAP = 20
+
+DEFAULT_PROFILES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "scoring_profiles.json",
+)
+
+
+class ScoringProfile:
+    """
+    A named set of scoring rules, such as those of a grade level or a
+    competition.
+
+    ``points`` gives the non-negative points per unit of each feature in
+    SCORE_FEATURES; features it leaves out keep DEFAULT_POINTS. The
+    profile is compiled once into ``weights``, the vector ScoreCalculator
+    multiplies feature vectors by, so scoring costs the same whatever the
+    profile.
+    """
+
+    def __init__(self, name, points=None, length_divisor=DEFAULT_LENGTH_DIVISOR,
+                 length_cap=DEFAULT_LENGTH_CAP, description=""):
+        points = dict(points or {})
+        unknown = set(points) - set(SCORE_FEATURES)
+        if unknown:
+            raise ValueError(
+                f"Unknown scoring features in profile {name!r}: "
+                + ", ".join(sorted(unknown))
+            )
+        for feature, value in points.items():
+            # BestScoreSolver's pruning bounds assume no feature costs points
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(
+                    f"Points for {feature!r} in profile {name!r} must be "
+                    "a non-negative integer"
+                )
+        if not isinstance(length_divisor, int) or length_divisor < 1:
+            raise ValueError(f"Invalid length_divisor in profile {name!r}")
+        if not isinstance(length_cap, int) or length_cap < 0:
+            raise ValueError(f"Invalid length_cap in profile {name!r}")
+
+        self.name = name
+        self.description = description
+        self.weights = tuple(
+            points.get(feature, DEFAULT_POINTS[feature])
+            for feature in SCORE_FEATURES
+        )
+        self.length_divisor = length_divisor
+        self.length_cap = length_cap
+
+    @classmethod
+    def from_dict(cls, name, data):
+        """Build a profile from its entry in a profiles file."""
+        unknown = set(data) - {
+            "points", "length_divisor", "length_cap", "description"
+        }
+        if unknown:
+            raise ValueError(
+                f"Unknown keys in profile {name!r}: " + ", ".join(sorted(unknown))
+            )
+        return cls(
+            name,
+            points=data.get("points"),
+            length_divisor=data.get("length_divisor", DEFAULT_LENGTH_DIVISOR),
+            length_cap=data.get("length_cap", DEFAULT_LENGTH_CAP),
+            description=data.get("description", ""),
+        )
+
+    @property
+    def points(self) -> dict:
+        """Points per unit of each feature, keyed by feature name."""
+        return dict(zip(SCORE_FEATURES, self.weights))
+
+    def __repr__(self):
+        return f"ScoringProfile({self.name!r})"
+
+
+DEFAULT_PROFILE = ScoringProfile("default", description="Standard rules")
+
+
+def load_profiles(path=DEFAULT_PROFILES_PATH) -> dict:
+    """
+    Read the scoring profiles in a JSON file mapping profile names to
+    their rules, as ``{name: ScoringProfile}``. The default profile is
+    always included, and can be overridden by the file. A missing file
+    gives only the default profile; a malformed one raises ValueError.
+    """
+    profiles = {DEFAULT_PROFILE.name: DEFAULT_PROFILE}
+    if not os.path.exists(path):
+        return profiles
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("A scoring profiles file must map names to profiles")
+    for name, rules in data.items():
+        if not isinstance(rules, dict):
+            raise ValueError(f"Profile {name!r} must be an object")
+        profiles[name] = ScoringProfile.from_dict(name, rules)
+    return profiles
@@ -0,0 +1,210 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+"""
+Precomputed solvability of every broken-button mask and target.
+
+At 12.5 MB data/solvability.npy is not kept in git. Build it, on all
+cores, from the activity root before packaging the bundle, and again
+whenever the solver changes:
+    python -m logic.solvability_table data/solvability.npy
+
+It is optional: data/puzzles.bank supplies nearly every puzzle, and the
+table only speeds up the broken buttons drawn when the bank has none.
+
+Reading it needs NumPy. Without NumPy, or without the file, puzzles are
+checked live by a PuzzleSolver instead.
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from logic.broken_button_validator import ALL_BUTTONS, mask_to_buttons
+from logic.reachable_sets import ReachableSets
+
+MASK_COUNT = 1 << len(ALL_BUTTONS)
+TABLE_TARGETS = range(10, 201)
+TABLE_MAX_KEYSTROKES = 7
+
+# Each entry packs the minimum keystrokes (0 = unreachable) in the low
+# three bits and the distinct solution count, saturating at 31, above them.
+KEYSTROKE_BITS = 3
+KEYSTROKE_MASK = (1 << KEYSTROKE_BITS) - 1
+SOLUTION_COUNT_CAP = (1 << (8 - KEYSTROKE_BITS)) - 1
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "solvability.npy",
+)
+
+
+class SolvabilityTable:
+    """
+    Read-only view of a table of MASK_COUNT rows by TABLE_TARGETS columns,
+    memory-mapped so loading costs nothing and lookups are O(1).
+    Row ``mask`` describes the puzzle whose broken buttons are
+    ``mask_to_buttons(mask)``.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        # target -> (required, {broken count: masks}), built on first use
+        self._solvable_index = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE_PATH):
+        """
+        Memory-map a table built by ``build_table``. Returns None if NumPy
+        is not installed or the file is missing or malformed, in which case
+        callers fall back to solving puzzles live.
+        """
+        if np is None or not os.path.exists(path):
+            return None
+        try:
+            entries = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        if entries.shape != (MASK_COUNT, len(TABLE_TARGETS)):
+            return None
+        return cls(entries)
+
+    def covers(self, target, max_keystrokes=TABLE_MAX_KEYSTROKES) -> bool:
+        """True if the table was built for this target and keystroke limit."""
+        return target in TABLE_TARGETS and max_keystrokes == TABLE_MAX_KEYSTROKES
+
+    def min_keystrokes(self, mask, target):
+        """Fewest keystrokes for ``target``, or None if unreachable."""
+        keystrokes = int(self._entry(mask, target)) & KEYSTROKE_MASK
+        return keystrokes or None
+
+    def solution_count(self, mask, target) -> int:
+        """Distinct solutions for ``target``, saturating at the cap."""
+        return int(self._entry(mask, target)) >> KEYSTROKE_BITS
+
+    def solvable_masks(self, target, broken_count, required):
+        """
+        Array of every mask with ``broken_count`` broken buttons and at
+        least ``required`` solutions for ``target``. The per-target index
+        is built on first use with one pass over the target's column.
+        """
+        cached = self._solvable_index.get(target)
+        if cached is None or cached[0] != required:
+            column = self.entries[:, target - TABLE_TARGETS.start]
+            masks = np.flatnonzero((column >> KEYSTROKE_BITS) >= required)
+            counts = _popcounts()[masks]
+            by_count = {
+                c: masks[counts == c] for c in range(len(ALL_BUTTONS) + 1)
+            }
+            cached = (required, by_count)
+            self._solvable_index[target] = cached
+        return cached[1][broken_count]
+
+    def _entry(self, mask, target):
+        return self.entries[mask, target - TABLE_TARGETS.start]
+
+
+_popcount_cache = []
+
+
+def _popcounts():
+    """Number of broken buttons in each mask, as an array indexed by mask."""
+    if not _popcount_cache:
+        masks = np.arange(MASK_COUNT, dtype=np.uint32)
+        counts = np.zeros(MASK_COUNT, dtype=np.uint8)
+        for bit in range(len(ALL_BUTTONS)):
+            counts += ((masks >> bit) & 1).astype(np.uint8)
+        _popcount_cache.append(counts)
+    return _popcount_cache[0]
+
+
+def solve_mask(mask) -> bytes:
+    """Compute one packed table row for a broken-button mask."""
+    row = np.zeros(len(TABLE_TARGETS), dtype=np.uint8)
+    sets = ReachableSets(mask_to_buttons(mask))
+    if not sets.digits:
+        return row.tobytes()
+
+    targets = np.arange(TABLE_TARGETS.start, TABLE_TARGETS.stop)
+    keystrokes = sets.min_keystrokes(targets, TABLE_MAX_KEYSTROKES)
+    reachable = keystrokes != 0
+    counts = np.array(
+        sets.solution_counts(
+            targets[reachable], TABLE_MAX_KEYSTROKES, SOLUTION_COUNT_CAP
+        ),
+        dtype=np.uint8,
+    )
+    row[reachable] = keystrokes[reachable] | (counts << KEYSTROKE_BITS)
+    return row.tobytes()
+
+
+def build_table(path, masks=range(MASK_COUNT), progress=None, jobs=None):
+    """
+    Compute the rows for ``masks`` on ``jobs`` worker processes (all
+    cores by default) and save the whole table to ``path`` as a ``.npy``
+    file; rows not computed are left as unreachable. ``progress`` is
+    called with the number of rows done so far.
+    """
+    entries = np.zeros((MASK_COUNT, len(TABLE_TARGETS)), dtype=np.uint8)
+    with multiprocessing.Pool(jobs) as pool:
+        rows = pool.imap(solve_mask, masks, chunksize=64)
+        for done, (mask, row) in enumerate(zip(masks, rows), 1):
+            entries[mask] = np.frombuffer(row, dtype=np.uint8)
+            if progress is not None:
+                progress(done)
+    save_table(entries, path)
+
+
+def save_table(entries, path):
+    """Write a table atomically, so a running game never maps half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, entries)
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build the broken-button solvability table."
+    )
+    parser.add_argument("output", nargs="?", default=DEFAULT_TABLE_PATH)
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        parser.error("NumPy is required to build the table")
+
+    def progress(done):
+        if done % 256 == 0 or done == MASK_COUNT:
+            print(f"\r{done}/{MASK_COUNT} masks", end="", file=sys.stderr)
+
+    build_table(args.output, progress=progress, jobs=args.jobs)
+    print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@
 # SOFTWARE.
 #
 
+import io
 import os
 from gi.repository import Gtk
 from gi.repository import GLib
@@ -29,6 +30,10 @@ import sugargame.event as event
 
 CANVAS = None
 
+# Pygame's own display functions, wrapped while the canvas is realized
+_display_flip = pygame.display.flip
+_display_update = pygame.display.update
+
 
 class PygameCanvas(Gtk.EventBox):
     def __init__(self, activity, main=None, modules=[pygame]):
@@ -45,10 +50,17 @@ class PygameCanvas(Gtk.EventBox):
         self._main = main
         self._modules = modules
 
+        # Bumped on every display flip or update; the preview is cached
+        # against it, so saving an unchanged screen encodes nothing
+        self.frame_generation = 0
+        self._preview = None
+        self._preview_key = None
+
         self.set_can_focus(True)
 
         self._socket = Gtk.Socket()
         self._socket.connect("realize", self._realize_cb)
+        self._socket.connect("unrealize", self._unrealize_cb)
         self.add(self._socket)
 
         self.show_all()
@@ -69,17 +81,40 @@ class PygameCanvas(Gtk.EventBox):
 
         # Hook certain Pygame functions with GTK equivalents.
         self.translator.hook_pygame()
+        self._hook_display()
 
         # Call the caller's main loop as an idle source
         if self._main:
             GLib.idle_add(self._main)
 
+    def _unrealize_cb(self, widget):
+        pygame.display.flip = _display_flip
+        pygame.display.update = _display_update
+
+    def _hook_display(self):
+        # Wraps the saved originals, so realizing again does not stack hooks
+        pygame.display.flip = self._counted_flip
+        pygame.display.update = self._counted_update
+
+    def _counted_flip(self):
+        self.frame_generation += 1
+        return _display_flip()
+
+    def _counted_update(self, *args):
+        self.frame_generation += 1
+        return _display_update(*args)
+
+    def invalidate_preview(self):
+        """Mark the screen as changed without a display flip or update."""
+        self.frame_generation += 1
+
     def get_pygame_widget(self):
         return self._socket
 
     def get_preview(self):
         """
         Return preview of main surface
+        The PNG is encoded in memory and reused until the next frame.
         How to use in activity:
             def get_preview(self):
                 return self.game_canvas.get_preview()
@@ -88,13 +123,30 @@ class PygameCanvas(Gtk.EventBox):
         if not hasattr(self, "_screen"):
             return None
 
-        _tmp_dir = os.path.join(self._activity.get_activity_root(), "tmp")
-        _file_path = os.path.join(_tmp_dir, "preview.png")
+        key = (self.frame_generation, self._screen.get_size())
+        if key == self._preview_key:
+            return self._preview
 
         width = PREVIEW_SIZE[0]
         height = PREVIEW_SIZE[1]
         _surface = pygame.transform.scale(self._screen, (width, height))
-        pygame.image.save(_surface, _file_path)
+        if pygame.version.vernum >= (2, 0):
+            # Encode straight into memory; the name only selects PNG
+            buffer = io.BytesIO()
+            pygame.image.save(_surface, buffer, "preview.png")
+            preview = buffer.getvalue()
+        else:
+            preview = self._save_preview_file(_surface)
+
+        self._preview = preview
+        self._preview_key = key
+        return preview
+
+    def _save_preview_file(self, surface):
+        """Pygame 1 can only write PNG files by name."""
+        _tmp_dir = os.path.join(self._activity.get_activity_root(), "tmp")
+        _file_path = os.path.join(_tmp_dir, "preview.png")
+        pygame.image.save(surface, _file_path)
 
         f = open(_file_path, "rb")
         preview = f.read()
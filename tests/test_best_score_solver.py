@@ -0,0 +1,88 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import itertools
+
+import pytest
+
+from logic.best_score_solver import BestScoreSolver
+from logic.equation_validator import EquationValidator
+from logic.score_calculator import ScoreCalculator
+from logic.scoring_profile import ScoringProfile
+
+BUTTONS = "0123456789+-*/()"
+
+
+def brute_force_best(broken, target, max_keystrokes, calculator):
+    """Best score over every typeable string, by exhaustive search."""
+    validator = EquationValidator()
+    working = [c for c in BUTTONS if c not in broken]
+    best = -1
+    for length in range(1, max_keystrokes + 1):
+        for chars in itertools.product(working, repeat=length):
+            equation = "".join(chars)
+            if validator.validate(equation, target)["valid"]:
+                best = max(best, calculator.calculate_score(equation))
+    return best
+
+
+@pytest.mark.parametrize(
+    "broken, target, max_keystrokes",
+    [
+        (["-", "*", ")", "/", "+", "8", "0"], 39, 4),
+        (["1", "(", "2", ")", "5", "7"], 25, 4),
+        (["5", "*", "(", "1", "2", "9", "+", "7"], 18, 5),
+    ],
+)
+def test_matches_brute_force(broken, target, max_keystrokes):
+    found = BestScoreSolver(broken).best_equation(target, max_keystrokes)
+    expected = brute_force_best(
+        broken, target, max_keystrokes, ScoreCalculator()
+    )
+    assert found is not None
+    equation, score = found
+    assert score == expected
+    assert not set(equation) & set(broken)
+    assert EquationValidator().validate(equation, target)["valid"]
+
+
+def test_matches_brute_force_with_profile():
+    profile = ScoringProfile(
+        "test",
+        {"base": 0, "operators": 2, "mul_div": 7, "length": 3},
+        length_divisor=2,
+        length_cap=2,
+    )
+    broken = ["1", "(", "2", ")", "5", "7"]
+    found = BestScoreSolver(broken, profile=profile).best_equation(25, 4)
+    assert found[1] == brute_force_best(
+        broken, 25, 4, ScoreCalculator(profile)
+    )
+
+
+def test_smaller_limit_after_larger_one():
+    solver = BestScoreSolver([])
+    solver.best_equation(24, 7)
+    assert solver.best_equation(24, 5) == BestScoreSolver([]).best_equation(
+        24, 5
+    )
+    equation, _ = solver.best_equation(24, 5)
+    assert len(equation) <= 5
+
+
+def test_unreachable_target():
+    assert BestScoreSolver(list("0123456789")).best_equation(24, 5) is None
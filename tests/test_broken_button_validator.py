@@ -0,0 +1,135 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import random
+
+import pytest
+
+from logic import broken_button_validator
+from logic.broken_button_validator import (
+    ALL_BUTTONS,
+    REQUIRED_SOLUTIONS,
+    SAMPLE_ATTEMPTS,
+    BrokenButtonValidator,
+    buttons_to_mask,
+    equation_mask,
+    mask_to_buttons,
+)
+from logic.game_manager import GameManager
+from logic.puzzle_solver import PuzzleSolver
+
+PUZZLES = [
+    (42, []),
+    (42, ["0", "1", "2", "3", "4", "5", "6", "7"]),
+    (17, ["1", "7", "+"]),
+    (150, ["0", "5", "*", "(", ")"]),
+    (199, ["1", "9", "*", "/", "(", ")"]),
+    # One solution only
+    (170, ["0", "1", "3", "4", "6", "8", "-", "*", "/", "("]),
+]
+
+
+@pytest.mark.parametrize("target, broken", PUZZLES)
+def test_requires_distinct_solutions(target, broken):
+    validator = BrokenButtonValidator(timed=False)
+    count = PuzzleSolver(broken).count_solutions(target, 7, REQUIRED_SOLUTIONS)
+    assert validator.validate_solvable(target, broken) == (
+        count >= REQUIRED_SOLUTIONS
+    )
+
+
+def test_needs_digits_and_operators():
+    validator = BrokenButtonValidator(timed=False)
+    assert not validator.validate_solvable(42, list("0123456789"))
+    assert not validator.validate_solvable(42, list("+-*/"))
+
+
+def test_timed_out_search_is_unsolvable(monkeypatch):
+    monkeypatch.setattr(broken_button_validator, "SOLVE_TIME_BUDGET", -1)
+    assert not BrokenButtonValidator().validate_solvable(42, [])
+    assert BrokenButtonValidator(timed=False).validate_solvable(42, [])
+
+
+@pytest.mark.parametrize("count", [0, 3, 5, 7])
+def test_generated_puzzles_are_solvable(count):
+    validator = BrokenButtonValidator(timed=False)
+    rng = random.Random(count)
+    for target in (10, 77, 200):
+        broken = validator.generate_broken_buttons(target, count, rng)
+        assert len(broken) <= count
+        assert len(set(broken)) == len(broken)
+        assert validator.validate_solvable(target, broken)
+
+
+@pytest.mark.parametrize("timed, tries", [
+    (True, [1] * 8),
+    (False, [SAMPLE_ATTEMPTS] * 8),
+])
+def test_generation_is_bounded(monkeypatch, timed, tries):
+    monkeypatch.setattr(broken_button_validator, "GENERATE_TIME_BUDGET", -1)
+    validator = BrokenButtonValidator(timed=timed)
+    counts = []
+    monkeypatch.setattr(
+        validator, "validate_solvable",
+        lambda target, broken: counts.append(len(broken)) and False,
+    )
+    assert validator.generate_broken_buttons(42, 7) == []
+    assert [counts.count(c) for c in range(7, -1, -1)] == tries
+
+
+def test_generation_depends_only_on_rng():
+    first = BrokenButtonValidator(timed=False)
+    second = BrokenButtonValidator(timed=False)
+    for seed in range(5):
+        assert first.generate_broken_buttons(
+            120, 6, random.Random(seed)
+        ) == second.generate_broken_buttons(120, 6, random.Random(seed))
+
+
+def test_solvers_are_cached():
+    validator = BrokenButtonValidator()
+    solver = validator.get_solver(["1", "2"])
+    assert validator.get_solver(["2", "1"]) is solver
+    assert validator.get_solver(["1", "2"], large=True) is not solver
+
+
+def test_mask_round_trip():
+    assert buttons_to_mask([]) == 0
+    assert buttons_to_mask(ALL_BUTTONS) == 0xFFFF
+    assert buttons_to_mask(["1", "0"]) == 0b11
+    for mask in (0, 1, 0b1010000000000101, 0xFFFF):
+        assert buttons_to_mask(mask_to_buttons(mask)) == mask
+
+
+def test_equation_mask():
+    assert equation_mask("") == 0
+    assert equation_mask("10+10") == buttons_to_mask(["1", "0", "+"])
+    # Characters without a breakable button are ignored
+    assert equation_mask(" 2.5 ") == buttons_to_mask(["2", "5"])
+
+
+@pytest.mark.parametrize("equation, error", [
+    ("6*7", "Equation uses a broken button!"),
+    ("(40+2)", "Equation uses a broken button!"),
+    ("84/2", None),
+    ("40+2", None),
+])
+def test_submission_checks_broken_buttons(equation, error):
+    game = GameManager(prefetch=False)
+    game.start_level((42, ["6", "("]))
+    game.current_equation = equation
+    assert game.submit_equation() == error
@@ -0,0 +1,57 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import build_puzzle_bank
+from logic.broken_button_validator import REQUIRED_SOLUTIONS, mask_to_buttons
+from logic.equation_validator import EquationValidator
+from logic.puzzle_bank import PuzzleBank
+from logic.puzzle_solver import PuzzleSolver
+
+
+def fresh_puzzle(seed, monkeypatch):
+    monkeypatch.setattr(build_puzzle_bank, "_validator", None)
+    return build_puzzle_bank.generate_puzzle(seed)
+
+
+def test_seed_alone_decides(monkeypatch):
+    for seed in range(5):
+        assert fresh_puzzle(seed, monkeypatch) == fresh_puzzle(seed, monkeypatch)
+
+
+def test_puzzles_are_solvable(monkeypatch):
+    validator = EquationValidator()
+    for seed in range(5):
+        puzzle = fresh_puzzle(seed, monkeypatch)
+        if puzzle is None:
+            continue
+        target, mask, solutions, difficulty, min_keystrokes = puzzle
+        broken = mask_to_buttons(mask)
+        assert solutions >= REQUIRED_SOLUTIONS
+        equation = PuzzleSolver(broken).find_equation(target)
+        assert len(equation) == min_keystrokes
+        assert not set(equation) & set(broken)
+        assert validator.validate(equation, target)["valid"]
+
+
+def test_main_writes_a_bank(tmp_path):
+    path = str(tmp_path / "puzzles.bank")
+    build_puzzle_bank.main([path, "--puzzles", "20", "--jobs", "1"])
+    first = open(path, "rb").read()
+    build_puzzle_bank.main([path, "--puzzles", "20", "--jobs", "2"])
+    assert open(path, "rb").read() == first
+    bank = PuzzleBank.load(path)
+    assert bank is not None
@@ -0,0 +1,87 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic.canonical_form import (
+    canonicalize,
+    combine,
+    from_postfix,
+    literal,
+    to_postfix,
+)
+from logic.expression_compiler import compile_expression
+
+
+def canonical(expr):
+    return canonicalize(compile_expression(expr))
+
+
+@pytest.mark.parametrize("expr, text", [
+    ("9+1+9", "(1+9+9)"),
+    ("5*2+3", "(3+(2*5))"),
+    ("3-2*5", "(3-(2*5))"),
+    ("1+2+(3+4)", "(1+2+3+4)"),
+    ("-(2+3)", "(-(2+3))"),
+    ("8/4/2", "((8/4)/2)"),
+])
+def test_rendering(expr, text):
+    assert str(canonical(expr)) == text
+
+
+def test_nodes_are_interned():
+    assert canonical("1+9") is canonical("9+1")
+    assert canonical("2*3+4*5") is canonical("5*4+3*2")
+    assert canonical("10-5") is not canonical("5-10")
+    assert literal(7) is literal(7)
+    assert combine("+", (literal(1), literal(2))) is canonical("2+1")
+
+
+def test_flattening_matches_nested_combine():
+    nested = combine("+", (combine("+", (literal(1), literal(2))), literal(3)))
+    assert nested is canonical("1+2+3")
+    assert nested is canonical("3+(1+2)")
+
+
+def test_long_chains_and_deep_nesting():
+    expr = "+".join(str(i) for i in range(5000, 0, -1))
+    node = canonical(expr)
+    assert len(node.children) == 5000
+    assert node is canonical("+".join(str(i) for i in range(1, 5001)))
+
+    depth = 20000
+    node = canonical("-" * depth + "1")
+    assert str(node).count("(-") == depth
+
+
+@pytest.mark.parametrize("expr", ["42", "9+1+9", "3-2*5", "-(2+3)*7/4",
+                                  "1.5+.5"])
+def test_postfix_round_trip(expr):
+    node = canonical(expr)
+    assert from_postfix(to_postfix(node)) is node
+
+
+@pytest.mark.parametrize("tokens", [
+    [],
+    ["1", "2"],
+    ["1", ["+", 2]],
+    ["1", "2", ["^", 2]],
+    ["1", ["+", 0]],
+])
+def test_malformed_postfix(tokens):
+    with pytest.raises(ValueError):
+        from_postfix(tokens)
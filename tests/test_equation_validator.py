@@ -0,0 +1,98 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic.equation_validator import EquationValidator, ParsedEquation
+
+
+@pytest.fixture
+def validator():
+    return EquationValidator()
+
+
+@pytest.mark.parametrize("equation", ["6*7", "84/2", " 40 + 2 ", "2.5*2*8.4",
+                                      "-(-42)", "(50-8)"])
+def test_valid(validator, equation):
+    result = validator.validate(equation, 42)
+    assert result["valid"], result
+    assert result["value"] == 42
+
+
+@pytest.mark.parametrize("equation, error", [
+    ("", "Equation is empty"),
+    ("6*x", "Invalid characters in equation"),
+    ("6*7+1", "Result is 43.00, not 42"),
+    ("7/2", "Result is 3.50, not 42"),
+    ("1/0", "Division by zero"),
+    ("9" * 16, "Equation too complex"),
+    ("6*", "Invalid equation"),
+    ("6**2", "Invalid equation"),
+])
+def test_invalid(validator, equation, error):
+    result = validator.validate(equation, 42)
+    assert not result["valid"]
+    assert result["error"].startswith(error)
+
+
+def test_inexact_mode():
+    validator = EquationValidator(exact=False)
+    assert validator.validate("0.1*3*140", 42)["valid"]
+    assert not validator.validate("41.9", 42)["valid"]
+
+
+@pytest.mark.parametrize("eq1, eq2", [
+    ("9+1", "1+9"),
+    ("5*2", "2*5"),
+    ("9+1+9", "9+9+1"),
+    ("5*2+3", "3+2*5"),
+    ("1+2+3", "3+(2+1)"),
+    ("6*7", " 6 * 7 "),
+])
+def test_equivalent(validator, eq1, eq2):
+    assert validator.are_equations_equivalent(eq1, eq2)
+    assert validator.parse(eq1).signature == validator.parse(eq2).signature
+
+
+@pytest.mark.parametrize("eq1, eq2", [
+    ("2+8", "1+9"),
+    ("10-5", "5-10"),
+    ("3-2*5", "3+2*5"),
+    ("2*3", "6"),
+    ("8/4", "4/8"),
+])
+def test_unique(validator, eq1, eq2):
+    assert validator.are_equations_unique(eq1, eq2)
+    assert validator.parse(eq1).signature != validator.parse(eq2).signature
+
+
+def test_parse_once(validator):
+    parsed = validator.parse("5*2+3")
+    assert isinstance(parsed, ParsedEquation)
+    assert validator.parse(parsed) is parsed
+    assert parsed.value == 13
+    assert parsed.canonical_form == "(3+(2*5))"
+    assert parsed.operands == {5: 1, 2: 1, 3: 1}
+    assert parsed.operators == {"Mult": 1, "Add": 1}
+    assert validator.validate(parsed, 13)["valid"]
+
+
+def test_unparsable(validator):
+    parsed = validator.parse("6*")
+    assert not parsed.parsed
+    assert parsed.canonical_form == ""
+    assert parsed.signature == "6*"
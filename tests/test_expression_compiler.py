@@ -0,0 +1,116 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+from fractions import Fraction
+
+import pytest
+
+from logic.expression_compiler import (
+    BudgetExceeded,
+    EvaluationBudget,
+    ExpressionCache,
+    compile_expression,
+    normalize_expression,
+)
+
+EXPRESSIONS = [
+    "1+2*3", "(1+2)*3", "10-4-3", "10-(4-3)", "8/4/2", "8/(4/2)", "-3*-2",
+    "--1", "2*-(3+4)", "1.5+.5", "7/2", "0-0", "((((5))))", "12*12-144/12",
+]
+
+
+@pytest.mark.parametrize("expr", EXPRESSIONS)
+def test_matches_python(expr):
+    assert compile_expression(expr).evaluate() == eval(expr)
+
+
+@pytest.mark.parametrize("expr, value", [
+    ("1/3*3", 1),
+    ("7/2", Fraction(7, 2)),
+    ("0.1+0.2", Fraction(3, 10)),
+    ("2.5*2", 5),
+    ("-6/4", Fraction(-3, 2)),
+    ("2*-(3+4)", -14),
+    ("10-(4-3)*-2", 12),
+])
+def test_exact(expr, value):
+    result = compile_expression(expr).evaluate(exact=True)
+    assert result == value
+    assert type(result) is type(value)
+
+
+@pytest.mark.parametrize("expr", ["", "1+", "(1", "1)", "()", "07", "1 2",
+                                  "1..2", "1e5", "a+1"])
+def test_syntax_errors(expr):
+    with pytest.raises(ValueError):
+        compile_expression(expr)
+
+
+@pytest.mark.parametrize("expr", ["2**3", "7//2", "+1"])
+def test_disallowed_operators(expr):
+    with pytest.raises(TypeError):
+        compile_expression(expr)
+
+
+def test_deep_nesting_does_not_recurse():
+    depth = 20000
+    expr = "(" * depth + "1" + ")" * depth
+    assert compile_expression(expr).evaluate() == 1
+    expr = "-" * depth + "1"
+    assert compile_expression(expr).evaluate(exact=True) == 1
+
+
+def test_budget():
+    budget = EvaluationBudget()
+    with pytest.raises(BudgetExceeded):
+        compile_expression("9" * 16, budget)
+    with pytest.raises(BudgetExceeded):
+        compile_expression("-" * 10 + "1", EvaluationBudget(max_nodes=5))
+
+    compiled = compile_expression("*".join(["99999999"] * 40), budget)
+    with pytest.raises(BudgetExceeded):
+        compiled.evaluate(budget)
+    with pytest.raises(BudgetExceeded):
+        compiled.evaluate(budget, exact=True)
+
+
+def test_normalize_expression():
+    assert normalize_expression(" 1 +  2 ") == "1+2"
+    assert normalize_expression("1+2") == "1+2"
+    # Spaces between numbers still separate them
+    assert normalize_expression("1 2") == "1 2"
+
+
+def test_cache():
+    cache = ExpressionCache(maxsize=2)
+    first = cache.get("1+2")
+    assert cache.get(" 1 + 2") is first
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    cache.get("3*4")
+    cache.get("5-6")
+    assert len(cache) == 2
+    assert cache.get("1+2") is not first
+
+    # A budget is enforced on hits too
+    cache.get("1" * 16)
+    with pytest.raises(BudgetExceeded):
+        cache.get("1" * 16, EvaluationBudget())
+
+    with pytest.raises(ValueError):
+        cache.get("1+")
+    assert len(cache) == 2
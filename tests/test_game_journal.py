@@ -0,0 +1,181 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import json
+
+import pytest
+
+from logic.broken_button_validator import REQUIRED_SOLUTIONS
+from logic.game_journal import GameJournal
+from logic.game_manager import GameManager
+from logic.puzzle_solver import PuzzleSolver
+
+
+def play(game, count):
+    """Submit ``count`` distinct solutions of the current puzzle."""
+    solver = PuzzleSolver(game.broken_buttons)
+    equations = solver.iter_equations(game.target_number)
+    accepted = 0
+    while accepted < count:
+        # Distinct strings may still be rejected as equivalent equations
+        game.current_equation = next(equations)
+        if game.submit_equation() is None:
+            accepted += 1
+
+
+def state(game):
+    return (
+        game.target_number,
+        sorted(game.broken_buttons),
+        [(e["equation"], e["score"]) for e in game.equations],
+        game.total_score,
+        game.game_completed,
+        game.equation_signatures,
+    )
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    journal.append({"kind": "equation", "equation": "6*7"})
+    journal.save(path)
+
+    loaded = GameJournal()
+    assert loaded.load(path) == [
+        {"kind": "game", "target": 42},
+        {"kind": "equation", "equation": "6*7"},
+    ]
+
+
+def test_save_appends_only_new_lines(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    journal.save(path)
+    with open(path, "rb") as f:
+        first = f.read()
+
+    journal.append({"kind": "complete"})
+    journal.save(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data.startswith(first)
+    assert data[len(first):] == b'{"kind":"complete"}\n'
+
+
+def test_new_path_on_every_save(tmp_path):
+    # As in the activity, where every save gets a fresh temporary path
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    records = [{"kind": "game", "target": 42}]
+    for i in range(4):
+        path = str(tmp_path / f"save{i}")
+        journal.save(path)
+        assert GameJournal().load(path) == records
+        record = {"kind": "equation", "equation": str(i)}
+        journal.append(record)
+        records.append(record)
+
+    # A journal loaded from one path saves in full to the next
+    loaded = GameJournal()
+    loaded.load(str(tmp_path / "save3"))
+    loaded.append({"kind": "complete"})
+    loaded.save(str(tmp_path / "save4"))
+    assert GameJournal().load(str(tmp_path / "save4")) == (
+        records[:-1] + [{"kind": "complete"}]
+    )
+
+
+def test_changed_file_is_rewritten(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    journal.save(path)
+    with open(path, "ab") as f:
+        f.write(b"junk\n")
+
+    journal.append({"kind": "complete"})
+    journal.save(path)
+    assert [r["kind"] for r in GameJournal().load(path)] == ["game", "complete"]
+
+
+def test_reset_rewrites_the_file(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    journal.append({"kind": "complete"})
+    journal.save(path)
+
+    journal.reset({"kind": "game", "target": 17})
+    journal.save(path)
+    assert GameJournal().load(path) == [{"kind": "game", "target": 17}]
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = str(tmp_path / "journal")
+    journal = GameJournal()
+    journal.reset({"kind": "game", "target": 42})
+    journal.save(path)
+    with open(path, "ab") as f:
+        f.write(b'{"kind":"equ')
+
+    assert GameJournal().load(path) == [{"kind": "game", "target": 42}]
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"not json\n",
+    b'{"kind":"game","target":42}\n',
+    json.dumps({"kind": "journal", "format": "broken-calculator-journal",
+                "version": 99}).encode() + b"\n",
+])
+def test_rejects_other_files(tmp_path, data):
+    path = tmp_path / "journal"
+    path.write_bytes(data)
+    with pytest.raises(ValueError):
+        GameJournal().load(str(path))
+
+
+def test_game_resumes_mid_game(tmp_path):
+    path = str(tmp_path / "journal")
+    game = GameManager(prefetch=False)
+    game.start_level()
+    play(game, 2)
+    game.write_file(path)
+
+    resumed = GameManager(prefetch=False)
+    resumed.read_file(path)
+    assert state(resumed) == state(game)
+
+    # Equations already found are still duplicates after resuming
+    resumed.current_equation = game.equations[0]["equation"]
+    assert resumed.submit_equation() is not None
+
+
+def test_completed_game_resumes_completed(tmp_path):
+    path = str(tmp_path / "journal")
+    game = GameManager(prefetch=False)
+    game.start_level()
+    play(game, REQUIRED_SOLUTIONS)
+    assert game.game_completed
+    game.write_file(path)
+
+    resumed = GameManager(prefetch=False)
+    resumed.start_level()
+    resumed.read_file(path)
+    assert state(resumed) == state(game)
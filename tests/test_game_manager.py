@@ -0,0 +1,73 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import time
+
+from logic.game_manager import PREFETCH_DEPTH, GameManager
+
+
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_prefetch_starts_with_first_level():
+    game = GameManager()
+    try:
+        assert game._prefetch_thread is None
+        game.start_level()
+        assert game._prefetch_thread.is_alive()
+        assert wait_for(lambda: game.prefetch_stats()["depth"] == PREFETCH_DEPTH)
+
+        game.start_level()
+        assert game.prefetch_stats()["hits"] == 1
+        assert game.prefetch_stats()["misses"] == 1
+    finally:
+        game.stop_prefetching()
+
+
+def test_stop_prefetching_joins_the_thread():
+    game = GameManager()
+    game.start_level()
+    thread = game._prefetch_thread
+    game.stop_prefetching()
+    assert not thread.is_alive()
+    assert game._prefetch_thread is None
+
+    # Later levels are generated on the spot instead of restarting it
+    game.start_level()
+    assert game._prefetch_thread is None
+    assert 10 <= game.target_number <= 200
+
+
+def test_no_thread_without_prefetch():
+    game = GameManager(prefetch=False)
+    game.start_level()
+    game.start_level()
+    assert game._prefetch_thread is None
+    assert game.prefetch_stats()["misses"] == 2
+
+
+def test_stop_before_start():
+    game = GameManager()
+    game.stop_prefetching()
+    game.start_level()
+    assert game._prefetch_thread is None
@@ -0,0 +1,127 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import queue
+import threading
+import time
+
+from logic.canonical_form import canonicalize
+from logic.equation_validator import EquationValidator
+from logic.expression_compiler import compile_expression
+from logic.hint_engine import HintEngine
+from logic.puzzle_solver import PuzzleSolver
+
+validator = EquationValidator()
+
+
+def signature(equation):
+    return canonicalize(compile_expression(equation))
+
+
+def test_hint_is_shortest_new_equation():
+    engine = HintEngine()
+    broken = ["6", "("]
+    hint = engine.find_hint(42, broken, set())
+    assert hint == PuzzleSolver(broken).find_equation(42)
+    assert validator.validate(hint, 42)["valid"]
+
+    used = {signature(hint)}
+    second = engine.find_hint(42, broken, used)
+    assert validator.validate(second, 42)["valid"]
+    assert signature(second) not in used
+    assert not set(second) & set(broken)
+
+
+def test_no_hint_when_all_used():
+    engine = HintEngine(max_keystrokes=3)
+    solver = PuzzleSolver([])
+    used = {signature(eq) for eq in solver.iter_equations(7, 3)}
+    assert engine.find_hint(7, [], used) is None
+
+
+def test_large_target_hint():
+    engine = HintEngine()
+    hint = engine.find_hint(123456, ["0"], set())
+    assert hint is not None
+    assert validator.validate(hint, 123456)["valid"]
+
+
+def test_cancel():
+    engine = HintEngine()
+    cancel = threading.Event()
+    cancel.set()
+    assert engine.find_hint(42, [], set(), cancel=cancel) is None
+
+
+def test_start_posts_result():
+    posted = queue.Queue()
+    engine = HintEngine(post=lambda function, *args: posted.put((function, args)))
+    results = []
+    engine.start(42, ["6"], set(), results.append)
+
+    function, args = posted.get(timeout=10)
+    assert function(*args) is False
+    assert len(results) == 1
+    assert validator.validate(results[0], 42)["valid"]
+
+
+def test_superseded_results_are_dropped():
+    posted = queue.Queue()
+    engine = HintEngine(post=lambda function, *args: posted.put((function, args)))
+    results = []
+    engine.start(42, [], set(), results.append)
+    first = posted.get(timeout=10)
+    engine.start(43, [], set(), results.append)
+    second = posted.get(timeout=10)
+
+    first[0](*first[1])
+    assert results == []
+    second[0](*second[1])
+    assert len(results) == 1
+    assert validator.validate(results[0], 43)["valid"]
+
+    engine.start(44, [], set(), results.append)
+    third = posted.get(timeout=10)
+    engine.cancel()
+    third[0](*third[1])
+    assert len(results) == 1
+
+
+def test_new_request_is_not_starved_by_old_search(monkeypatch):
+    # Only 7 works, without + or -, so 8 is never found and the first
+    # search would run through every length
+    slow = [d for d in "012345689"] + ["+", "-"]
+    literals = PuzzleSolver._literals
+
+    def slow_literals(solver, length):
+        if solver.broken == frozenset(slow):
+            time.sleep(0.2)
+        return literals(solver, length)
+
+    monkeypatch.setattr(PuzzleSolver, "_literals", slow_literals)
+    posted = queue.Queue()
+    engine = HintEngine(post=lambda function, *args: posted.put((function, args)))
+    first, second = [], []
+    engine.start(8, slow, set(), first.append)
+    time.sleep(0.3)
+    engine.start(42, ["4"], set(), second.append)
+
+    function, args = posted.get(timeout=10)
+    function(*args)
+    assert first == []
+    assert second[0] is not None
+    assert validator.validate(second[0], 42)["valid"]
@@ -0,0 +1,223 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic.broken_button_validator import REQUIRED_SOLUTIONS
+from logic.game_manager import GameManager
+from logic.keystroke_log import (
+    CHARACTER,
+    HEADER,
+    MAGIC,
+    NEW_GAME,
+    PUZZLE_MASK,
+    PUZZLE_TARGET,
+    KeystrokeLog,
+    replay,
+)
+from logic.puzzle_solver import PuzzleSolver
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def type_equation(game, equation):
+    for char in equation:
+        game.press(char)
+    error = game.press("=")
+    if error:
+        game.press("C")
+    return error
+
+
+def played_game(count):
+    """A game with ``count`` solutions entered through the pad."""
+    game = GameManager(prefetch=False)
+    game.start_level()
+    equations = PuzzleSolver(game.broken_buttons).iter_equations(
+        game.target_number
+    )
+    accepted = 0
+    while accepted < count:
+        # Distinct strings may still be rejected as equivalent equations
+        if type_equation(game, next(equations)) is None:
+            accepted += 1
+    return game
+
+
+def summary(game):
+    return (
+        game.target_number,
+        game.broken_mask,
+        [(e["equation"], e["score"]) for e in game.equations],
+        game.total_score,
+        game.game_completed,
+    )
+
+
+def replayed(games):
+    return [
+        (g["target"], g["broken_mask"], g["equations"], g["total_score"],
+         g["completed"])
+        for g in games
+    ]
+
+
+@pytest.mark.parametrize("value", [0, 1, 0x7F, 0x80, 0x3FFF, 0x4000,
+                                   0xFFFFFFFF])
+def test_values_round_trip(tmp_path, value):
+    path = str(tmp_path / "log.bckl")
+    log = KeystrokeLog()
+    log._push(PUZZLE_TARGET, value)
+    log.save(path)
+    assert list(KeystrokeLog.load(path).events()) == [(PUZZLE_TARGET, value)]
+
+
+def test_elapsed_time_is_recorded(tmp_path):
+    clock = Clock()
+    log = KeystrokeLog(clock=clock)
+    log.record_new_game(42, 7)
+    clock.now = 1.5
+    log.record("4")
+    clock.now = 1.75
+    log.record("=")
+
+    path = str(tmp_path / "log.bckl")
+    log.save(path)
+    assert list(KeystrokeLog.load(path).events()) == [
+        (NEW_GAME, 0), (PUZZLE_TARGET, 42), (PUZZLE_MASK, 7),
+        (4, 1500), (19, 250),
+    ]
+
+
+def test_full_log_overwrites_oldest():
+    log = KeystrokeLog(capacity=4)
+    for value in "123456":
+        log.record(value)
+    assert len(log) == 4
+    assert log.dropped == 2
+    assert [code for code, _ in log.events()] == [3, 4, 5, 6]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "log.bckl"
+    path.write_bytes(b"BC")
+    with pytest.raises(ValueError):
+        KeystrokeLog.load(str(path))
+
+    path.write_bytes(HEADER.pack(b"XXXX", 1, 0))
+    with pytest.raises(ValueError):
+        KeystrokeLog.load(str(path))
+
+    # Claims more events than it holds
+    path.write_bytes(HEADER.pack(MAGIC, 1, 2) + bytes([0, 0]))
+    with pytest.raises(ValueError):
+        KeystrokeLog.load(str(path))
+
+
+def test_reads_version_1(tmp_path):
+    path = tmp_path / "log.bckl"
+    path.write_bytes(HEADER.pack(MAGIC, 1, 1) + bytes([PUZZLE_TARGET, 42]))
+    assert list(KeystrokeLog.load(str(path)).events()) == [(PUZZLE_TARGET, 42)]
+
+
+def test_replay_rebuilds_games(tmp_path):
+    game = played_game(2)
+    assert type_equation(game, "1+") is not None
+    path = str(tmp_path / "log.bckl")
+    game.keystroke_log.save(path)
+
+    games = replay(KeystrokeLog.load(path))
+    assert replayed(games) == [summary(game)]
+    assert len(games[0]["errors"]) == 1
+    assert not games[0]["resumed"]
+
+
+def test_replay_skips_presses_before_first_puzzle():
+    game = played_game(1)
+    log = KeystrokeLog(capacity=len(game.keystroke_log) - 1)
+    for code, value in game.keystroke_log.events():
+        log._push(code, value)
+    assert replay(log) == []
+
+
+@pytest.mark.parametrize("count", [0, 2, REQUIRED_SOLUTIONS])
+def test_replay_rebuilds_resumed_game(tmp_path, count):
+    played = played_game(count)
+    journal_path = str(tmp_path / "journal")
+    played.write_file(journal_path)
+
+    # A new session: a fresh game, then the Journal entry is resumed
+    game = GameManager(prefetch=False)
+    game.start_level()
+    game.read_file(journal_path)
+    if not game.game_completed:
+        equations = PuzzleSolver(game.broken_buttons).iter_equations(
+            game.target_number
+        )
+        for equation in equations:
+            if type_equation(game, equation) is None:
+                break
+
+    games = replay(game.keystroke_log)
+    assert len(games) == 2
+    assert games[1]["resumed"]
+    assert replayed(games[1:]) == [summary(game)]
+
+
+def test_other_input_is_recorded_as_characters(tmp_path):
+    clock = Clock()
+    game = GameManager(prefetch=False)
+    game.keystroke_log = KeystrokeLog(clock=clock)
+    game.start_level((42, []))
+    for value in ["4", "0", " ", "+", "×", "2"]:
+        clock.now += 1
+        assert game.press(value) is None
+    assert game.current_equation == "40 +×2"
+    assert list(game.keystroke_log.events())[3:] == [
+        (4, 1000), (0, 1000), (CHARACTER, ord(" ")), (10, 2000),
+        (CHARACTER, ord("×")), (2, 2000),
+    ]
+
+    path = str(tmp_path / "log.bckl")
+    game.keystroke_log.save(path)
+    replayed_game = GameManager(prefetch=False)
+    replay(KeystrokeLog.load(path), replayed_game)
+    assert replayed_game.current_equation == "40 +×2"
+
+
+def test_resume_equation_with_spaces(tmp_path):
+    game = GameManager(prefetch=False)
+    game.start_level((42, []))
+    game.current_equation = "40 + 2"
+    assert game.submit_equation() is None
+    path = str(tmp_path / "journal")
+    game.write_file(path)
+
+    resumed = GameManager(prefetch=False)
+    resumed.read_file(path)
+    assert resumed.equations[0]["equation"] == "40 + 2"
+    assert resumed.total_score == game.total_score
+
+    games = replay(resumed.keystroke_log)
+    assert games[-1]["resumed"]
+    assert games[-1]["equations"] == [("40 + 2", game.equations[0]["score"])]
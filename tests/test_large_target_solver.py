@@ -0,0 +1,68 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import random
+
+from logic import broken_button_validator
+from logic.broken_button_validator import BrokenButtonValidator
+from logic.equation_validator import EquationValidator
+from logic.game_manager import GameManager
+from logic.large_target_solver import LargeTargetSolver
+
+
+def test_equations_are_valid():
+    validator = EquationValidator()
+    rng = random.Random(0)
+    broken = ["7", "(", ")"]
+    solver = LargeTargetSolver(broken, half_keystrokes=3)
+    for _ in range(20):
+        target = rng.randint(1000, 10**6)
+        for equation in solver.iter_equations(target, 7):
+            assert len(equation) <= 7
+            assert not set(equation) & set(broken)
+            assert validator.validate(equation, target)["valid"]
+
+
+def test_joins_half_length_tables():
+    solver = LargeTargetSolver(["0", "1", "2"], half_keystrokes=3)
+    equation = solver.find_equation(998001, 7)
+    assert equation is not None
+    assert EquationValidator().validate(equation, 998001)["valid"]
+
+
+def test_target_typed_as_a_number():
+    solver = LargeTargetSolver([], half_keystrokes=2)
+    assert solver.find_equation(123456, 7) == "123456"
+    assert not LargeTargetSolver(["4"], half_keystrokes=2).is_reachable(
+        444444, 5
+    )
+
+
+def test_large_puzzle_gives_up_in_time(monkeypatch):
+    monkeypatch.setattr(broken_button_validator, "LARGE_GENERATE_TIME_BUDGET", 0)
+    validator = BrokenButtonValidator()
+    monkeypatch.setattr(validator, "validate_solvable", lambda *args: False)
+    assert validator.generate_large_puzzle((1000, 10**6), 3) is None
+
+
+def test_large_mode_falls_back_to_regular_puzzle(monkeypatch):
+    game = GameManager(prefetch=False, large_targets=True)
+    monkeypatch.setattr(
+        game.broken_validator, "generate_large_puzzle", lambda *args: None
+    )
+    target, broken = game.generate_puzzle()
+    assert 10 <= target <= 200
@@ -0,0 +1,126 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic import game_manager
+from logic.broken_button_validator import (
+    REQUIRED_SOLUTIONS,
+    BrokenButtonValidator,
+    buttons_to_mask,
+)
+from logic.game_manager import GameManager
+from logic.puzzle_bank import (
+    BANK_TARGETS,
+    HEADER,
+    MAGIC,
+    SOLUTION_COUNT_CAP,
+    Puzzle,
+    PuzzleBank,
+    PuzzleBankWriter,
+)
+
+# (target, mask, solutions, difficulty, min_keystrokes), out of index order
+RECORDS = [
+    (108, 0b1000010000111, 31, 12, 4),
+    (44, 0b111111, 8, 18, 4),
+    (108, 0b1110000000, 31, 7, 3),
+    (200, 0b111, 300, 5, 2),
+    (10, 0b1111 << 8, 6, 20, 5),
+]
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    writer = PuzzleBankWriter()
+    for record in RECORDS:
+        writer.add(*record)
+    path = str(tmp_path / "puzzles.bank")
+    writer.save(path)
+    return path
+
+
+def test_round_trip(bank_path):
+    bank = PuzzleBank.load(bank_path)
+    assert len(bank) == len(RECORDS)
+    decoded = sorted(
+        (p.target, buttons_to_mask(p.broken_buttons), p.solutions,
+         p.difficulty, p.min_keystrokes)
+        for p in map(bank.record, range(len(bank)))
+    )
+    expected = sorted(
+        (t, m, min(s, SOLUTION_COUNT_CAP), d, k) for t, m, s, d, k in RECORDS
+    )
+    assert decoded == expected
+
+
+def test_index_counts(bank_path):
+    bank = PuzzleBank.load(bank_path)
+    assert bank.count(108, 5) == 1
+    assert bank.count(108, 3) == 1
+    assert bank.count(108, 4) == 0
+    assert bank.count(200, 3) == 1
+
+
+def test_draw(bank_path):
+    bank = PuzzleBank.load(bank_path)
+    puzzle = bank.draw(44, 6)
+    assert puzzle == Puzzle(44, puzzle.broken_buttons, 8, 18, 4)
+    assert buttons_to_mask(puzzle.broken_buttons) == 0b111111
+    for _ in range(20):
+        puzzle = bank.draw(108, 5)
+        assert puzzle.target == 108 and len(puzzle.broken_buttons) == 5
+    assert bank.draw(108, 4) is None
+    assert bank.draw(9, 3) is None
+    assert bank.draw(108, 17) is None
+
+
+def test_load_missing_or_malformed(tmp_path, bank_path):
+    assert PuzzleBank.load(str(tmp_path / "missing.bank")) is None
+
+    with open(bank_path, "rb") as f:
+        data = f.read()
+    path = tmp_path / "bad.bank"
+    for bad in (b"", b"XXXX" + data[4:], data[:-1], data[:HEADER.size]):
+        path.write_bytes(bad)
+        assert PuzzleBank.load(str(path)) is None
+    assert data.startswith(MAGIC)
+
+
+def test_game_draws_from_bank(monkeypatch, bank_path):
+    game = GameManager(prefetch=False)
+    game.puzzle_bank = PuzzleBank.load(bank_path)
+    monkeypatch.setattr(game_manager.random, "randint", lambda a, b: (
+        108 if (a, b) == (10, 200) else 5
+    ))
+    game.start_level()
+    assert game.target_number == 108
+    assert game.broken_mask == 0b1000010000111
+
+
+def test_shipped_bank():
+    bank = PuzzleBank.load()
+    assert bank is not None, "data/puzzles.bank is missing"
+    for target in BANK_TARGETS:
+        for broken_count in range(3, 8):
+            assert bank.count(target, broken_count)
+
+    validator = BrokenButtonValidator(timed=False)
+    for i in range(0, len(bank), len(bank) // 50):
+        puzzle = bank.record(i)
+        assert puzzle.solutions >= REQUIRED_SOLUTIONS
+        assert validator.validate_solvable(puzzle.target, puzzle.broken_buttons)
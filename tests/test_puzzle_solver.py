@@ -0,0 +1,104 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import itertools
+
+import pytest
+
+from logic.broken_button_validator import ALL_BUTTONS, mask_to_buttons
+from logic.equation_validator import EquationValidator
+from logic.puzzle_solver import PuzzleSolver
+
+# Few enough working buttons to enumerate every string of four keys
+MASKS = [0b1111111000000000 | 0b1111000, 0b0011011111000110, 0b1100001110101011,
+         0b1111010101010101]
+TARGETS = range(-30, 120)
+MAX_KEYSTROKES = 4
+
+validator = EquationValidator()
+
+
+def brute_force(broken):
+    """Fewest keystrokes and distinct equations for every reachable value."""
+    working = [b for b in ALL_BUTTONS if b not in broken]
+    shortest = {}
+    signatures = {}
+    for length in range(1, MAX_KEYSTROKES + 1):
+        for keys in itertools.product(working, repeat=length):
+            parsed = validator.parse("".join(keys))
+            if parsed.error is not None or parsed.value != int(parsed.value):
+                continue
+            value = int(parsed.value)
+            shortest.setdefault(value, length)
+            signatures.setdefault(value, set()).add(parsed.signature)
+    return shortest, signatures
+
+
+@pytest.mark.parametrize("mask", MASKS)
+def test_matches_brute_force(mask):
+    broken = mask_to_buttons(mask)
+    solver = PuzzleSolver(broken)
+    shortest, signatures = brute_force(broken)
+    for target in TARGETS:
+        assert solver.min_keystrokes(target, MAX_KEYSTROKES) == shortest.get(
+            target
+        )
+        count = solver.count_solutions(target, MAX_KEYSTROKES)
+        assert count <= len(signatures.get(target, ()))
+
+        equations = list(solver.iter_equations(target, MAX_KEYSTROKES))
+        assert len(equations) == len(set(equations))
+        for equation in equations:
+            assert len(equation) <= MAX_KEYSTROKES
+            assert not set(equation) & set(broken)
+            assert validator.validate(equation, target)["valid"]
+
+
+def test_witnesses_have_no_redundant_parentheses():
+    solver = PuzzleSolver([])
+    solver.explore(5)
+    for table in (solver.factors, solver.terms, solver.exprs):
+        for witness in table.values():
+            assert not (witness.startswith("(") and witness.endswith(")")
+                        and witness.count("(") == 1)
+
+
+def test_count_limit_and_memo():
+    solver = PuzzleSolver(["0", "5"])
+    assert solver.count_solutions(42, 7, limit=5) == 5
+    full = solver.count_solutions(42, 7)
+    assert full > 5
+    assert solver.count_solutions(42, 7) == full
+
+
+def test_unreachable():
+    solver = PuzzleSolver([d for d in "0123456789" if d != "7"] + ["+", "-"])
+    assert solver.find_equation(8) is None
+    assert solver.find_equation(49) == "7*7"
+    assert solver.min_keystrokes(1) == 3
+
+
+def test_deadline_resumes():
+    solver = PuzzleSolver([])
+    assert not solver.explore(7, deadline=0)
+    assert solver.levels < 7
+    assert solver.explore(5)
+    assert solver.levels == 5
+
+    fresh = PuzzleSolver([])
+    fresh.explore(5)
+    assert solver.exprs == fresh.exprs
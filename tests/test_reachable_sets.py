@@ -0,0 +1,70 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic.broken_button_validator import mask_to_buttons
+from logic.puzzle_solver import PuzzleSolver
+from logic.reachable_sets import ReachableSets
+from logic.solvability_table import (
+    KEYSTROKE_BITS,
+    SOLUTION_COUNT_CAP,
+    TABLE_TARGETS,
+    solve_mask,
+)
+
+MASKS = [0, 1, 3, 7, 59294, 12345, 40000, 65535 - 1023]
+TARGETS = list(range(-60, 61, 3)) + list(TABLE_TARGETS)[::9]
+
+
+@pytest.mark.parametrize("mask", MASKS)
+def test_matches_puzzle_solver(mask):
+    broken = mask_to_buttons(mask)
+    solver = PuzzleSolver(broken)
+    sets = ReachableSets(broken)
+    sets.explore(6)
+    solver.explore(6)
+    for length in range(1, 7):
+        assert sets.exprs_by_length[length].tolist() == solver._exprs_by_length[length]
+        assert sets.terms_by_length[length].tolist() == solver._terms_by_length[length]
+
+    keystrokes = sets.min_keystrokes(TARGETS, 6)
+    counts = sets.solution_counts(TARGETS, 6, 20)
+    for target, length, count in zip(TARGETS, keystrokes, counts):
+        assert sets.find_equation(target, 6) == solver.find_equation(target, 6)
+        assert length == (solver.min_keystrokes(target, 6) or 0)
+        assert count == solver.count_solutions(target, 6, 20)
+
+
+@pytest.mark.parametrize("mask", [0, 59294, 65535 - 1023])
+def test_table_row(mask):
+    row = np.frombuffer(solve_mask(mask), dtype=np.uint8)
+    solver = PuzzleSolver(mask_to_buttons(mask))
+    for target, entry in zip(TABLE_TARGETS, row.tolist()):
+        keystrokes = solver.min_keystrokes(target, 7)
+        if keystrokes is None:
+            assert entry == 0
+        else:
+            count = solver.count_solutions(target, 7, SOLUTION_COUNT_CAP)
+            assert entry == keystrokes | count << KEYSTROKE_BITS
+
+
+def test_no_digits():
+    row = solve_mask(sum(1 << i for i in range(10)))
+    assert not any(row)
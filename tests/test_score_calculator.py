@@ -0,0 +1,96 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic import score_calculator
+from logic.equation_validator import EquationValidator
+from logic.score_calculator import NUMPY_MIN_BATCH, ScoreCalculator
+from logic.scoring_profile import SCORE_FEATURES, ScoringProfile
+
+EQUATIONS = [
+    "42", "6*7", "40+2", "84/2", "(40+2)", "100-58", "12*(3+4)-42",
+    "2*3*7", "1+2+3+4+5+6+21", "-(-42)", "10*10-58", "(9+5)*(1+2)",
+    "6 * 7", "123456789+0", "7*6/1-0+(0)",
+]
+
+
+def original_score(equation):
+    """The scoring rules the calculator had before feature vectors."""
+    score = 10
+    equation = equation.replace(" ", "")
+    operators = ["+", "-", "*", "/"]
+    score += sum(equation.count(op) for op in operators) * 5
+    score += equation.count("*") * 3 + equation.count("/") * 3
+    score += equation.count("(") * 10
+    score += min(len(equation) // 3, 20)
+    unique_operators = sum(1 for op in operators if op in equation)
+    if unique_operators >= 3:
+        score += 15
+    elif unique_operators >= 2:
+        score += 10
+    for number in ScoreCalculator().extract_numbers(equation):
+        if len(number) > 1:
+            score += len(number) * 2
+    return score
+
+
+@pytest.mark.parametrize("equation", EQUATIONS)
+def test_matches_original_rules(equation):
+    calculator = ScoreCalculator()
+    score = calculator.calculate_score(equation)
+    assert score == original_score(equation)
+    assert sum(calculator.score_breakdown(equation).values()) == score
+    assert set(calculator.score_breakdown(equation)) == set(SCORE_FEATURES)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_score_many(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(score_calculator, "np", None)
+    calculator = ScoreCalculator()
+    assert calculator.score_many(EQUATIONS) == [
+        calculator.calculate_score(eq) for eq in EQUATIONS
+    ]
+    batch = EQUATIONS * (NUMPY_MIN_BATCH // len(EQUATIONS) + 1)
+    assert calculator.score_many(batch) == [
+        calculator.calculate_score(eq) for eq in batch
+    ]
+    assert calculator.score_many([]) == []
+
+
+def test_parsed_equations_cache_features():
+    validator = EquationValidator()
+    parsed = validator.parse("12*(3+4)")
+    calculator = ScoreCalculator()
+    score = calculator.calculate_score(parsed)
+    assert score == calculator.calculate_score("12*(3+4)")
+    assert parsed.score_features is not None
+
+    # A different length rule does not reuse the cached vector
+    short = ScoringProfile("short", length_divisor=1, length_cap=100)
+    assert ScoreCalculator(short).calculate_score(parsed) == (
+        score - 2 + len("12*(3+4)")
+    )
+    assert calculator.score_many([parsed, "12*(3+4)"]) == [score, score]
+
+
+def test_extract_numbers():
+    calculator = ScoreCalculator()
+    assert calculator.extract_numbers("12*(3+45)") == ["12", "3", "45"]
+    assert calculator.extract_numbers("+-") == []
+    assert calculator.extract_numbers("007") == ["007"]
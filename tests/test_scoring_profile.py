@@ -0,0 +1,111 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import json
+
+import pytest
+
+from logic import game_manager
+from logic.game_manager import GameManager
+from logic.score_calculator import ScoreCalculator
+from logic.scoring_profile import (
+    DEFAULT_POINTS,
+    DEFAULT_PROFILE,
+    SCORE_FEATURES,
+    ScoringProfile,
+    load_profiles,
+)
+
+
+def write_profiles(tmp_path, data):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps(data) if not isinstance(data, str) else data)
+    return str(path)
+
+
+def test_default_weights():
+    assert DEFAULT_PROFILE.weights == tuple(
+        DEFAULT_POINTS[feature] for feature in SCORE_FEATURES
+    )
+
+
+def test_load_profiles(tmp_path):
+    path = write_profiles(tmp_path, {
+        "kids": {"points": {"mul_div": 0}, "length_cap": 5},
+    })
+    profiles = load_profiles(path)
+    assert set(profiles) == {"default", "kids"}
+    kids = profiles["kids"]
+    assert kids.points["mul_div"] == 0
+    assert kids.points["operators"] == DEFAULT_POINTS["operators"]
+    assert kids.length_cap == 5
+    assert ScoreCalculator(kids).calculate_score("2*3") == 10 + 5 + 1
+
+
+def test_missing_file_gives_default(tmp_path):
+    assert load_profiles(str(tmp_path / "none.json")) == {
+        "default": DEFAULT_PROFILE
+    }
+
+
+def test_shipped_profiles_load():
+    profiles = load_profiles()
+    assert "default" in profiles
+    assert all(min(p.weights) >= 0 for p in profiles.values())
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        {"points": {"speed": 3}},
+        {"points": {"operators": -1}},
+        {"points": {"operators": 1.5}},
+        {"points": {"operators": True}},
+        {"length_divisor": 0},
+        {"length_cap": -1},
+        {"bonus": 1},
+    ],
+)
+def test_invalid_rules(tmp_path, rules):
+    with pytest.raises(ValueError):
+        load_profiles(write_profiles(tmp_path, {"bad": rules}))
+
+
+def test_malformed_file(tmp_path):
+    with pytest.raises(ValueError):
+        load_profiles(write_profiles(tmp_path, "{not json"))
+
+
+def test_game_falls_back_to_default(monkeypatch):
+    def broken():
+        raise ValueError("malformed")
+
+    monkeypatch.setattr(game_manager, "load_profiles", broken)
+    game = GameManager(prefetch=False, scoring_profile="competition")
+    assert game.score_calculator.profile is DEFAULT_PROFILE
+    assert game.scoring_profiles == {"default": DEFAULT_PROFILE}
+
+
+def test_switch_profile():
+    game = GameManager(prefetch=False)
+    game.scoring_profiles["flat"] = ScoringProfile(
+        "flat", {feature: 0 for feature in SCORE_FEATURES}
+    )
+    game.set_scoring_profile("flat")
+    assert game.score_calculator.calculate_score("12*(3+4)") == 0
+    with pytest.raises(KeyError):
+        game.set_scoring_profile("missing")
@@ -0,0 +1,122 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic.broken_button_validator import (
+    REQUIRED_SOLUTIONS,
+    BrokenButtonValidator,
+    buttons_to_mask,
+    mask_to_buttons,
+)
+from logic.game_manager import GameManager
+from logic.puzzle_solver import PuzzleSolver
+from logic.solvability_table import (
+    MASK_COUNT,
+    TABLE_TARGETS,
+    SolvabilityTable,
+    build_table,
+    save_table,
+)
+
+# Masks with three to five broken buttons, as games draw them
+MASKS = [0b111, 0b1000000010001, 0b110000000110, 59294 & 0x7FF, 0b1110000011]
+TARGETS = [10, 17, 42, 99, 144, 200]
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("table") / "solvability.npy")
+    build_table(path, MASKS, jobs=1)
+    return SolvabilityTable.load(path)
+
+
+def test_load_missing_or_malformed(tmp_path):
+    assert SolvabilityTable.load(str(tmp_path / "missing.npy")) is None
+
+    path = str(tmp_path / "small.npy")
+    save_table(np.zeros((16, len(TABLE_TARGETS)), dtype=np.uint8), path)
+    assert SolvabilityTable.load(path) is None
+
+    path = tmp_path / "junk.npy"
+    path.write_bytes(b"not a table")
+    assert SolvabilityTable.load(str(path)) is None
+
+
+def test_covers(table):
+    assert table.covers(10) and table.covers(200)
+    assert not table.covers(9) and not table.covers(201)
+    assert not table.covers(42, max_keystrokes=6)
+
+
+@pytest.mark.parametrize("mask", MASKS)
+def test_matches_live_validation(table, mask):
+    broken = mask_to_buttons(mask)
+    live = BrokenButtonValidator(timed=False)
+    solver = live.get_solver(broken)
+    with_table = BrokenButtonValidator(table=table)
+    for target in TARGETS:
+        assert table.min_keystrokes(mask, target) == solver.min_keystrokes(
+            target, 7
+        )
+        assert table.solution_count(mask, target) == solver.count_solutions(
+            target, 7, 31
+        )
+        assert with_table.validate_solvable(target, broken) == (
+            live.validate_solvable(target, broken)
+        )
+
+
+def test_rows_not_built_are_unreachable(table):
+    assert table.min_keystrokes(MASK_COUNT - 1 - 0b111, 42) is None
+    assert table.solution_count(MASK_COUNT - 1 - 0b111, 42) == 0
+
+
+def test_generate_draws_solvable_masks(table):
+    validator = BrokenButtonValidator(table=table)
+    rng = random.Random(0)
+    for target in TARGETS:
+        for count in (3, 4, 5):
+            masks = table.solvable_masks(target, count, REQUIRED_SOLUTIONS)
+            assert all(bin(int(m)).count("1") == count for m in masks)
+            assert set(masks.tolist()) <= set(MASKS)
+
+            broken = validator.generate_broken_buttons(target, count, rng)
+            assert validator.validate_solvable(target, broken)
+            assert buttons_to_mask(broken) in MASKS
+
+
+def test_built_table():
+    built = SolvabilityTable.load()
+    if built is None:
+        pytest.skip("data/solvability.npy has not been built")
+    assert GameManager(prefetch=False).broken_validator.table is not None
+
+    rng = random.Random(0)
+    for mask in rng.sample(range(MASK_COUNT), 5):
+        solver = PuzzleSolver(mask_to_buttons(mask))
+        for target in rng.sample(TABLE_TARGETS, 10):
+            assert built.min_keystrokes(mask, target) == (
+                solver.min_keystrokes(target, 7)
+            )
+            assert built.solution_count(mask, target) == (
+                solver.count_solutions(target, 7, 31)
+            )
@@ -0,0 +1,156 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+import pytest
+
+from logic.game_manager import GameManager
+from view.view_model import (
+    ALL_PARTS,
+    BROKEN_BUTTONS,
+    DISPLAY,
+    EQUATIONS,
+    SCORE,
+    TARGET,
+    GameViewModel,
+)
+
+
+class FakeStyle:
+    def __init__(self):
+        self.classes = set()
+
+    def add_class(self, name):
+        self.classes.add(name)
+
+    def remove_class(self, name):
+        self.classes.discard(name)
+
+
+class FakeButton:
+    def __init__(self):
+        self.sensitive = True
+        self.style = FakeStyle()
+
+    def set_sensitive(self, sensitive):
+        self.sensitive = sensitive
+
+    def get_style_context(self):
+        return self.style
+
+
+class FakeUI:
+    """Records what the view model sets instead of drawing widgets."""
+
+    def __init__(self, values):
+        self.equation_display = "display"
+        self.target_label = "target"
+        self.score_label = "score"
+        self.buttons = {value: FakeButton() for value in values}
+        self.labels = {}
+        self.updates = []
+        self.shown = None
+
+    def set_label_text(self, label, text):
+        self.labels[label] = text
+        self.updates.append(label)
+
+    def show_equations(self, equations, target):
+        self.shown = (list(equations), target)
+        self.updates.append("equations")
+
+
+@pytest.fixture
+def game():
+    game = GameManager(prefetch=False)
+    game.start_level((42, ["6", "("]))
+    return game
+
+
+@pytest.fixture
+def posted():
+    return []
+
+
+@pytest.fixture
+def view(game, posted):
+    ui = FakeUI(list("0123456789+-*/()"))
+    return GameViewModel(ui, game, posted.append)
+
+
+def run_posted(posted):
+    while posted:
+        assert posted.pop(0)() is False
+
+
+def test_marks_coalesce_into_one_flush(view, posted, game):
+    for value in "84/2":
+        game.press(value)
+        view.mark(DISPLAY)
+    assert len(posted) == 1
+    assert view.ui.updates == []
+
+    run_posted(posted)
+    assert view.ui.updates == ["display"]
+    assert view.ui.labels["display"] == "84÷2"
+    assert view.stats() == {"state_changes": 4, "flushes": 1}
+
+
+def test_only_dirty_parts_are_updated(view, posted):
+    view.mark(TARGET | SCORE)
+    run_posted(posted)
+    assert sorted(view.ui.updates) == ["score", "target"]
+    assert view.ui.labels == {"target": "42", "score": "0"}
+
+
+def test_flush_now_and_nothing_left(view, posted):
+    view.mark(DISPLAY)
+    view.flush()
+    assert view.ui.labels["display"] == "0"
+    # The scheduled flush finds nothing left to do
+    run_posted(posted)
+    assert view.ui.updates == ["display"]
+    assert view.flushes == 1
+
+    # A later mark schedules a new flush
+    view.mark(SCORE)
+    assert len(posted) == 1
+
+
+def test_equations_and_score(view, posted, game):
+    game.current_equation = "84/2"
+    assert game.submit_equation() is None
+    view.mark(DISPLAY | SCORE | EQUATIONS)
+    run_posted(posted)
+    assert view.ui.shown == (game.equations, 42)
+    assert view.ui.labels["score"] == str(game.total_score)
+    assert view.ui.labels["display"] == "0"
+
+
+def test_broken_buttons(view, posted, game):
+    view.mark(BROKEN_BUTTONS)
+    run_posted(posted)
+    for value, button in view.ui.buttons.items():
+        broken = value in ("6", "(")
+        assert button.sensitive is not broken
+        assert ("broken" in button.style.classes) is broken
+
+    game.start_level((42, ["7"]))
+    view.mark(ALL_PARTS)
+    run_posted(posted)
+    assert view.ui.buttons["6"].sensitive
+    assert "broken" not in view.ui.buttons["6"].style.classes
+    assert not view.ui.buttons["7"].sensitive
@@ -37,12 +37,75 @@ class CalculatorUI:
         self.target_label = None
         self.score_label = None
         self.equations_vbox = None
+        self.hint_label = None
         self.buttons = {}
 
+        # Rows of equations_vbox, one per equation of the list they show
+        self._equation_rows = []
+        self._shown_equations = None
+        self._shown_target = None
+
         # --- Build the UI ---
         self._setup_styling()
         self._build_ui()
 
+    def set_label_text(self, label, text):
+        """Set the text of a label, unless it already shows that text."""
+        if label.get_text() != text:
+            label.set_text(text)
+
+    def show_equations(self, equations, target):
+        """
+        Show a game's equations in ``equations_vbox``. Rows already shown
+        are kept and only new equations get a row, so an update costs the
+        same however long the list is. Another list or target, or a
+        shorter list, clears the rows first.
+        """
+        rows = self._equation_rows
+        if (
+            equations is not self._shown_equations
+            or target != self._shown_target
+            or len(rows) > len(equations)
+        ):
+            self.clear_equations()
+            rows = self._equation_rows
+            self._shown_equations = equations
+            self._shown_target = target
+
+        for eq_data in equations[len(rows):]:
+            row = self._build_equation_row(eq_data, target)
+            self.equations_vbox.pack_start(row, False, False, 0)
+            row.show_all()
+            rows.append(row)
+
+    def clear_equations(self):
+        """Destroy every equation row."""
+        for row in self._equation_rows:
+            row.destroy()
+        self._equation_rows = []
+        self._shown_equations = None
+        self._shown_target = None
+
+    def _build_equation_row(self, eq_data, target):
+        eq_text = (
+            f"{eq_data['equation'].replace('*', '×').replace('/', '÷')} = "
+            f"{target}"
+        )
+        score_markup = (
+            f"<span color='#4CAF50' weight='bold'>"
+            f"(+{eq_data['score']} pts)</span>"
+        )
+
+        hbox = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        eq_label = Gtk.Label(label=eq_text)
+        eq_label.get_style_context().add_class("equation-entry")
+        score_label = Gtk.Label()
+        score_label.set_markup(score_markup)
+
+        hbox.pack_start(eq_label, True, True, 0)
+        hbox.pack_end(score_label, False, False, 0)
+        return hbox
+
     def _setup_styling(self):
         """Loads and applies our custom CSS for the activity."""
         css_provider = Gtk.CssProvider()
@@ -142,6 +205,12 @@ class CalculatorUI:
             color: #555;
         }
 
+        #hint_label {
+            font-size: 14pt;
+            font-style: italic;
+            color: #1565C0;
+        }
+
         /* Help Dialog Styles */
         help-dialog {
             background-color: #f5f5f5;
@@ -214,6 +283,10 @@ class CalculatorUI:
         self.score_label = Gtk.Label()
         self.score_label.set_name("score_label")
 
+        self.hint_label = Gtk.Label()
+        self.hint_label.set_name("hint_label")
+        self.hint_label.set_line_wrap(True)
+
         equations_title = Gtk.Label(label="Your Equations")
         equations_title.get_style_context().add_class("title-label")
 
@@ -233,6 +306,7 @@ class CalculatorUI:
         right_vbox.pack_start(Gtk.Separator(), False, False, 10)
         right_vbox.pack_start(score_title, False, False, 0)
         right_vbox.pack_start(self.score_label, False, False, 10)
+        right_vbox.pack_start(self.hint_label, False, False, 0)
         right_vbox.pack_start(Gtk.Separator(), False, False, 10)
         right_vbox.pack_start(equations_title, False, False, 0)
         right_vbox.pack_start(scrolled_window, True, True, 0)
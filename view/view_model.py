@@ -0,0 +1,98 @@
+# This file is part of the Broken Calculator game.
+# Copyright (C) 2025 Bishoy Wadea
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+
+# Parts of the view that can be out of date, as bit flags
+DISPLAY = 1
+TARGET = 2
+SCORE = 4
+EQUATIONS = 8
+BROKEN_BUTTONS = 16
+ALL_PARTS = DISPLAY | TARGET | SCORE | EQUATIONS | BROKEN_BUTTONS
+
+
+class GameViewModel:
+    """
+    Keeps a CalculatorUI in step with a GameManager.
+
+    Changes to the game mark the parts of the view they affect as dirty
+    instead of updating widgets right away. The first mark schedules a
+    single flush through ``post`` (for example ``GLib.idle_add``), and
+    every mark until it runs joins that flush, so a burst of input costs
+    one pass over the widgets. ``state_changes`` and ``flushes`` count
+    both sides.
+    """
+
+    def __init__(self, ui, game, post):
+        self.ui = ui
+        self.game = game
+        self.post = post
+        self._dirty = 0
+        self._scheduled = False
+        self.state_changes = 0
+        self.flushes = 0
+
+    def mark(self, parts=ALL_PARTS):
+        """Mark ``parts`` (DISPLAY, SCORE, ...) as out of date."""
+        self._dirty |= parts
+        self.state_changes += 1
+        if not self._scheduled:
+            self._scheduled = True
+            self.post(self._flush_scheduled)
+
+    def flush(self):
+        """Update the dirty parts of the view now."""
+        dirty = self._dirty
+        if not dirty:
+            return
+        self._dirty = 0
+        self.flushes += 1
+
+        ui, game = self.ui, self.game
+        if dirty & DISPLAY:
+            display_text = (
+                game.current_equation.replace("*", "×").replace("/", "÷")
+            )
+            ui.set_label_text(
+                ui.equation_display, display_text if display_text else "0"
+            )
+        if dirty & TARGET:
+            ui.set_label_text(ui.target_label, str(game.target_number))
+        if dirty & SCORE:
+            ui.set_label_text(ui.score_label, str(game.total_score))
+        if dirty & EQUATIONS:
+            # Add rows for new equations; a new game clears the list
+            ui.show_equations(game.equations, game.target_number)
+        if dirty & BROKEN_BUTTONS:
+            # Re-enable all buttons and then disable the broken ones
+            for value, button in ui.buttons.items():
+                broken = game.is_button_broken(value)
+                button.set_sensitive(not broken)
+                style = button.get_style_context()
+                if broken:
+                    style.add_class("broken")
+                else:
+                    style.remove_class("broken")
+
+    def stats(self) -> dict:
+        """State changes marked and flushes that applied them."""
+        return {"state_changes": self.state_changes, "flushes": self.flushes}
+
+    def _flush_scheduled(self):
+        self._scheduled = False
+        self.flush()
+        # Run once
+        return False